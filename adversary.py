@@ -0,0 +1,70 @@
+"""Absurdle-style adversary: feedback chosen to keep the most candidates alive.
+
+There is no fixed answer. Each guess splits the remaining candidates into
+feedback buckets (one bincount over the guess's codes against them), and the
+adversary answers with the biggest bucket, so the game is won only once a
+single candidate is left and it is guessed. Ties go to the feedback that
+reveals least (counting 2 per green, 1 per yellow) and then the lowest
+code, so play is deterministic.
+
+Candidates are plain word lists, as find_valid_words returns them. The
+matching strategy is rank_suggestions(..., mode="minimax"), which plays the
+guess whose worst bucket is smallest; play() pits the two against each
+other, optionally in hard mode (every guess must be a current candidate).
+"""
+import numpy as np
+
+from patterns import (ALL_GREEN, GUESS_INDEX, NUM_PATTERNS, compute_patterns, letter_codes,
+                      pattern_marks)
+from ranking import MINIMAX, guess_indices, pattern_table, rank_by_information
+
+# Base-3 digit sum of each code: 2 per green, 1 per yellow.
+REVEALED = sum((np.arange(NUM_PATTERNS) // 3 ** i) % 3 for i in range(5))
+MAX_TURNS = 20
+
+
+def guess_codes(guess, candidates):
+    """Feedback code of `guess` against each candidate (any 5-letter guess)."""
+    if guess in GUESS_INDEX:
+        return pattern_table(guess_indices([guess]), candidates)[0]
+    return compute_patterns(letter_codes([guess]), letter_codes(candidates))[0]
+
+
+def adversary_feedback(guess, candidates):
+    """(marks, survivors): the adversary's '+*-' row for `guess` and the
+    candidates consistent with it."""
+    if not candidates:
+        raise ValueError("no candidates left")
+    codes = guess_codes(guess, candidates)
+    counts = np.bincount(codes, minlength=NUM_PATTERNS)
+    # Largest bucket, then least revealed, then lowest code.
+    code = int(np.lexsort((np.arange(NUM_PATTERNS), REVEALED, -counts))[0])
+    keep = np.flatnonzero(codes == code)
+    return pattern_marks(code), [candidates[i] for i in keep]
+
+
+class Adversary:
+    def __init__(self, candidates):
+        self.candidates = list(candidates)
+        self.rows = []
+
+    def respond(self, guess):
+        """Play `guess`; returns the adversary's marks."""
+        marks, self.candidates = adversary_feedback(guess, self.candidates)
+        self.rows.append({"word": guess, "marks": marks})
+        return marks
+
+    @property
+    def won(self):
+        return bool(self.rows) and self.rows[-1]["marks"] == pattern_marks(ALL_GREEN)
+
+
+def play(candidates, freq=None, guesses=None, hard=False):
+    """Minimax strategy vs the adversary from `candidates`; returns the rows.
+    guesses: the allowed guess list (default every allowed guess); in hard
+    mode every guess is one of the current candidates."""
+    game = Adversary(candidates)
+    while not game.won and len(game.rows) < MAX_TURNS:
+        pool = game.candidates if hard else guesses
+        game.respond(rank_by_information(game.candidates, freq, pool, MINIMAX)[0])
+    return game.rows
@@ -0,0 +1,133 @@
+"""Post-game luck/skill analysis: every guess measured against every allowed guess.
+
+For each turn of a finished game, the candidates left before the guess are
+scored against all of GUESS_WORDS in one batch (ranking.py's bucket
+statistics over pattern-matrix codes). From that come the played guess's
+expected remaining candidates and its percentile among all guesses, the best
+guess available, and a split of the actual cut into skill and luck, in bits:
+
+  cut   = log2(before / after)     information the turn actually gave
+  skill = entropy of the guess     what the choice was expected to give
+  luck  = cut - skill              how the feedback beat (or missed) that
+
+The opening turn always sees the full pool, so its scores are computed once
+per pool and kept. A later turn is usually small; one that still holds
+thousands of candidates (after a poor opener on the combined list) scores
+only the MAX_TURN_CELLS // candidates guesses that did best as openers, so
+its percentile and best guess are among those ("scored" says how many).
+POST /api/analyze
+in app.py serves this; static/js/analysis.js is the lighter in-browser
+version (counts and the solver's pick only).
+"""
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from patterns import ALL_GREEN, GUESS_INDEX, GUESS_WORDS, compute_patterns, letter_codes, pattern_code
+from rankcache import fingerprint
+from ranking import ALPHA_RANK, bucket_stats, guess_indices, pattern_table
+from wordindex import CandidateSet, pool_index
+
+CHUNK_CELLS = 1 << 23
+# Guesses x candidates one later turn may score: ~0.5 s of codes.
+MAX_TURN_CELLS = 1 << 24
+SCORE_CACHE_SIZE = 64
+
+ALL_GUESSES = guess_indices()
+_scores = OrderedDict()
+_lock = threading.Lock()
+
+
+def score_all(candidates, key=None, gidx=ALL_GUESSES):
+    """(entropy, expected_remaining) of the guesses `gidx` (default every
+    allowed guess) against `candidates`, chunked so the code table stays
+    bounded; memoized by candidate fingerprint and guess count in a small
+    LRU, where every analysis touches the opening pool's entry and so keeps
+    it."""
+    key = (key if key is not None else fingerprint(candidates), len(gidx))
+    with _lock:
+        if key in _scores:
+            _scores.move_to_end(key)
+            return _scores[key]
+    step = max(1, CHUNK_CELLS // max(1, len(candidates)))
+    ent = np.empty(len(gidx))
+    sumsq = np.empty(len(gidx))
+    for lo in range(0, len(gidx), step):
+        ent[lo:lo + step], sumsq[lo:lo + step] = bucket_stats(
+            pattern_table(gidx[lo:lo + step], candidates))
+    result = (ent, sumsq / max(len(candidates), 1))
+    with _lock:
+        _scores[key] = result
+        if len(_scores) > SCORE_CACHE_SIZE:
+            _scores.popitem(last=False)
+    return result
+
+
+def guess_score(word, candidates):
+    """(entropy, expected_remaining) of a single guess, allowed or not."""
+    if word in GUESS_INDEX:
+        codes = pattern_table(guess_indices([word]), candidates)
+    else:
+        codes = compute_patterns(letter_codes([word]), letter_codes(candidates))
+    ent, sumsq = bucket_stats(codes)
+    return float(ent[0]), float(sumsq[0]) / max(len(candidates), 1)
+
+
+def analyze_turn(word, marks, candidates, key=None, gidx=ALL_GUESSES):
+    ent, expected = score_all(candidates, key, gidx)
+    g_ent, g_exp = guess_score(word, candidates)
+    cand = set(candidates)
+    not_cand = np.array([GUESS_WORDS[g] not in cand for g in gidx])
+    best = int(np.lexsort((ALPHA_RANK[gidx], not_cand, np.round(expected, 9)))[0])
+    # Share of the scored guesses this one did at least as well as.
+    percentile = 100.0 * np.count_nonzero(expected >= g_exp - 1e-9) / len(expected)
+    return {"word": word, "marks": marks, "before": len(candidates),
+            "expected": round(g_exp, 3), "entropy": round(g_ent, 3),
+            "percentile": round(percentile, 1), "scored": len(gidx),
+            "best": GUESS_WORDS[gidx[best]], "bestExpected": round(float(expected[best]), 3),
+            "bestEntropy": round(float(ent[best]), 3)}
+
+
+def shortlist(opening, n):
+    """The n guesses with the lowest expected remaining at the opening, in
+    GUESS_WORDS order (all of them if n covers the list)."""
+    if n >= len(opening):
+        return ALL_GUESSES
+    return np.sort(ALL_GUESSES[np.argsort(opening, kind="stable")[:n]])
+
+
+def warm(pool="answers"):
+    """Score `pool`'s opening turn now rather than on the first request."""
+    cands = CandidateSet(pool_index(pool))
+    score_all(cands.words(), (pool, fingerprint(cands.survivors)))
+
+
+def analyze_game(rows, pool="answers"):
+    """{perGuess: [...], summary: {...}} for rows of {word, marks}."""
+    cands = CandidateSet(pool_index(pool))
+    per_guess = []
+    for row in rows:
+        before = cands.words()
+        key = (pool, fingerprint(cands.survivors))
+        if not before:
+            break
+        if per_guess:
+            gidx = shortlist(opening, MAX_TURN_CELLS // len(before))
+        else:
+            gidx, opening = ALL_GUESSES, score_all(before, key)[1]
+        turn = analyze_turn(row["word"], row["marks"], before, key, gidx)
+        cands.push(''.join(w + m for w, m in zip(row["word"], row["marks"])))
+        after = len(cands)
+        cut = math.log2(len(before) / after) if after else 0.0
+        turn.update(after=after, cutBits=round(cut, 3), skillBits=turn["entropy"],
+                    luckBits=round(cut - turn["entropy"], 3) if after else 0.0)
+        per_guess.append(turn)
+    won = bool(rows) and pattern_code(rows[-1]["marks"]) == ALL_GREEN
+    return {"perGuess": per_guess, "summary": {
+        "guesses": len(rows), "won": won,
+        "avgPercentile": round(sum(t["percentile"] for t in per_guess) / max(1, len(per_guess)), 1),
+        "skillBits": round(sum(t["skillBits"] for t in per_guess), 3),
+        "luckBits": round(sum(t["luckBits"] for t in per_guess), 3),
+    }}
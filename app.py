@@ -1,12 +1,294 @@
-from flask import Flask, render_template
+import cProfile
+import logging
+import mimetypes
+import os
+import threading
+import time
+from functools import lru_cache
+
+from flask import Flask, Response, abort, g, jsonify, render_template, request, send_file, url_for
+
+from analysis import analyze_game, warm as warm_analysis
+from assets import DATA_DIR, SUFFIX, load_assets
+import metrics
+from decision_tree import OFF_TREE, load_tree, tree_guess
+from patternstore import PATTERNS
+from rankcache import RankCache, fingerprint
+from solver_ref import (ANSWER_WORDS, EXTENDED_WORDS, WordleState, find_valid_words, load_freq,
+                        rank_suggestions, state_from_rows)
+from wordindex import pool_index
+
+# Only cheap loads happen at import: the data files, then the shared
+# warm-up stages (word indexes, opener tree, hot pattern rows). The opening
+# rankings and both lists' opening-turn analysis scores are built by a
+# background warm-up thread (see the bottom of this file), so a cold start
+# answers /healthz at once; until READY is set /readyz returns 503 and
+# /api/solve takes the slower uncached path.
+FREQ = load_freq()
+ASSETS = load_assets()
+ANSWER_SET = frozenset(ANSWER_WORDS)
+POOL_WORDS = {"answers": ANSWER_WORDS, "both": ANSWER_WORDS + EXTENDED_WORDS}
+MAX_ROWS = 16
+MAX_TOP = 50
+DEFAULT_TOP = 10
+SOLVE_CACHE_SIZE = 4096
+RANK_CACHE_SIZE = 1024
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+RANKS = RankCache(ANSWER_SET, FREQ, RANK_CACHE_SIZE)
+# With WOSOLVE_PROFILE_DIR set, any request with ?profile=1 is run under
+# cProfile and its stats dumped there (load with pstats / snakeviz).
+PROFILE_DIR = os.environ.get("WOSOLVE_PROFILE_DIR")
+READY = threading.Event()
+WARMUP_SECONDS = {}  # stage name -> seconds, as each stage finishes
+
+log = logging.getLogger("wosolve")
+if not log.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("[%(asctime)s] [%(process)d] [%(levelname)s] %(message)s"))
+    log.addHandler(_handler)
+    log.setLevel(logging.INFO)
 
 app = Flask(__name__)
 
 
+@app.before_request
+def start_timer():
+    g.started = time.perf_counter()
+    if PROFILE_DIR and request.args.get("profile") == "1":
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+@app.after_request
+def record_request(resp):
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{request.endpoint}-{time.time_ns()}.pstats")
+        profiler.dump_stats(path)
+        resp.headers["X-Profile-Dump"] = os.path.basename(path)
+    # Label by route pattern, not raw path, so the series stay bounded.
+    route = request.url_rule.rule if request.url_rule else "<unmatched>"
+    metrics.histogram("wosolve_request_seconds", "Request latency by route.",
+                      route=route, method=request.method
+                      ).observe(time.perf_counter() - g.started)
+    return resp
+
+
+@app.teardown_request
+def stop_profiler(exc):
+    # after_request is skipped when the view raises; don't leave it running.
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+
+
+def cache_families():
+    """Hit/miss counters and sizes of the solve, rank and pattern-row caches, for /metrics."""
+    solve, rank, rows = solve_signature.cache_info(), RANKS.info(), PATTERNS.info()
+    stats = {"solve": (solve.hits, solve.misses, solve.currsize),
+             "rank": (rank["hits"], rank["misses"], rank["size"]),
+             "pattern_rows": (rows["hits"], rows["misses"], rows["rows"])}
+    sample = lambda i: [({"cache": k}, v[i]) for k, v in stats.items()]
+    ratio = [({"cache": k}, h / (h + m) if h + m else 0.0) for k, (h, m, _) in stats.items()]
+    return [("wosolve_cache_hits_total", "counter", "Cache hits.", sample(0)),
+            ("wosolve_cache_misses_total", "counter", "Cache misses.", sample(1)),
+            ("wosolve_cache_entries", "gauge", "Entries currently cached.", sample(2)),
+            ("wosolve_cache_hit_ratio", "gauge", "Hits / lookups since start.", ratio),
+            ("wosolve_pattern_rows_bytes", "gauge", "Pattern rows held in memory, by kind.",
+             [({"kind": "cached"}, rows["bytes"]), ({"kind": "budget"}, rows["budget"]),
+              ({"kind": "hot_mapped"}, rows["hot_bytes"])]),
+            ("wosolve_ready", "gauge", "1 once warm-up has finished.",
+             [({}, float(READY.is_set()))]),
+            ("wosolve_warmup_stage_seconds", "gauge", "Time each finished warm-up stage took.",
+             [({"stage": name}, secs) for name, secs in list(WARMUP_SECONDS.items())])]
+
+
+@app.get('/healthz')
+def healthz():
+    """Liveness: the process is up and serving, warm or not."""
+    return jsonify(status="ok")
+
+
+@app.get('/readyz')
+def readyz():
+    """Readiness: 200 once warm-up is done, 503 before; lists finished stages."""
+    ready = READY.is_set()
+    stages = {name: round(secs, 3) for name, secs in list(WARMUP_SECONDS.items())}
+    return jsonify(ready=ready, stages=stages), 200 if ready else 503
+
+
+@app.get('/metrics')
+def metrics_text():
+    return Response(metrics.render(cache_families()), content_type=metrics.CONTENT_TYPE)
+
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
 
+@app.context_processor
+def data_urls():
+    """{"answers.json": url, ...}: the hashed /data/ URL when dist/ has a
+    fresh build of the file, else the plain static one."""
+    urls = {f.name: url_for('static', filename=f'data/{f.name}') for f in DATA_DIR.iterdir()}
+    for name, entry in ASSETS.items():
+        urls[entry["source"]] = url_for('hashed_data', name=name)
+    return {"data_urls": urls}
+
+
+@app.get('/data/<name>')
+def hashed_data(name):
+    """A content-hashed static/data file, precompressed per Accept-Encoding."""
+    entry = ASSETS.get(name)
+    if entry is None:
+        abort(404)
+    accept = request.accept_encodings
+    encoding = next((e for e in entry["encodings"] if accept[e]), None)
+    path = entry["path"] if encoding is None else entry["path"].with_name(name + SUFFIX[encoding])
+    etag = entry["sha256"][:32] + ("." + encoding if encoding else "")
+    mimetype = mimetypes.guess_type(entry["source"])[0] or "application/octet-stream"
+    resp = send_file(path, mimetype=mimetype, download_name=name, etag=etag,
+                     conditional=True, max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    resp.vary.add("Accept-Encoding")
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
+
+
+def signature(state):
+    """Canonical, hashable form of a state: its compiled constraints. Guess
+    orders (or different guesses) that pin down the same constraints share
+    one signature, so they share one cache entry."""
+    allowed, min_counts, max_counts = state.compile()
+    return tuple(allowed), tuple(min_counts), tuple(max_counts)
+
+
+@lru_cache(maxsize=SOLVE_CACHE_SIZE)
+def solve_signature(pool, sig):
+    # Different constraint signatures can still leave the same survivors;
+    # RANKS shares one ranking between them.
+    index = pool_index(pool)
+    idx = index.select(sig)
+    ranked = RANKS.rank(index.take(idx), top=MAX_TOP, key=(pool, fingerprint(idx)))
+    return len(idx), tuple(ranked)
+
+
+def solve_uncached(pool, state):
+    """solve_signature's result from the reference filter and ranking, with
+    no index or cache: what /api/solve serves until warm-up is done."""
+    cands = find_valid_words(POOL_WORDS[pool], state)
+    return len(cands), tuple(rank_suggestions(cands, ANSWER_SET, FREQ)[:MAX_TOP])
+
+
+def parse_game(body):
+    """(pool, rows, state) from a request body; raises ValueError with the
+    message for a 400."""
+    if not isinstance(body, dict):
+        raise ValueError("expected a JSON object body")
+    pool = body.get("list", "answers")
+    if pool not in POOL_WORDS:
+        raise ValueError(f"list must be one of {sorted(POOL_WORDS)}")
+    rows = body.get("rows", [])
+    if not isinstance(rows, list) or len(rows) > MAX_ROWS:
+        raise ValueError(f"rows must be a list of at most {MAX_ROWS} rows")
+    return pool, rows, state_from_rows(rows)
+
+
+@app.post('/api/solve')
+def api_solve():
+    body = request.get_json(silent=True)
+    try:
+        pool, rows, state = parse_game(body)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    top = body.get("top", DEFAULT_TOP)
+    if not isinstance(top, int) or isinstance(top, bool) or not 1 <= top <= MAX_TOP:
+        return jsonify(error=f"top must be an integer in 1..{MAX_TOP}"), 400
+    if READY.is_set():
+        count, ranked = solve_signature(pool, signature(state))
+    else:
+        count, ranked = solve_uncached(pool, state)
+    # "next" is the solver's recommended play: the precomputed opener tree's
+    # guess while the game is on it (answers list only), else the top pick.
+    nxt = tree_guess(rows) if pool == "answers" else OFF_TREE
+    if nxt is OFF_TREE:
+        nxt = ranked[0] if ranked else None
+    return jsonify(count=count, top=list(ranked[:top]), next=nxt)
+
+
+@app.post('/api/analyze')
+def api_analyze():
+    """Per-guess luck/skill breakdown of a finished (or partial) game.
+    Before warm-up is done this builds whatever it needs itself."""
+    try:
+        pool, rows, _ = parse_game(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(analyze_game(rows, pool))
+
+
+def warm_openings():
+    for pool in POOL_WORDS:
+        solve_signature(pool, signature(WordleState()))
+
+
+# Read-only data every process can share: run at import, before a
+# preloading gunicorn master forks, so workers inherit it copy-on-write.
+SHARED_STAGES = [
+    ("word indexes", lambda: [pool_index(pool) for pool in POOL_WORDS]),
+    ("opener tree", load_tree),
+    ("hot pattern rows", PATTERNS.load_hot),
+]
+# Per-process caches, filled by the warm-up thread.
+WARMUP_STAGES = SHARED_STAGES + [
+    ("opening rankings", warm_openings),
+    ("opening analysis", lambda: warm_analysis("answers")),
+    ("combined opening analysis", lambda: warm_analysis("both")),
+]
+# gunicorn.conf.py sets this so the thread starts in each worker (its
+# post_fork hook), never in the master: forking while the thread holds a
+# cache lock would leave the child holding it forever.
+DEFER_ENV = "WOSOLVE_WARMUP_POST_FORK"
+
+
+def run_stages(stages):
+    """Run the stages not done yet, logging each one's time. False (logged)
+    if one failed."""
+    try:
+        for name, stage in stages:
+            if name not in WARMUP_SECONDS:
+                started = time.perf_counter()
+                stage()
+                WARMUP_SECONDS[name] = time.perf_counter() - started
+                log.info("warm-up: %s took %.3fs", name, WARMUP_SECONDS[name])
+    except Exception:
+        log.exception("warm-up failed; serving uncached")
+        return False
+    return True
+
+
+def warm_up():
+    """Run the remaining warm-up stages, then set READY. On failure READY
+    stays unset and requests stay uncached."""
+    if run_stages(WARMUP_STAGES):
+        log.info("warm-up: ready after %.3fs", sum(WARMUP_SECONDS.values()))
+        READY.set()
+
+
+def start_warmup():
+    if not READY.is_set():
+        threading.Thread(target=warm_up, name="wosolve-warmup", daemon=True).start()
+
+
+run_stages(SHARED_STAGES)
+if not os.environ.get(DEFER_ENV):
+    start_warmup()
+
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,84 @@
+"""Precompressed, content-hashed copies of static/data for app.py to serve.
+
+scripts/gen_static_bundle.py writes every file in static/data/ to dist/
+under a content-hashed name (answers.<hash>.json) alongside .gz and, when
+the brotli package is installed, .br variants, plus dist/manifest.json:
+
+  {"answers.json": {"file": "answers.<hash>.json", "sha256": "...",
+                    "encodings": ["br", "gzip"]}, ...}
+
+A hashed name never changes content, so it can be cached forever; the page
+picks up new names whenever the data is rebuilt. load_assets() drops any
+manifest entry whose source has changed since the build, so a stale dist/
+falls back to the plain /static/data/ URL instead of serving old data.
+"""
+import gzip
+import hashlib
+import json
+import pathlib
+
+try:
+    import brotli
+except ImportError:  # optional: gzip alone still works
+    brotli = None
+
+ROOT = pathlib.Path(__file__).resolve().parent
+DATA_DIR = ROOT / "static" / "data"
+DIST_DIR = ROOT / "dist"
+MANIFEST = "manifest.json"
+HASH_LEN = 12
+SUFFIX = {"br": ".br", "gzip": ".gz"}
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def compress(data, encoding):
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+
+def build(src=DATA_DIR, out=DIST_DIR):
+    """Write hashed + precompressed copies of src/* into out/; returns the manifest."""
+    out = pathlib.Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    encodings = ["br", "gzip"] if brotli else ["gzip"]
+    manifest, keep = {}, {MANIFEST}
+    for path in sorted(pathlib.Path(src).iterdir()):
+        if not path.is_file():
+            continue
+        data = path.read_bytes()
+        digest = content_hash(data)
+        name = f"{path.stem}.{digest[:HASH_LEN]}{path.suffix}"
+        (out / name).write_bytes(data)
+        keep.add(name)
+        for enc in encodings:
+            (out / (name + SUFFIX[enc])).write_bytes(compress(data, enc))
+            keep.add(name + SUFFIX[enc])
+        manifest[path.name] = {"file": name, "sha256": digest, "encodings": encodings}
+    for old in out.iterdir():  # earlier builds' hashes
+        if old.name not in keep:
+            old.unlink()
+    (out / MANIFEST).write_text(json.dumps(manifest, indent=1, sort_keys=True) + "\n")
+    return manifest
+
+
+def load_assets(dist=DIST_DIR, src=DATA_DIR):
+    """{hashed name: manifest entry + "path"} for the entries still matching
+    their source file; {} if there is no build."""
+    dist = pathlib.Path(dist)
+    try:
+        manifest = json.loads((dist / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return {}
+    assets = {}
+    for source, entry in manifest.items():
+        try:
+            fresh = content_hash((pathlib.Path(src) / source).read_bytes()) == entry["sha256"]
+        except OSError:
+            fresh = False
+        if fresh and (dist / entry["file"]).is_file():
+            assets[entry["file"]] = {**entry, "source": source, "path": dist / entry["file"]}
+    return assets
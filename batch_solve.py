@@ -0,0 +1,137 @@
+"""Streaming batch solver: one game per input line in, one JSON result per line out.
+
+    python -m batch_solve [--list answers|both] [--top N] [--candidates]
+                          [--mode heuristic|entropy|expected|minimax]
+                          [--workers N] [--chunk N] [INPUT]
+
+Each input line (INPUT, or stdin) is a game, either as NDJSON in the shape
+/api/solve takes - {"rows": [{"word": "crane", "marks": "-*---"}], "id": ...}
+with an optional "id" echoed back - or as update_state encodings separated
+by spaces or commas: "c-r*a-n-e- p-i-l+o-t-". Each output line is
+{"count": n, "top": [...]} (plus "candidates" with --candidates), or
+{"error": "..."} for a line that doesn't parse; blank lines are games with
+no guesses.
+
+Lines are read and solved in chunks across a process pool with only a few
+chunks in flight at once, and results are written in input order as soon as
+each chunk is done, so memory stays flat however long the input is.
+"""
+import argparse
+import collections
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+
+from ranking import MINIMAX, OBJECTIVES
+from solver_ref import ANSWER_WORDS, load_freq, rank_suggestions, state_from_rows
+from wordindex import ANSWERS, COMBINED
+
+POOLS = {"answers": ANSWERS, "both": COMBINED}
+MODES = ("heuristic", *OBJECTIVES, MINIMAX)  # every rank_suggestions mode
+ENCODED_RE = re.compile(r"^([a-z][-*+]){5}$")
+ANSWER_SET = frozenset(ANSWER_WORDS)
+CACHE_SIZE = 4096
+
+_freq = {}
+
+
+def parse_line(line):
+    """-> (rows, id). Raises ValueError on anything that isn't a game."""
+    line = line.strip()
+    if line.startswith("{"):
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"bad JSON: {e}")
+        rows = obj.get("rows", [])
+        if not isinstance(rows, list):
+            raise ValueError("rows must be a list")
+        return rows, obj.get("id")
+    rows = []
+    for token in line.replace(",", " ").split():
+        if not ENCODED_RE.match(token):
+            raise ValueError(f"bad guess encoding {token!r}")
+        rows.append({"word": token[0::2], "marks": token[1::2]})
+    return rows, None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def solve_signature(pool, sig, mode, top):
+    index = POOLS[pool]
+    cands = index.take(index.select(sig))
+    return len(cands), tuple(rank_suggestions(cands, ANSWER_SET, _freq, mode=mode)[:top])
+
+
+def solve_line(line, pool, top, with_candidates, mode):
+    try:
+        rows, game_id = parse_line(line)
+        state = state_from_rows(rows)
+    except ValueError as e:
+        return json.dumps({"error": str(e)}, separators=(",", ":"))
+    sig = tuple(map(tuple, state.compile()))
+    count, ranked = solve_signature(pool, sig, mode, top)
+    out = {} if game_id is None else {"id": game_id}
+    out["count"] = count
+    out["top"] = list(ranked)
+    if with_candidates:
+        out["candidates"] = POOLS[pool].take(POOLS[pool].select(sig))
+    return json.dumps(out, separators=(",", ":"))
+
+
+def solve_chunk(lines, pool, top, with_candidates, mode):
+    if not _freq:
+        _freq.update(load_freq())
+    return [solve_line(l, pool, top, with_candidates, mode) for l in lines]
+
+
+def chunks(lines, size):
+    it = iter(lines)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def run(lines, out, pool="answers", top=10, with_candidates=False, mode="heuristic",
+        workers=None, chunk=256):
+    """Solve every game in `lines`, writing one result line per game to `out`."""
+    args = (pool, top, with_candidates, mode)
+    if workers == 1:
+        for c in chunks(lines, chunk):
+            out.write("".join(r + "\n" for r in solve_chunk(c, *args)))
+        return
+    workers = workers or os.cpu_count() or 1
+    pending = collections.deque()
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for c in chunks(lines, chunk):
+            pending.append(ex.submit(solve_chunk, c, *args))
+            # Bounded read-ahead: never more than 2 chunks per worker queued.
+            if len(pending) >= 2 * workers:
+                out.write("".join(r + "\n" for r in pending.popleft().result()))
+        while pending:
+            out.write("".join(r + "\n" for r in pending.popleft().result()))
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m batch_solve",
+                                description="Solve one game per line, streaming JSON results.")
+    p.add_argument("input", nargs="?", help="input file (default: stdin)")
+    p.add_argument("--list", choices=sorted(POOLS), default="answers", help="candidate pool")
+    p.add_argument("--top", type=int, default=10, help="suggestions per game")
+    p.add_argument("--candidates", action="store_true", help="include the full candidate list")
+    p.add_argument("--mode", choices=MODES, default="heuristic")
+    p.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    p.add_argument("--chunk", type=int, default=256, help="games per work unit")
+    a = p.parse_args(argv)
+    src = open(a.input) if a.input else sys.stdin
+    try:
+        run(src, sys.stdout, a.list, a.top, a.candidates, a.mode, a.workers, a.chunk)
+    finally:
+        if a.input:
+            src.close()
+
+
+if __name__ == "__main__":
+    main()
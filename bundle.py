@@ -0,0 +1,102 @@
+"""Compact single-file bundle of the word lists, freq tiers and past answers.
+
+static/data/bundle.bin (built by scripts/gen_bundle.py) carries what
+answers.json, extended.json, freq.json and past-answers.json do, with every
+word stored once:
+
+  header   BUNDLE_HEADER: magic, version, #words, #days, meta length
+  meta     UTF-8 JSON {"epoch": "2021-06-19", "meta": <past-answers meta>}
+  table    the sorted union of all words, prefix-compressed: each word is
+           one byte (shared-prefix length << 5 | first new letter, a = 0)
+           followed by its remaining letters as ASCII
+  kinds    one byte per word: 1 = in answers.json, 2 = in extended.json
+  tiers    one byte per word: its freq.json tier, NO_TIER if it has none
+  days     uint16 LE per day since epoch (Wordle #0): the answer's word
+           index, NO_ANSWER for a day with no entry
+
+decode() gives back exactly the four JSON structures; static/js/bundle.js is
+the browser's decoder for the same bytes.
+"""
+import json
+import struct
+from datetime import date, timedelta
+
+BUNDLE_MAGIC = b"WOSB"
+BUNDLE_VERSION = 1
+BUNDLE_HEADER = struct.Struct("<4sHIII")
+ANSWER, EXTENDED = 1, 2
+NO_TIER = 255
+NO_ANSWER = 0xFFFF
+
+
+def encode(answers, extended, freq, past, epoch):
+    """Bundle bytes. The lists must be sorted and disjoint (as generated):
+    they are stored as membership flags on the sorted word table."""
+    for name, words in (("answers", answers), ("extended", extended)):
+        if list(words) != sorted(set(words)):
+            raise ValueError(f"{name} must be sorted and free of duplicates")
+    by_date = past["byDate"]
+    table = sorted(set(answers) | set(extended) | set(freq) | set(by_date.values()))
+    if len(table) >= NO_ANSWER:
+        raise ValueError(f"too many words for 16-bit indices: {len(table)}")
+    index = {w: i for i, w in enumerate(table)}
+    kinds = bytearray(len(table))
+    for w in answers:
+        kinds[index[w]] |= ANSWER
+    for w in extended:
+        kinds[index[w]] |= EXTENDED
+    tiers = bytearray([NO_TIER]) * len(table)
+    for w, t in freq.items():
+        if not 0 <= t < NO_TIER:
+            raise ValueError(f"tier out of range for {w!r}: {t}")
+        tiers[index[w]] = t
+    offsets = {(date.fromisoformat(d) - epoch).days: w for d, w in by_date.items()}
+    if list(by_date) != sorted(by_date) or min(offsets, default=0) < 0:
+        raise ValueError("past answers must be in date order, none before the epoch")
+    days = [NO_ANSWER] * (max(offsets) + 1 if offsets else 0)
+    for day, w in offsets.items():
+        days[day] = index[w]
+    body = bytearray()
+    prev = ""
+    for w in table:
+        p = 0
+        while p < 4 and w[p] == prev[p:p + 1]:
+            p += 1
+        body.append(p << 5 | (ord(w[p]) - 97))
+        body += w[p + 1:].encode("ascii")
+        prev = w
+    meta = json.dumps({"epoch": epoch.isoformat(), "meta": past["meta"]},
+                      separators=(",", ":")).encode()
+    return (BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(table), len(days), len(meta))
+            + meta + bytes(body) + bytes(kinds) + bytes(tiers)
+            + struct.pack(f"<{len(days)}H", *days))
+
+
+def decode(data):
+    """{answers, extended, freq, pastAnswers} - the four JSON files' contents."""
+    magic, version, n, n_days, meta_len = BUNDLE_HEADER.unpack_from(data)
+    if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+        raise ValueError(f"not a version {BUNDLE_VERSION} bundle")
+    pos = BUNDLE_HEADER.size
+    meta = json.loads(bytes(data[pos:pos + meta_len]))
+    pos += meta_len
+    table, prev = [], ""
+    for _ in range(n):
+        b = data[pos]
+        p = b >> 5
+        w = prev[:p] + chr(97 + (b & 31)) + bytes(data[pos + 1:pos + 5 - p]).decode("ascii")
+        pos += 5 - p
+        table.append(w)
+        prev = w
+    kinds, tiers = data[pos:pos + n], data[pos + n:pos + 2 * n]
+    pos += 2 * n
+    days = struct.unpack_from(f"<{n_days}H", data, pos)
+    epoch = date.fromisoformat(meta["epoch"])
+    return {
+        "answers": [w for w, k in zip(table, kinds) if k & ANSWER],
+        "extended": [w for w, k in zip(table, kinds) if k & EXTENDED],
+        "freq": {w: t for w, t in zip(table, tiers) if t != NO_TIER},
+        "pastAnswers": {"meta": meta["meta"],
+                        "byDate": {(epoch + timedelta(days=d)).isoformat(): table[i]
+                                   for d, i in enumerate(days) if i != NO_ANSWER}},
+    }
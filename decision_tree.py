@@ -0,0 +1,78 @@
+"""Precomputed solve tree for the fixed opener, over ANSWER_WORDS.
+
+static/data/decision-tree.json (built by scripts/gen_decision_tree.py) holds
+the whole answers-only game as a nested tree: an internal node is
+[guess, {marks: child}] and a leaf (one candidate left) is just the guess,
+with guesses stored as indices into answers.json. The root guess is
+suggest_word(ANSWER_WORDS); every later guess is what rank_suggestions
+would pick for that state, so following the tree gives exactly the live
+solver's answer. next_guess() walks the tree - at most one dict lookup per
+row - and only filters and ranks live once the rows leave it.
+"""
+import json
+import pathlib
+
+from solver_ref import ANSWER_WORDS
+from wordindex import CandidateSet, pool_index
+
+ROOT = pathlib.Path(__file__).resolve().parent
+TREE_PATH = ROOT / "static/data/decision-tree.json"
+ALL_GREEN = "+++++"
+OFF_TREE = object()
+ANSWER_SET = frozenset(ANSWER_WORDS)
+
+_tree = None
+
+
+def load_tree():
+    """The tree's root node, or None if the file is missing."""
+    global _tree
+    if _tree is None:
+        try:
+            _tree = json.loads(TREE_PATH.read_text())["tree"]
+        except (OSError, ValueError, KeyError):
+            return None
+    return _tree
+
+
+def walk(rows, tree=None):
+    """Node reached by following `rows` ({word, marks} dicts), None once the
+    game is solved on-tree, or OFF_TREE if a row diverges from the tree."""
+    node = load_tree() if tree is None else tree
+    if node is None:
+        return OFF_TREE
+    for row in rows:
+        if node is None:
+            return OFF_TREE
+        guess, children = (node, {}) if isinstance(node, int) else node
+        if row["word"] != ANSWER_WORDS[guess]:
+            return OFF_TREE
+        if row["marks"] == ALL_GREEN:
+            node = None
+            continue
+        if row["marks"] not in children:
+            return OFF_TREE
+        node = children[row["marks"]]
+    return node
+
+
+def tree_guess(rows, tree=None):
+    """The tree's next guess after `rows`, None if solved, or OFF_TREE."""
+    node = walk(rows, tree)
+    if node is None or node is OFF_TREE:
+        return node
+    return ANSWER_WORDS[node if isinstance(node, int) else node[0]]
+
+
+def live_guess(rows, freq=None):
+    """Filter-and-rank fallback for rows the tree doesn't cover."""
+    rows = [''.join(a + b for a, b in zip(r["word"], r["marks"])) for r in rows]
+    cands = CandidateSet(pool_index("answers"), rows)
+    ranked = cands.rank(ANSWER_SET, freq)
+    return ranked[0] if ranked else None
+
+
+def next_guess(rows, freq=None, tree=None):
+    """Recommended next guess for an answers-list game, or None if solved."""
+    guess = tree_guess(rows, tree)
+    return live_guess(rows, freq) if guess is OFF_TREE else guess
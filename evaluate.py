@@ -0,0 +1,173 @@
+"""Whole-dictionary strategy evaluator: play every answer, report how it went.
+
+    python -m evaluate [--strategy NAME ...] [--list answers|both ...]
+                       [--workers N] [--worst K] [--limit N] [--json PATH]
+
+Plays a full game for every word in ANSWER_WORDS with each chosen strategy,
+against each chosen candidate pool ("answers" and "both" by default), and
+prints the average number of guesses, the guess distribution, the failure
+rate (not solved in 6) and the K answers that took longest. Several
+--strategy flags run side by side for A/B comparison.
+
+Built-in strategies: rank (rank_suggestions' top pick) and suggest
+(suggest_word), both scored from the candidate set's letter histogram;
+entropy / expected / minimax (rank_suggestions' information and worst-case
+modes); tree (the precomputed opener tree, answers list only). Anything else is
+imported as "module:function" and must take rank_suggestions' arguments
+(candidates, answer_set, freq) and return a ranked list.
+
+Answers are split into chunks across a process pool. Workers are forked
+after the word index and pattern matrix are loaded, so they share that
+read-only data instead of each building a copy; within a worker, games that
+reach the same rows reuse the strategy's pick.
+"""
+import argparse
+import collections
+import importlib
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from decision_tree import next_guess
+from patterns import load_matrix
+from patternstore import PATTERNS
+from solver_ref import ANSWER_WORDS, feedback, load_freq, rank_suggestions
+from wordindex import ANSWERS, COMBINED, CandidateSet
+
+POOLS = {"answers": ANSWERS, "both": COMBINED}
+ANSWER_SET = frozenset(ANSWER_WORDS)
+MAX_GUESSES = 6
+GIVE_UP = 20
+
+STRATEGIES = {
+    "rank": lambda cands, rows, freq: cands.rank(ANSWER_SET, freq)[0],
+    "suggest": lambda cands, rows, freq: cands.suggest(),
+    "entropy": lambda cands, rows, freq: rank_suggestions(cands.words(), ANSWER_SET, freq, mode="entropy")[0],
+    "expected": lambda cands, rows, freq: rank_suggestions(cands.words(), ANSWER_SET, freq, mode="expected")[0],
+    "minimax": lambda cands, rows, freq: rank_suggestions(cands.words(), ANSWER_SET, freq, mode="minimax")[0],
+    "tree": lambda cands, rows, freq: next_guess(rows, freq),
+}
+
+_freq = {}
+_picks = {}
+
+
+def resolve(name):
+    """Strategy name -> fn(candidate_set, rows, freq) returning the next guess."""
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    module, _, attr = name.partition(":")
+    if not attr:
+        raise ValueError(f"unknown strategy {name!r} (built-ins: {', '.join(STRATEGIES)}, "
+                         f"or module:function)")
+    ranker = getattr(importlib.import_module(module), attr)
+    return lambda cands, rows, freq: ranker(cands.words(), ANSWER_SET, freq)[0]
+
+
+def play(answer, strategy, name, pool):
+    """Guesses made solving `answer`, the last one being the answer itself
+    unless the strategy gave up after GIVE_UP guesses."""
+    cands = CandidateSet(POOLS[pool])
+    rows, guesses = [], []
+    while len(guesses) < GIVE_UP:
+        key = (name, pool, tuple(cands.rows))
+        if key not in _picks:
+            _picks[key] = strategy(cands, rows, _freq)
+        guess = _picks[key]
+        guesses.append(guess)
+        if guess == answer:
+            break
+        enc = feedback(answer, guess)
+        rows.append({"word": guess, "marks": enc[1::2]})
+        cands.push(enc)
+    return guesses
+
+
+def play_chunk(name, pool, answers):
+    if not _freq:
+        _freq.update(load_freq())
+    strategy = resolve(name)
+    return [(a, play(a, strategy, name, pool)) for a in answers]
+
+
+def summarize(games, worst):
+    counts = [len(g) if g[-1] == a else None for a, g in games]
+    solved = [c for c in counts if c is not None and c <= MAX_GUESSES]
+    dist = collections.Counter(solved)
+    ranked = sorted(games, key=lambda ag: (-len(ag[1]), ag[0]))
+    return {
+        "games": len(games),
+        "avg_guesses": round(sum(c for c in counts if c) / max(1, sum(1 for c in counts if c)), 4),
+        "distribution": {str(n): dist.get(n, 0) for n in range(1, MAX_GUESSES + 1)},
+        "failures": len(games) - len(solved),
+        "failure_rate": round((len(games) - len(solved)) / max(1, len(games)), 4),
+        "max_guesses": max(len(g) for _, g in games) if games else 0,
+        "worst": [{"answer": a, "guesses": g} for a, g in ranked[:worst]],
+    }
+
+
+def evaluate(strategies, pools, answers, workers=None, chunk=64, worst=10):
+    """{(strategy, pool): summary} for every combination."""
+    load_matrix()  # map the pattern matrix and hot rows before forking so workers share them
+    PATTERNS.load_hot()
+    if not _freq:
+        _freq.update(load_freq())
+    jobs = [(s, p) for s in strategies for p in pools if not (s == "tree" and p != "answers")]
+    for s, _ in jobs:
+        resolve(s)  # fail fast on a bad name, before spawning anything
+    chunks = [answers[i:i + chunk] for i in range(0, len(answers), chunk)]
+    results = {}
+    if workers == 1:
+        for s, p in jobs:
+            results[(s, p)] = [g for c in chunks for g in play_chunk(s, p, c)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = {(s, p): [ex.submit(play_chunk, s, p, c) for c in chunks] for s, p in jobs}
+            for key, fs in futures.items():
+                results[key] = [g for f in fs for g in f.result()]
+    return {key: summarize(games, worst) for key, games in results.items()}
+
+
+def report(summaries, out=sys.stdout):
+    cols = [str(n) for n in range(1, MAX_GUESSES + 1)]
+    out.write(f"{'strategy':12} {'list':8} {'avg':>7} " + " ".join(f"{c:>5}" for c in cols)
+              + f" {'fail':>6} {'max':>4}\n")
+    for (s, p), r in summaries.items():
+        out.write(f"{s:12} {p:8} {r['avg_guesses']:7.4f} "
+                  + " ".join(f"{r['distribution'][c]:5d}" for c in cols)
+                  + f" {r['failures']:6d} {r['max_guesses']:4d}\n")
+    for (s, p), r in summaries.items():
+        if r["worst"]:
+            out.write(f"\nworst for {s}/{p}:\n")
+            for w in r["worst"]:
+                out.write(f"  {w['answer']}: {len(w['guesses'])} - {' '.join(w['guesses'])}\n")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m evaluate",
+                                description="Play every answer with one or more strategies.")
+    p.add_argument("--strategy", action="append", help=f"{', '.join(STRATEGIES)} "
+                   "or module:function (repeatable; default: rank)")
+    p.add_argument("--list", action="append", choices=sorted(POOLS),
+                   help="candidate pool (repeatable; default: both pools)")
+    p.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    p.add_argument("--chunk", type=int, default=64, help="answers per work unit")
+    p.add_argument("--worst", type=int, default=10, help="worst cases to report per run")
+    p.add_argument("--limit", type=int, default=None, help="only the first N answers (quick runs)")
+    p.add_argument("--json", help="also write the full report here")
+    a = p.parse_args(argv)
+    answers = ANSWER_WORDS[:a.limit] if a.limit else ANSWER_WORDS
+    try:
+        summaries = evaluate(a.strategy or ["rank"], a.list or ["answers", "both"], answers,
+                             a.workers, a.chunk, a.worst)
+    except (ValueError, ImportError, AttributeError) as e:
+        p.error(str(e))
+    report(summaries)
+    if a.json:
+        with open(a.json, "w") as f:
+            json.dump([{"strategy": s, "list": pool, **r} for (s, pool), r in summaries.items()],
+                      f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
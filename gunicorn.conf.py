@@ -0,0 +1,12 @@
+"""gunicorn settings read from the working directory (every deploy command
+runs from the repo root). With --preload the master imports app.py, which
+runs only the shared warm-up stages; the per-process stages start in each
+worker once it is forked."""
+import os
+
+os.environ["WOSOLVE_WARMUP_POST_FORK"] = "1"
+
+
+def post_fork(server, worker):
+    import app  # already imported with --preload; imported here otherwise
+    app.start_warmup()
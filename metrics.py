@@ -0,0 +1,103 @@
+"""Optional hot-path instrumentation, exposed in Prometheus text format.
+
+Set WOSOLVE_METRICS=1 in the environment (before solver_ref is imported) to
+turn it on. @timed(name) then wraps a function so every call is counted and
+its latency recorded in a histogram, optionally with a size (e.g. how many
+candidates it saw); with it off, @timed hands back the function itself, so
+the disabled cost is nothing at all.
+
+Histograms live in one process-wide registry. app.py adds per-route request
+latency and cache counters, and serves render() at GET /metrics. Under
+gunicorn each worker keeps its own registry, so a scrape sees one worker.
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("WOSOLVE_METRICS", "") not in ("", "0")
+LATENCY_BUCKETS = (1e-6, 5e-6, 2.5e-5, 1e-4, 2.5e-4, 1e-3, 2.5e-3, 1e-2, 2.5e-2, 0.1, 0.25, 1.0)
+SIZE_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000, 2500, 5000, 15000)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_families = {}  # name -> (doc, {label items: Histogram})
+_lock = threading.Lock()
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot: above every bucket
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+
+def histogram(name, doc, buckets=LATENCY_BUCKETS, **labels):
+    """The registry's histogram for (name, labels), created on first use."""
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        series = _families.setdefault(name, (doc, {}))[1]
+        if key not in series:
+            series[key] = Histogram(buckets)
+        return series[key]
+
+
+def timed(name, size=None):
+    """Decorator: latency histogram wosolve_solver_seconds{fn=name}, plus
+    wosolve_solver_size{fn=name} of size(args, result) when given. The
+    identity when metrics are disabled."""
+    if not ENABLED:
+        return lambda fn: fn
+
+    def wrap(fn):
+        seconds = histogram("wosolve_solver_seconds", "Solver call latency.", fn=name)
+        sizes = size and histogram("wosolve_solver_size", "Candidate-set size per solver call.",
+                                   SIZE_BUCKETS, fn=name)
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            t = time.perf_counter()
+            result = fn(*args, **kwargs)
+            seconds.observe(time.perf_counter() - t)
+            if sizes:
+                sizes.observe(size(args, result))
+            return result
+        return inner
+    return wrap
+
+
+def _labels(items):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}" if items else ""
+
+
+def render(extra=()):
+    """Every registered histogram, then `extra` families of
+    (name, type, doc, [(labels dict, value), ...]), as Prometheus text."""
+    lines = []
+    with _lock:
+        families = [(name, doc, list(series.items())) for name, (doc, series) in _families.items()]
+    for name, doc, series in sorted(families):
+        lines += [f"# HELP {name} {doc}", f"# TYPE {name} histogram"]
+        for key, h in sorted(series):
+            with h._lock:
+                counts, total, count = list(h.counts), h.sum, h.count
+            cumulative = 0
+            for bound, n in zip(h.buckets + ("+Inf",), counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{_labels(key + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(key)} {total:.9g}")
+            lines.append(f"{name}_count{_labels(key)} {count}")
+    for name, kind, doc, samples in extra:
+        lines += [f"# HELP {name} {doc}", f"# TYPE {name} {kind}"]
+        for labels, value in samples:
+            lines.append(f"{name}{_labels(sorted(labels.items()))} {value:.9g}")
+    return "\n".join(lines) + "\n"
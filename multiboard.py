@@ -0,0 +1,147 @@
+"""Joint solver for multi-board games (Quordle: 4 boards, Octordle: 8).
+
+Every guess is played on all unsolved boards at once, so it is ranked once
+against all of them rather than per board. Each board is a CandidateSet
+(its WordleState plus survivor indices); a board drops out as soon as it
+shows all green. score() puts the active boards' candidates side by side
+in one feedback-code table, offsets each board's codes into its own 243
+buckets, and takes every guess's bucket sizes from a single bincount - the
+entropy of the joint split is the sum of the per-board entropies, and the
+expected number of candidates left is the sum of the per-board ones.
+Boards with identical survivors (every board on turn one) are scored once
+and weighted by their count, so the first turn costs what a single board
+does.
+"""
+import numpy as np
+
+from patterns import ALL_GREEN, GUESS_WORDS, NUM_PATTERNS, pattern_code
+from ranking import ALPHA_RANK, OBJECTIVES, guess_indices, pattern_table
+from wordindex import ANSWERS, CandidateSet
+
+# Cap on the per-chunk code table + bucket counts, in cells.
+CHUNK_CELLS = 1 << 22
+
+
+class MultiBoard:
+    def __init__(self, boards=4, index=ANSWERS):
+        self.index = index
+        self.boards = [CandidateSet(index) for _ in range(boards)]
+        self.solved = [False] * boards
+        self.guesses = []
+
+    def __len__(self):
+        return len(self.boards)
+
+    def push(self, guess, marks):
+        """Play `guess`; marks[b] is board b's '+*-' row (ignored once solved)."""
+        if len(marks) != len(self.boards):
+            raise ValueError(f"need marks for {len(self.boards)} boards, got {len(marks)}")
+        self.guesses.append((guess, list(marks), list(self.solved)))
+        for b, m in enumerate(marks):
+            if self.solved[b]:
+                continue
+            if pattern_code(m) == ALL_GREEN:
+                self.solved[b] = True
+            self.boards[b].push(''.join(g + s for g, s in zip(guess, m)))
+
+    def undo(self):
+        if not self.guesses:
+            return
+        _, _, solved = self.guesses.pop()
+        for b, board in enumerate(self.boards):
+            if not solved[b]:
+                board.undo()
+        self.solved = solved
+
+    @property
+    def active(self):
+        """Indices of boards still in play."""
+        return [b for b, done in enumerate(self.solved) if not done]
+
+    @property
+    def done(self):
+        return all(self.solved)
+
+    def candidates(self):
+        """{board: survivor words} for the active boards."""
+        return {b: self.boards[b].words() for b in self.active}
+
+    def _groups(self):
+        """[(survivor words, number of boards sharing them)], empty boards dropped."""
+        groups = {}
+        for b in self.active:
+            surv = self.boards[b].survivors
+            if len(surv):
+                key = surv.tobytes()
+                if key in groups:
+                    groups[key][1] += 1
+                else:
+                    groups[key] = [self.boards[b].words(), 1]
+        return [tuple(g) for g in groups.values()]
+
+    def score(self, guesses=None):
+        """(entropy, expected_remaining) summed over active boards, aligned
+        with ranking.guess_indices(guesses)."""
+        gidx = guess_indices(guesses)
+        groups = self._groups()
+        if not groups:
+            return np.zeros(len(gidx)), np.zeros(len(gidx))
+        cands = [w for words, _ in groups for w in words]
+        sizes = np.array([len(words) for words, _ in groups])
+        weight = np.array([n for _, n in groups]) / sizes
+        group = np.repeat(np.arange(len(groups)), sizes)
+        offset = (group * NUM_PATTERNS).astype(np.intp)
+        col_weight = weight[group]
+        base = float(np.dot([n for _, n in groups], np.log2(sizes)))
+        buckets = len(groups) * NUM_PATTERNS
+        step = max(1, CHUNK_CELLS // (len(cands) + buckets))
+        ent = np.empty(len(gidx))
+        expected = np.empty(len(gidx))
+        for lo in range(0, len(gidx), step):
+            keys = pattern_table(gidx[lo:lo + step], cands).astype(np.intp) + offset
+            g = keys.shape[0]
+            flat = (keys + np.arange(g, dtype=np.intp)[:, None] * buckets).ravel()
+            counts = np.bincount(flat, minlength=g * buckets).reshape(g, buckets)
+            if len(cands) < buckets:
+                # Each candidate's own bucket size n, weighted 1/|board|: summing
+                # n and log2(n) over candidates gives sum(n^2) and sum(n log2 n).
+                own = np.take_along_axis(counts, keys, axis=1)
+                ent[lo:lo + g] = base - (np.log2(own) * col_weight).sum(axis=1)
+                expected[lo:lo + g] = (own * col_weight).sum(axis=1)
+            else:
+                rows, cols = np.nonzero(counts)
+                n = counts[rows, cols].astype(np.float64)
+                w = weight[cols // NUM_PATTERNS]
+                ent[lo:lo + g] = base - np.bincount(rows, weights=w * n * np.log2(n), minlength=g)
+                expected[lo:lo + g] = np.bincount(rows, weights=w * n * n, minlength=g)
+        return ent, expected
+
+    def rank(self, freq=None, guesses=None, objective="entropy"):
+        """All of `guesses` (default: every allowed guess), best first.
+
+        Ties go to the guess that is a candidate on the most boards (so can
+        finish one outright), then freq tier, then alphabetical.
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"unknown objective {objective!r}")
+        if self.done:
+            return []
+        if freq is None:
+            freq = {}
+        gidx = guess_indices(guesses)
+        ent, expected = self.score(guesses)
+        primary = -np.round(ent, 9) if objective == "entropy" else np.round(expected, 9)
+        words = [GUESS_WORDS[i] for i in gidx]
+        hits = {}
+        for cands in self.candidates().values():
+            for w in cands:
+                hits[w] = hits.get(w, 0) + 1
+        on_boards = np.array([-hits.get(w, 0) for w in words])
+        tier = np.array([freq.get(w, 30) for w in words])
+        order = np.lexsort((ALPHA_RANK[gidx], tier, on_boards, primary))
+        return [words[i] for i in order]
+
+    def next_guess(self, freq=None, guesses=None, objective="entropy"):
+        """Top of rank(), or None once every board is solved."""
+        ranked = self.rank(freq, guesses, objective)
+        return ranked[0] if ranked else None
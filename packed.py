@@ -0,0 +1,229 @@
+"""Packed-integer word core: 25-bit words, nibble letter counts, int feedback.
+
+A word is five 5-bit letter codes (a = 0 .. z = 25) in one int, position i
+in bits 5i..5i+4, so a word list fits an array('I') at 4 bytes a word. Next
+to each word PackedWords keeps its letter-presence mask (bit l set if letter
+l occurs) and its letter counts as 4-bit nibbles, letters a-p in one 64-bit
+word and q-z in another. A count is at most 5, so each nibble has a spare
+top bit, and "every count within [min, max]" is two subtract-and-mask tests
+per half (SWAR) rather than a loop over letters.
+
+feedback_code() scores packed words straight to the base-3 code patterns.py
+uses ('-' = 0, '*' = 1, '+' = 2, position 0 least significant). solver_ref's
+string API (feedback, is_valid_word, find_valid_words, the heuristic
+rankers) is a thin wrapper over this module. Once the word lists load,
+solver_ref packs them into one PackedWords (remember()), and the wrappers
+read a listed word's row from its arrays - about 24 bytes a word, plus the
+word -> row dict - instead of re-packing the string per call. Any other
+string is packed afresh each time, so words from requests add nothing.
+"""
+from array import array
+
+A = ord('a')
+LO_BITS = (1 << 64) - 1
+H_LO = 0x8888888888888888  # top bit of each of the 16 low nibbles (a-p)
+H_HI = 0x8888888888        # ... and of the 10 high ones (q-z)
+NIBBLE = tuple(4 * l for l in range(26))
+PATTERN_MARKS = tuple(''.join('-*+'[c // 3 ** i % 3] for i in range(5)) for c in range(243))
+
+_rows = {}  # word -> its row in _known, for the words remember() was given
+
+
+def pack(word):
+    """'crane' -> 25-bit int."""
+    o = [ord(ch) - A for ch in word]
+    return o[0] | o[1] << 5 | o[2] << 10 | o[3] << 15 | o[4] << 20
+
+
+def unpack(code):
+    return ''.join(chr(A + (code >> s & 31)) for s in (0, 5, 10, 15, 20))
+
+
+def counts_of(word):
+    """(lo, hi) nibble letter counts of a string."""
+    c = 0
+    for ch in word:
+        c += 1 << NIBBLE[ord(ch) - A]
+    return c & LO_BITS, c >> 64
+
+
+def word_info(word):
+    """(code, mask, lo, hi, letters) for a string: read from the remembered
+    word lists' arrays, else packed now. `letters` is the word's distinct
+    letter codes, for the rankers' per-letter tallies."""
+    i = _rows.get(word)
+    if i is None:
+        code, mask = pack(word), 0
+        for ch in word:
+            mask |= 1 << ord(ch) - A
+        lo, hi = counts_of(word)
+    else:
+        code, mask, lo, hi = _known.codes[i], _known.masks[i], _known.lo[i], _known.hi[i]
+    letters = tuple({code & 31, code >> 5 & 31, code >> 10 & 31, code >> 15 & 31, code >> 20})
+    return code, mask, lo, hi, letters
+
+
+def word_code(word):
+    """pack(word), read from the remembered arrays when it is listed."""
+    i = _rows.get(word)
+    return pack(word) if i is None else _known.codes[i]
+
+
+def remember(words):
+    """Pack `words` (the word lists) once, for word_info() and select()."""
+    global _known, _rows
+    _known = PackedWords(words)
+    _rows = {w: i for i, w in enumerate(words)}
+
+
+def compile_constraints(allowed, min_counts, max_counts):
+    """WordleState.compile() output -> the packed constraint tuple
+    (allowed0..4, need, forbid, min_lo, min_hi, max_lo, max_hi) the matchers
+    take. need / forbid are letter masks (some copy required / none allowed)
+    that reject most words before the count nibbles are touched."""
+    lo = hi = need = forbid = 0
+    for l in range(26):
+        lo |= min_counts[l] << NIBBLE[l]
+        hi |= max_counts[l] << NIBBLE[l]
+        if min_counts[l]:
+            need |= 1 << l
+        if not max_counts[l]:
+            forbid |= 1 << l
+    return tuple(allowed) + (need, forbid, lo & LO_BITS, lo >> 64, hi & LO_BITS, hi >> 64)
+
+
+def matches(code, mask, lo, hi, constraints):
+    a0, a1, a2, a3, a4, need, forbid, nlo, nhi, xlo, xhi = constraints
+    return bool(mask & need == need and not mask & forbid and a0 >> (code & 31) & 1 and a1 >> (code >> 5 & 31) & 1
+                and a2 >> (code >> 10 & 31) & 1 and a3 >> (code >> 15 & 31) & 1
+                and a4 >> (code >> 20 & 31) & 1
+                and (lo | H_LO) - nlo & H_LO == H_LO and (hi | H_HI) - nhi & H_HI == H_HI
+                and (xlo | H_LO) - lo & H_LO == H_LO and (xhi | H_HI) - hi & H_HI == H_HI)
+
+
+def select(words, constraints):
+    """Strings from `words` that satisfy `constraints`, in order."""
+    a0, a1, a2, a3, a4, need, forbid, nlo, nhi, xlo, xhi = constraints
+    row, codes, masks, los, his = _rows.get, _known.codes, _known.masks, _known.lo, _known.hi
+    out = []
+    for w in words:
+        i = row(w)
+        if i is None:
+            code, mask, lo, hi, _ = word_info(w)
+        else:
+            mask = masks[i]
+            if mask & need != need or mask & forbid:
+                continue
+            code, lo, hi = codes[i], los[i], his[i]
+        if (mask & need == need and not mask & forbid and a0 >> (code & 31) & 1 and a1 >> (code >> 5 & 31) & 1
+                and a2 >> (code >> 10 & 31) & 1 and a3 >> (code >> 15 & 31) & 1
+                and a4 >> (code >> 20 & 31) & 1
+                and (lo | H_LO) - nlo & H_LO == H_LO and (hi | H_HI) - nhi & H_HI == H_HI
+                and (xlo | H_LO) - lo & H_LO == H_LO and (xhi | H_HI) - hi & H_HI == H_HI):
+            out.append(w)
+    return out
+
+
+def feedback_code(answer, guess):
+    """Base-3 feedback code for packed `guess` against packed `answer`.
+
+    Greens fall out of answer ^ guess; the answer's non-green letters are
+    tallied as nibbles, and each non-green guess letter takes a yellow from
+    that tally left to right.
+    """
+    d = answer ^ guess
+    code = rem = 0
+    if d & 0x1f:
+        rem += 1 << NIBBLE[answer & 31]
+    else:
+        code = 2
+    if d & 0x3e0:
+        rem += 1 << NIBBLE[answer >> 5 & 31]
+    else:
+        code += 6
+    if d & 0x7c00:
+        rem += 1 << NIBBLE[answer >> 10 & 31]
+    else:
+        code += 18
+    if d & 0xf8000:
+        rem += 1 << NIBBLE[answer >> 15 & 31]
+    else:
+        code += 54
+    if d & 0x1f00000:
+        rem += 1 << NIBBLE[answer >> 20 & 31]
+    else:
+        code += 162
+    if rem:
+        if d & 0x1f:
+            s = NIBBLE[guess & 31]
+            if rem >> s & 15:
+                code += 1
+                rem -= 1 << s
+        if d & 0x3e0:
+            s = NIBBLE[guess >> 5 & 31]
+            if rem >> s & 15:
+                code += 3
+                rem -= 1 << s
+        if d & 0x7c00:
+            s = NIBBLE[guess >> 10 & 31]
+            if rem >> s & 15:
+                code += 9
+                rem -= 1 << s
+        if d & 0xf8000:
+            s = NIBBLE[guess >> 15 & 31]
+            if rem >> s & 15:
+                code += 27
+                rem -= 1 << s
+        if d & 0x1f00000 and rem >> NIBBLE[guess >> 20 & 31] & 15:
+            code += 81
+    return code
+
+
+class PackedWords:
+    """A word list as parallel arrays: codes and masks (array('I')), and the
+    low/high count nibbles (array('Q'))."""
+
+    def __init__(self, words):
+        self.codes = array('I')
+        self.masks = array('I')
+        self.lo = array('Q')
+        self.hi = array('Q')
+        for w in words:
+            code, mask, lo, hi, _ = word_info(w)
+            self.codes.append(code)
+            self.masks.append(mask)
+            self.lo.append(lo)
+            self.hi.append(hi)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def word(self, i):
+        return unpack(self.codes[i])
+
+    def words(self, rows=None):
+        return [unpack(self.codes[i]) for i in (range(len(self)) if rows is None else rows)]
+
+    @property
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.codes, self.masks, self.lo, self.hi))
+
+    def survivors(self, constraints, rows=None):
+        """Indices (within `rows`, default all) of words satisfying `constraints`."""
+        a0, a1, a2, a3, a4, need, forbid, nlo, nhi, xlo, xhi = constraints
+        codes, lo, hi = self.codes, self.lo, self.hi
+        masks = enumerate(self.masks) if rows is None else ((i, self.masks[i]) for i in rows)
+        return [i for i, m in masks if m & need == need and not m & forbid
+                and self._fits(codes[i], lo[i], hi[i], constraints)]
+
+    @staticmethod
+    def _fits(code, lo, hi, constraints):
+        a0, a1, a2, a3, a4, _, _, nlo, nhi, xlo, xhi = constraints
+        return (a0 >> (code & 31) & 1 and a1 >> (code >> 5 & 31) & 1
+                and a2 >> (code >> 10 & 31) & 1 and a3 >> (code >> 15 & 31) & 1
+                and a4 >> (code >> 20 & 31) & 1
+                and (lo | H_LO) - nlo & H_LO == H_LO and (hi | H_HI) - nhi & H_HI == H_HI
+                and (xlo | H_LO) - lo & H_LO == H_LO and (xhi | H_HI) - hi & H_HI == H_HI)
+
+
+_known = PackedWords(())
@@ -0,0 +1,138 @@
+"""Batch feedback over NumPy arrays, backed by a precomputed pattern matrix.
+
+A feedback pattern is stored as one base-3 digit per position ('-' = 0,
+'*' = 1, '+' = 2, position 0 least significant), so every pattern fits a
+uint8 in 0..242 and an all-green row is 242. The matrix holds the code of
+every GUESS_WORDS x ANSWER_WORDS pair; scripts/gen_patterns.py builds it into
+data/patterns.npy and it is memory-mapped on first use. Without the file
+(fresh checkout, mismatched word lists) the same codes are computed on the
+fly - slower, never different.
+"""
+import pathlib
+
+import numpy as np
+
+from solver_ref import ANSWER_WORDS, EXTENDED_WORDS
+
+ROOT = pathlib.Path(__file__).resolve().parent
+MATRIX_PATH = ROOT / "data" / "patterns.npy"
+
+GUESS_WORDS = ANSWER_WORDS + EXTENDED_WORDS
+NUM_PATTERNS = 3 ** 5
+ALL_GREEN = NUM_PATTERNS - 1
+MARK_DIGIT = {'-': 0, '*': 1, '+': 2}
+DIGIT_MARK = '-*+'
+POWERS = (3 ** np.arange(5)).astype(np.uint8)
+
+GUESS_INDEX = {w: i for i, w in enumerate(GUESS_WORDS)}
+ANSWER_INDEX = {w: i for i, w in enumerate(ANSWER_WORDS)}
+
+_matrix = None
+
+
+def letter_codes(words):
+    """(n, 5) uint8 array of 0-25 letter codes."""
+    buf = ''.join(words).encode('ascii')
+    return (np.frombuffer(buf, dtype=np.uint8) - ord('a')).reshape(-1, 5)
+
+
+def pattern_code(marks):
+    """'s-a*l*s-a-' or '-**--' -> base-3 code."""
+    if len(marks) == 10:
+        marks = marks[1::2]
+    return sum(MARK_DIGIT[m] * 3 ** i for i, m in enumerate(marks))
+
+
+def pattern_marks(code):
+    """Base-3 code -> '-**--'."""
+    code = int(code)
+    return ''.join(DIGIT_MARK[code // 3 ** i % 3] for i in range(5))
+
+
+def letter_count_table(codes):
+    """(26, n) uint8 count of each letter in each of n words."""
+    n = len(codes)
+    counts = np.zeros((26, n), dtype=np.uint8)
+    cols = np.arange(n)
+    for k in range(5):
+        counts[codes[:, k], cols] += 1
+    return counts
+
+
+def compute_patterns(guess_codes, answer_codes):
+    """(G, N) uint8 pattern codes for letter-code arrays of shape (G, 5) and (N, 5).
+
+    Mirrors solver_ref.feedback: a non-green guess letter is yellow while the
+    answer still has unmatched copies of it, consumed left to right. Position
+    i therefore loses to every earlier copy of its letter in the guess and to
+    every later copy that is green, which makes the check one comparison
+    against the answer's letter count instead of a per-pair scan.
+    """
+    n = len(answer_codes)
+    counts = letter_count_table(answer_codes)
+    green = [guess_codes[:, k, None] == answer_codes[None, :, k] for k in range(5)]
+    codes = np.zeros(green[0].shape, dtype=np.uint8)
+    for i in range(5):
+        letter = guess_codes[:, i]
+        used = (guess_codes[:, :i] == letter[:, None]).sum(axis=1, dtype=np.uint8)[:, None]
+        for k in range(i + 1, 5):
+            rows = np.flatnonzero(guess_codes[:, k] == letter)
+            if len(rows):
+                if used.shape[1] == 1:
+                    used = np.repeat(used, n, axis=1)
+                used[rows] += green[k][rows]
+        yellow = used < counts[letter]
+        yellow &= ~green[i]
+        codes += green[i] * np.uint8(2 * POWERS[i])
+        codes += yellow * POWERS[i]
+    return codes
+
+
+def build_matrix(chunk=512, out=None):
+    """Full GUESS_WORDS x ANSWER_WORDS matrix, filled chunk by chunk."""
+    guesses, answers = letter_codes(GUESS_WORDS), letter_codes(ANSWER_WORDS)
+    if out is None:
+        out = np.empty((len(guesses), len(answers)), dtype=np.uint8)
+    for start in range(0, len(guesses), chunk):
+        out[start:start + chunk] = compute_patterns(guesses[start:start + chunk], answers)
+    return out
+
+
+def load_matrix():
+    """The memory-mapped pattern matrix, or None if it hasn't been built."""
+    global _matrix
+    if _matrix is None:
+        try:
+            m = np.load(MATRIX_PATH, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        if m.shape != (len(GUESS_WORDS), len(ANSWER_WORDS)) or m.dtype != np.uint8:
+            return None
+        _matrix = m
+    return _matrix
+
+
+def feedback_many(guess, answers=None):
+    """Pattern codes of `guess` against each of `answers`, as a uint8 array.
+
+    `answers` is a list of words, an integer index array into ANSWER_WORDS,
+    or None for all of ANSWER_WORDS. Decode a code with pattern_marks().
+    """
+    m = load_matrix()
+    gi = GUESS_INDEX.get(guess)
+    if m is not None and gi is not None:
+        row = m[gi]
+        if answers is None:
+            return row
+        if isinstance(answers, np.ndarray):
+            return row[answers]
+        idx = [ANSWER_INDEX.get(w, -1) for w in answers]
+        if -1 not in idx:
+            return row[idx]
+    if answers is None:
+        answers = ANSWER_WORDS
+    elif isinstance(answers, np.ndarray):
+        answers = [ANSWER_WORDS[i] for i in answers]
+    if not len(answers):
+        return np.zeros(0, dtype=np.uint8)
+    return compute_patterns(letter_codes([guess]), letter_codes(answers))[0]
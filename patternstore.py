@@ -0,0 +1,192 @@
+"""On-demand feedback rows for any allowed guess, in a fixed memory budget.
+
+patterns.py's matrix only covers guesses x ANSWER_WORDS; a full GUESS_WORDS x
+GUESS_WORDS table for the combined list would be ~170 MB per process. A
+PatternStore instead keeps *rows*: one guess's codes against every word of
+GUESS_WORDS (answers first, so an answers-pool column is the same index).
+Rows are computed in batches as guesses are scored against large
+candidate sets, a few per call so no single request pays for filling the
+cache, and kept in a byte-budgeted LRU; a table for any candidate subset
+is then one gather. Against a small candidate set the codes are computed
+directly instead - cheaper than a full row. Once the
+LRU is full a new row only displaces the least recently used one if its
+guess has been asked for more often, so sweeps over every guess (each
+ranking scores them all) leave the cache alone instead of cycling it.
+
+The hottest rows (the best openers for each pool) can also be written to
+data/hot-rows.npy by scripts/gen_hot_rows.py. It is memory-mapped, so every
+gunicorn worker shares one copy through the page cache, and its rows never
+count against the budget. Each of its rows is the guess's 5 ASCII letters
+followed by the codes. Results never depend on what is cached.
+"""
+import os
+import pathlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from patterns import ANSWER_WORDS, GUESS_INDEX, GUESS_WORDS, compute_patterns, letter_codes
+
+ROOT = pathlib.Path(__file__).resolve().parent
+HOT_PATH = ROOT / "data" / "hot-rows.npy"
+# WOSOLVE_PATTERN_CACHE_MB caps the LRU's rows (0 disables it).
+BUDGET = int(float(os.environ.get("WOSOLVE_PATTERN_CACHE_MB", "32")) * 2 ** 20)
+WORD_BYTES = 5
+# Rows are only worth materializing for candidate sets of at least
+# 1/ROW_FRACTION of the list, and one call materializes at most
+# 1/ADMIT_SHARE of its own direct cost in extra row cells (but at least one
+# row), so filling the cache never makes a request much slower than
+# computing its table.
+ROW_FRACTION = 8
+ADMIT_SHARE = 4
+BATCH = 256
+HOT_TOP = 256
+
+GUESS_CODES = letter_codes(GUESS_WORDS)
+ROW_BYTES = len(GUESS_WORDS)
+
+
+def compute_rows(gidx):
+    """(len(gidx), len(GUESS_WORDS)) codes, BATCH guesses at a time."""
+    out = np.empty((len(gidx), ROW_BYTES), dtype=np.uint8)
+    for lo in range(0, len(gidx), BATCH):
+        out[lo:lo + BATCH] = compute_patterns(GUESS_CODES[gidx[lo:lo + BATCH]], GUESS_CODES)
+    return out
+
+
+def best_openers(top=HOT_TOP):
+    """The `top` best entropy openers for the answers list, then those for
+    the combined list not already picked."""
+    from ranking import rank_by_information  # ranking imports this module
+    words = {}
+    for pool in (ANSWER_WORDS, GUESS_WORDS):
+        words.update(dict.fromkeys(rank_by_information(pool, None, None, "entropy")[:top]))
+    return list(words)
+
+
+def build_hot(words, path=HOT_PATH):
+    """Write the rows of `words` (allowed guesses) to `path`, atomically."""
+    gidx = np.array([GUESS_INDEX[w] for w in words], dtype=np.intp)
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp.npy")
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.uint8,
+                                    shape=(len(gidx), WORD_BYTES + ROW_BYTES))
+    out[:, :WORD_BYTES] = letter_codes(words) + ord("a")
+    for lo in range(0, len(gidx), BATCH):
+        out[lo:lo + BATCH, WORD_BYTES:] = compute_rows(gidx[lo:lo + BATCH])
+    out.flush()
+    del out
+    tmp.replace(path)
+
+
+class PatternStore:
+    def __init__(self, budget=BUDGET, hot_path=HOT_PATH):
+        self.capacity = budget // ROW_BYTES
+        self.hot_path = hot_path
+        self.hits = self.misses = 0
+        self._hot = None
+        self._hot_slot = None
+        self._slab = None  # (capacity, ROW_BYTES), allocated on first insert
+        self._slot = np.full(len(GUESS_WORDS), -1, dtype=np.int32)
+        self._seen = np.zeros(len(GUESS_WORDS), dtype=np.int64)  # requests per guess
+        self._lru = OrderedDict()  # guess index -> slab slot, oldest first
+        self._lock = threading.Lock()
+
+    def load_hot(self):
+        """Map the hot-row file; returns how many rows it holds (0 if none)."""
+        if self._hot_slot is None:
+            slots = np.full(len(GUESS_WORDS), -1, dtype=np.int32)
+            try:
+                hot = np.load(self.hot_path, mmap_mode="r")
+            except (OSError, ValueError):
+                hot = None
+            if hot is not None and hot.dtype == np.uint8 and hot.ndim == 2 \
+                    and hot.shape[1] == WORD_BYTES + ROW_BYTES:
+                words = hot[:, :WORD_BYTES].tobytes().decode("ascii", "replace")
+                gidx = [GUESS_INDEX.get(words[i:i + WORD_BYTES], -1)
+                        for i in range(0, len(words), WORD_BYTES)]
+                if -1 not in gidx:
+                    slots[gidx] = np.arange(len(gidx))
+                    self._hot = hot
+            self._hot_slot = slots
+        return 0 if self._hot is None else len(self._hot)
+
+    def table(self, gidx, cidx):
+        """(len(gidx), len(cidx)) codes of guesses GUESS_WORDS[gidx] against
+        the words GUESS_WORDS[cidx]."""
+        self.load_hot()
+        gidx = np.asarray(gidx, dtype=np.intp)
+        cidx = np.asarray(cidx, dtype=np.intp)
+        out = np.empty((len(gidx), len(cidx)), dtype=np.uint8)
+        hot = self._hot_slot[gidx]
+        on_hot = np.flatnonzero(hot >= 0)
+        if len(on_hot):
+            out[on_hot] = self._hot[np.ix_(hot[on_hot], cidx + WORD_BYTES)]
+        rest = np.flatnonzero(hot < 0)
+        with self._lock:
+            slots = self._slot[gidx[rest]]
+            cached = rest[slots >= 0]
+            if len(cached):
+                out[cached] = self._slab[np.ix_(slots[slots >= 0], cidx)]
+                for g in gidx[cached].tolist():
+                    self._lru.move_to_end(g)
+            self.hits += len(on_hot) + len(cached)
+            self.misses += len(rest) - len(cached)
+            self._seen[gidx] += 1
+            missing = rest[slots < 0]
+            admit = np.zeros(len(missing), dtype=bool)
+            if len(missing) and len(cidx) * ROW_FRACTION >= ROW_BYTES:
+                limit = -(-len(missing) * len(cidx) // (ADMIT_SHARE * ROW_BYTES))
+                admit = self._admit(gidx[missing], limit)
+        if admit.any():
+            rows = compute_rows(gidx[missing[admit]])
+            out[missing[admit]] = rows[:, cidx]
+            self._insert(gidx[missing[admit]], rows)
+        direct = missing[~admit]
+        if len(direct):
+            out[direct] = compute_patterns(GUESS_CODES[gidx[direct]], GUESS_CODES[cidx])
+        return out
+
+    def _admit(self, gidx, limit):
+        """Which of these uncached guesses get a row (at most `limit`): any
+        while there are free slots, then only those asked for more often
+        than the row each would evict. Caller holds the lock."""
+        admit = np.zeros(len(gidx), dtype=bool)
+        free = self.capacity - len(self._lru)
+        victims = iter(self._lru)
+        for i in np.argsort(-self._seen[gidx], kind="stable")[:limit]:
+            if free > 0:
+                free -= 1
+            else:
+                victim = next(victims, None)
+                if victim is None or self._seen[gidx[i]] <= self._seen[victim]:
+                    break
+            admit[i] = True
+        return admit
+
+    def _insert(self, gidx, rows):
+        with self._lock:
+            if self._slab is None:
+                self._slab = np.empty((self.capacity, ROW_BYTES), dtype=np.uint8)
+            for g, row in zip(gidx.tolist(), rows):
+                if g in self._lru:
+                    continue
+                if len(self._lru) < self.capacity:
+                    slot = len(self._lru)
+                else:
+                    old, slot = self._lru.popitem(last=False)
+                    self._slot[old] = -1
+                self._slab[slot] = row
+                self._slot[g] = slot
+                self._lru[g] = slot
+
+    def info(self):
+        hot = self.load_hot()
+        return {"hits": self.hits, "misses": self.misses, "rows": len(self._lru),
+                "bytes": len(self._lru) * ROW_BYTES, "budget": self.capacity * ROW_BYTES,
+                "hot_rows": hot, "hot_bytes": hot * ROW_BYTES}
+
+
+PATTERNS = PatternStore()
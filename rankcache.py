@@ -0,0 +1,63 @@
+"""Bounded LRU memo around rank_suggestions, keyed by candidate-set fingerprint.
+
+The same candidate set keeps coming back: every re-render of an unchanged
+board, undo/redo, replaying a finished game step by step, and different
+constraint sets that happen to leave the same survivors. A RankCache is
+bound to one (answer_set, freq) pair and keys each ranking on a digest of
+the candidates (or of survivor indices, for WordIndex callers) plus the
+mode and guess list, so a repeat costs one hash instead of a full
+letter-count-and-sort. The full ranking is stored; `top` slices it.
+static/js/solver.js makeRankCache() is the browser's twin.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from solver_ref import rank_suggestions
+
+
+def fingerprint(candidates):
+    """16-byte digest of a candidate list (in order) or of a survivor index array."""
+    if hasattr(candidates, "tobytes"):
+        data = candidates.tobytes()
+    else:
+        data = "\n".join(candidates).encode()
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class RankCache:
+    def __init__(self, answer_set, freq=None, maxsize=256):
+        self.answer_set = answer_set
+        self.freq = freq
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def rank(self, candidates, mode="heuristic", guesses=None, top=None, key=None):
+        """rank_suggestions(candidates, ...)[:top], memoized. `key` overrides
+        the fingerprint (e.g. one already computed from survivor indices)."""
+        k = (key if key is not None else fingerprint(candidates), mode,
+             None if guesses is None else fingerprint(guesses))
+        with self._lock:
+            ranked = self._entries.get(k)
+            if ranked is not None:
+                self.hits += 1
+                self._entries.move_to_end(k)
+        if ranked is None:
+            ranked = tuple(rank_suggestions(candidates, self.answer_set, self.freq, mode, guesses))
+            with self._lock:
+                self.misses += 1
+                self._entries[k] = ranked
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return list(ranked if top is None else ranked[:top])
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries),
+                "maxsize": self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
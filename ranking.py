@@ -0,0 +1,151 @@
+"""Information-theoretic guess ranking over batched feedback codes.
+
+Every allowed guess is scored against the current candidates at once: its
+feedback codes (patterns.py) split the candidates into at most 243 buckets,
+counted for all guesses in one bincount. From the bucket sizes come the
+entropy of the split (bits of information the guess is expected to reveal)
+and the expected number of candidates left after it. Reached through
+solver_ref.rank_suggestions(..., mode="entropy" | "expected").
+
+mode="minimax" ranks by the worst case instead: the largest bucket, i.e.
+how many candidates survive the least helpful feedback (a max over the same
+bincount), for hard-mode and adversarial play - see adversary.py.
+
+Every mode is computed in chunks of guesses so the code table stays bounded
+for the combined list. Codes come from the pattern matrix when the
+candidates are all answers, else from patternstore's cached rows.
+"""
+import numpy as np
+
+from patterns import (GUESS_INDEX, GUESS_WORDS, NUM_PATTERNS, compute_patterns,
+                      letter_codes, load_matrix)
+from patternstore import GUESS_CODES, PATTERNS
+
+ALPHA_RANK = np.argsort(np.argsort(np.array(GUESS_WORDS)))
+
+OBJECTIVES = ("entropy", "expected")
+MINIMAX = "minimax"
+# Cap on the per-chunk code table + bucket counts, in cells.
+CHUNK_CELLS = 1 << 22
+
+
+def guess_indices(guesses=None):
+    """Indices into GUESS_WORDS; None means every allowed guess."""
+    if guesses is None:
+        return np.arange(len(GUESS_WORDS))
+    return np.array([GUESS_INDEX[w] for w in guesses], dtype=np.intp)
+
+
+def pattern_table(gidx, candidates):
+    """(len(gidx), len(candidates)) feedback codes of each guess vs each candidate."""
+    cidx = np.array([GUESS_INDEX.get(w, -1) for w in candidates], dtype=np.intp)
+    if len(cidx) and cidx.min() < 0:  # not an allowed word: nothing to look up
+        return compute_patterns(GUESS_CODES[gidx], letter_codes(candidates))
+    m = load_matrix()
+    # GUESS_WORDS starts with the answers, so an answer's index is its column.
+    if m is not None and (not len(cidx) or cidx.max() < m.shape[1]):
+        return m[gidx][:, cidx] if len(gidx) < len(GUESS_WORDS) else m[:, cidx]
+    return PATTERNS.table(gidx, cidx)
+
+
+def partition_counts(codes):
+    """(G, 243) bucket sizes for a (G, C) code table, one bincount for all rows."""
+    g = codes.shape[0]
+    offsets = np.arange(g, dtype=np.intp)[:, None] * NUM_PATTERNS
+    flat = (codes + offsets).ravel()
+    return np.bincount(flat, minlength=g * NUM_PATTERNS).reshape(g, NUM_PATTERNS)
+
+
+def bucket_stats(codes):
+    """(entropy in bits, sum of squared bucket sizes) per row of a (G, C) code table.
+
+    Uses sum(n^2) = sum over candidates of its own bucket's size, and the
+    matching identity for n*log2(n), so the work is G x min(C, 243) rather
+    than a float pass over the whole G x 243 count table.
+    """
+    g, c = codes.shape
+    if not c:
+        return np.zeros(g), np.zeros(g)
+    counts = partition_counts(codes)
+    if c < NUM_PATTERNS:
+        sizes = np.take_along_axis(counts, codes.astype(np.intp), axis=1)
+        sumsq = sizes.sum(axis=1).astype(np.float64)
+        nlogn = np.log2(sizes).sum(axis=1)
+    else:
+        rows, cols = np.nonzero(counts)
+        n = counts[rows, cols].astype(np.float64)
+        nlogn = np.bincount(rows, weights=n * np.log2(n), minlength=g)
+        sumsq = np.bincount(rows, weights=n * n, minlength=g)
+    return np.log2(c) - nlogn / c, sumsq
+
+
+def worst_case_stats(codes):
+    """(largest bucket, sum of squared bucket sizes) per row of a (G, C) code table."""
+    g, c = codes.shape
+    if not c:
+        return np.zeros(g, dtype=np.int64), np.zeros(g)
+    counts = partition_counts(codes)
+    if c < NUM_PATTERNS:
+        sizes = np.take_along_axis(counts, codes.astype(np.intp), axis=1)
+        return sizes.max(axis=1), sizes.sum(axis=1).astype(np.float64)
+    return counts.max(axis=1), np.einsum("ij,ij->i", counts, counts).astype(np.float64)
+
+
+def score_worst_case(candidates, guesses=None):
+    """(worst_case_remaining, expected_remaining) arrays aligned with
+    guess_indices(guesses), computed CHUNK_CELLS at a time."""
+    gidx = guess_indices(guesses)
+    worst = np.empty(len(gidx), dtype=np.int64)
+    sumsq = np.empty(len(gidx))
+    step = max(1, CHUNK_CELLS // (len(candidates) + NUM_PATTERNS))
+    for lo in range(0, len(gidx), step):
+        worst[lo:lo + step], sumsq[lo:lo + step] = worst_case_stats(
+            pattern_table(gidx[lo:lo + step], candidates))
+    return worst, sumsq / max(len(candidates), 1)
+
+
+def information_stats(candidates, gidx):
+    """bucket_stats of guesses gidx against `candidates`, CHUNK_CELLS at a time."""
+    ent = np.empty(len(gidx))
+    sumsq = np.empty(len(gidx))
+    step = max(1, CHUNK_CELLS // (len(candidates) + NUM_PATTERNS))
+    for lo in range(0, len(gidx), step):
+        ent[lo:lo + step], sumsq[lo:lo + step] = bucket_stats(
+            pattern_table(gidx[lo:lo + step], candidates))
+    return ent, sumsq
+
+
+def score_guesses(candidates, guesses=None):
+    """(entropy, expected_remaining) arrays aligned with guess_indices(guesses)."""
+    ent, sumsq = information_stats(candidates, guess_indices(guesses))
+    return ent, sumsq / max(len(candidates), 1)
+
+
+def rank_by_information(candidates, freq=None, guesses=None, objective="entropy"):
+    """All of `guesses` (default: every allowed guess), best first.
+
+    Ties keep the heuristic ranker's order: a guess that is itself a
+    candidate (and so can win outright) first, then freq tier, then
+    alphabetical. With objective="minimax" the worst case comes first and
+    expected remaining breaks its ties.
+    """
+    if objective not in OBJECTIVES and objective != MINIMAX:
+        raise ValueError(f"unknown objective {objective!r}")
+    if not candidates:
+        return []
+    if freq is None:
+        freq = {}
+    gidx = guess_indices(guesses)
+    if objective == MINIMAX:
+        worst, expected = score_worst_case(candidates, guesses)
+        keys = (np.round(expected, 9), worst)
+    else:
+        ent, sumsq = information_stats(candidates, gidx)
+        # Rounded so equal partitions summed in a different bucket order tie.
+        keys = (-np.round(ent, 9) if objective == "entropy" else sumsq,)
+    cand = set(candidates)
+    words = [GUESS_WORDS[i] for i in gidx]
+    not_cand = np.array([w not in cand for w in words])
+    tier = np.array([freq.get(w, 30) for w in words])
+    order = np.lexsort((ALPHA_RANK[gidx], tier, not_cand) + keys)
+    return [words[i] for i in order]
@@ -0,0 +1,36 @@
+"""Generate static/data/bundle.bin: answers, extended, freq tiers and past
+answers in one compact file (format in bundle.py).
+
+Built from the committed JSON files, so rerun it after any of
+gen_wordlists.py, gen_wordfreq.py or gen_past_answers.py (the test suite
+checks it is fresh). Past answers are stored as day offsets from EPOCH,
+Wordle #0, as defined in gen_past_answers.py.
+"""
+import json
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+from bundle import decode, encode
+from gen_past_answers import EPOCH
+
+DATA = ROOT / "static" / "data"
+OUT_PATH = DATA / "bundle.bin"
+
+
+def main():
+    sources = {name: json.loads((DATA / f"{name}.json").read_text())
+               for name in ("answers", "extended", "freq", "past-answers")}
+    data = encode(sources["answers"], sources["extended"], sources["freq"],
+                  sources["past-answers"], EPOCH)
+    back = decode(data)
+    assert [back["answers"], back["extended"], back["freq"], back["pastAnswers"]] == list(sources.values())
+    OUT_PATH.write_bytes(data)
+    json_size = sum(len(json.dumps(v, separators=(",", ":"))) for v in sources.values())
+    print(f"{OUT_PATH.relative_to(ROOT)}: {len(data)} bytes (JSON files: ~{json_size})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Generate static/data/decision-tree.json: the full answers-only solve tree
+for the fixed opener (see decision_tree.py for the format).
+
+The opener is suggest_word(ANSWER_WORDS). At every node the candidates left
+are narrowed with a CandidateSet and the next guess is rank_suggestions(...)[0]
+with the committed freq.json tiers - the same pick the live solver makes - so
+rerun this after changing the ranking, the word lists or freq.json (the test
+suite checks it is fresh).
+
+Output shape:
+  {"meta": {"opener": "alert", "list": "answers", "nodes": N,
+            "avg_guesses": 3.6, "max_guesses": 6},
+   "tree": [guess, {"-*---": child, ...}]}   # leaf = guess index only
+"""
+import json
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from solver_ref import ANSWER_WORDS, feedback, suggest_word
+from decision_tree import TREE_PATH
+from wordindex import ANSWERS, CandidateSet
+
+MAX_DEPTH = 12
+INDEX = {w: i for i, w in enumerate(ANSWER_WORDS)}
+
+
+def build(cands, guess, freq, answer_set, depth, stats):
+    stats["nodes"] += 1
+    if depth > MAX_DEPTH:
+        raise RuntimeError(f"tree deeper than {MAX_DEPTH} - ranking not narrowing?")
+    words = cands.words()
+    if len(words) == 1:
+        stats["depths"].append(depth)
+        return INDEX[guess]
+    children = {}
+    for marks in sorted({feedback(a, guess)[1::2] for a in words}):
+        if marks == "+++++":
+            stats["depths"].append(depth)
+            continue
+        cands.push("".join(l + m for l, m in zip(guess, marks)))
+        nxt = cands.rank(answer_set, freq)[0]
+        children[marks] = build(cands, nxt, freq, answer_set, depth + 1, stats)
+        cands.undo()
+    return [INDEX[guess], children]
+
+
+def main():
+    freq = json.loads((ROOT / "static/data/freq.json").read_text())
+    opener = suggest_word(ANSWER_WORDS)
+    stats = {"nodes": 0, "depths": []}
+    tree = build(CandidateSet(ANSWERS), opener, freq, set(ANSWER_WORDS), 1, stats)
+    depths = stats["depths"]
+    assert len(depths) == len(ANSWER_WORDS), "tree does not cover every answer"
+    out = {"meta": {"opener": opener, "list": "answers", "nodes": stats["nodes"],
+                    "avg_guesses": round(sum(depths) / len(depths), 4),
+                    "max_guesses": max(depths)},
+           "tree": tree}
+    TREE_PATH.write_text(json.dumps(out, separators=(",", ":")))
+    print(f"wrote {TREE_PATH.relative_to(ROOT)}: {stats['nodes']} nodes, opener {opener}, "
+          f"avg {out['meta']['avg_guesses']} guesses, max {out['meta']['max_guesses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Generate data/hot-rows.npy: full feedback rows, against every allowed
+guess, for the best openers of the answers list and of the combined list.
+patternstore.py memory-maps it, so the rows every opening ranking asks for
+are shared by all workers and never count against the row cache's budget.
+
+    python scripts/gen_hot_rows.py              # top 256 openers per list
+    python scripts/gen_hot_rows.py --top 64
+
+Each row is ~13 KB, so the default file is ~6 MB. Like data/patterns.npy it
+is derived from words/*.txt and not committed; it is written to a
+temporary file and renamed into place, and workers without it just compute
+those rows on demand.
+"""
+import argparse
+import pathlib
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from patternstore import HOT_PATH, HOT_TOP, best_openers, build_hot
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--top", type=int, default=HOT_TOP, help="openers per word list")
+    p.add_argument("--out", type=pathlib.Path, default=HOT_PATH)
+    args = p.parse_args()
+
+    t0 = time.perf_counter()
+    words = best_openers(args.top)
+    build_hot(words, args.out)
+    size = args.out.stat().st_size / 1e6
+    print(f"wrote {args.out}: {len(words)} rows ({size:.1f} MB), best {', '.join(words[:5])} "
+          f"in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
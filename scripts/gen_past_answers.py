@@ -2,12 +2,26 @@
 history, keyed by ISO date, going back to the first NYT Wordle (2021-06-19,
 "cigar").
 
+    python scripts/gen_past_answers.py                  # incremental: only days after meta.through
+    python scripts/gen_past_answers.py --full           # rebuild the whole history
+    python scripts/gen_past_answers.py --html page.html # parse a saved page instead of fetching
+
 Tries a short list of public sources, in order, until one parses into a
 validated dataset. A source is skipped (not fatal) if it does not expose
 per-date data at all (e.g. a plain alphabetical archive) or if what it
 produces fails validation. If every source fails, exits nonzero with an
 explanation and writes nothing - never leaves a partial/stale file behind.
 
+Pages are parsed as they stream in, by an html.parser event handler that
+sees one table row at a time. The archives list the newest day first, so
+an incremental run stops reading at the first row whose date is already
+in past-answers.json: that row must be meta.through itself (a page listed
+oldest first stops at an old day instead, and is rejected) and agree with
+the stored answer, the new rows must continue the history day by day from
+meta.through, and only they are validated and merged. --html runs the same parse over saved pages (the
+test fixtures), offline; a saved page is old by nature, so the staleness
+check is skipped for it.
+
 Output shape:
   {"meta": {"through": "YYYY-MM-DD", "source": "<url that supplied the data>"},
    "byDate": {"YYYY-MM-DD": "cigar", ...}}
@@ -18,6 +32,8 @@ answers.json/extended.json (the NYT has swapped words over time); that's
 fine and expected - we do not filter against our own lists, we just report
 how many fall outside them.
 """
+import argparse
+import codecs
 import json
 import pathlib
 import re
@@ -25,6 +41,7 @@ import sys
 import urllib.error
 import urllib.request
 from datetime import date, timedelta
+from html.parser import HTMLParser
 
 ROOT = pathlib.Path(__file__).resolve().parent.parent
 OUT_PATH = ROOT / "static/data/past-answers.json"
@@ -33,6 +50,8 @@ EPOCH = date(2021, 6, 19)  # Wordle #0
 WORD_RE = re.compile(r"^[a-z]{5}$")
 MIN_ENTRIES = 1500
 MAX_STALENESS_DAYS = 45
+MAX_MISMATCH_SHARE = 0.05
+CHUNK_SIZE = 1 << 16
 
 SOURCES = [
     "https://www.rockpapershotgun.com/wordle-past-answers",
@@ -40,7 +59,6 @@ SOURCES = [
     "https://www.fiveforks.com/wordle/",
 ]
 
-TAG_RE = re.compile(r"<[^>]+>")
 MONTHS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
           "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
 
@@ -50,78 +68,169 @@ def fail(msg):
     sys.exit(1)
 
 
-def fetch(url):
+class StopParsing(Exception):
+    pass
+
+
+class RowParser(HTMLParser):
+    """Calls on_row(cells) for each <tr> without header cells, where each
+    cell is its text with every tag boundary inside it turned into "\\n".
+    on_row may raise StopParsing to end the parse early."""
+
+    def __init__(self, on_row):
+        super().__init__(convert_charrefs=True)
+        self.on_row = on_row
+        self.cells = self.cell = None
+        self.header = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self.cells, self.cell, self.header = [], None, False
+        elif self.cells is None:
+            return
+        elif tag in ("td", "th"):
+            self.header |= tag == "th"
+            self.cell = []
+        elif self.cell is not None:
+            self.cell.append("\n")
+
+    def handle_endtag(self, tag):
+        if self.cells is None:
+            return
+        if tag in ("td", "th") and self.cell is not None:
+            self.cells.append("".join(self.cell))
+            self.cell = None
+        elif tag == "tr":
+            cells, self.cells = self.cells, None
+            if not self.header:
+                self.on_row(cells)
+        elif self.cell is not None:
+            self.cell.append("\n")
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+
+def parse_row(cells):
+    """Rows laid out as <td>date</td><td>Wordle number</td><td>answer</td>
+    (one such table is wordfinder.yourdictionary.com's archive, paginated
+    across many <table> blocks on one page). The Wordle number gives the
+    exact calendar date (EPOCH + number days); the page's own month/day text
+    is cross-checked against it. Returns (iso date, word), "mismatch" when
+    the two dates disagree, or None for a row of some other shape."""
+    if len(cells) != 3:
+        return None
+    date_lines = [l.strip() for l in cells[0].split("\n")
+                  if l.strip() and l.strip().lower() not in ("today", "yesterday")]
+    if not date_lines:
+        return None
+    m = re.match(r"([A-Za-z]{3})\.?\s*0*(\d{1,2})", date_lines[-1])
+    if not m or m.group(1).lower() not in MONTHS:
+        return None
+    num_txt = cells[1].strip()
+    if not num_txt.isdigit():
+        return None
+    word = None
+    for tok in reversed([t.strip() for t in cells[2].split("\n") if t.strip()]):
+        if re.fullmatch(r"[A-Za-z]+", tok):
+            word = tok.lower()
+            break
+    if not word:
+        return None
+    d = EPOCH + timedelta(days=int(num_txt))
+    if MONTHS[m.group(1).lower()] != d.month or int(m.group(2)) != d.day:
+        return "mismatch"
+    return d.isoformat(), word
+
+
+class TableScan:
+    """Collects {date: word} from parsed rows. With `known` (the stored
+    history), stops at the first row already in it, after checking the
+    stored word agrees; `overlap` then holds that date."""
+
+    def __init__(self, known=None):
+        self.known = known or {}
+        self.by_date = {}
+        self.mismatches = 0
+        self.overlap = None
+        self.conflict = None
+
+    def __call__(self, cells):
+        row = parse_row(cells)
+        if row == "mismatch":
+            self.mismatches += 1
+        elif row is not None:
+            d, word = row
+            if d in self.known:
+                self.overlap = d
+                if self.known[d] != word:
+                    self.conflict = f"{d} is {word!r} on the page but {self.known[d]!r} on file"
+                raise StopParsing
+            self.by_date[d] = word
+
+    def result(self):
+        # If many rows mismatched the epoch math, this page probably isn't
+        # actually using the same Wordle-number epoch - don't trust it.
+        if self.by_date and self.mismatches > len(self.by_date) * MAX_MISMATCH_SHARE:
+            return {}
+        return self.by_date
+
+
+def scan(chunks, known=None):
+    """Feed text chunks through RowParser into a TableScan, stopping early
+    once it reaches `known` dates; returns the scan."""
+    table = TableScan(known)
+    parser = RowParser(table)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+    except StopParsing:
+        pass
+    return table
+
+
+def parse_date_number_word_table(html):
+    """{date: word} from a whole page; {} if it doesn't look like this shape
+    at all (so the caller treats it as "no dated data here")."""
+    return scan([html]).result()
+
+
+def stream(url):
+    """The page's text, decoded chunk by chunk as it downloads; closing the
+    generator (an early stop) drops the connection."""
     req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
     with urllib.request.urlopen(req, timeout=30) as resp:
         if resp.status != 200:
             raise RuntimeError(f"unexpected HTTP status {resp.status}")
-        return resp.read().decode("utf-8", errors="replace")
-
-
-def parse_date_number_word_table(html):
-    """Parses tables laid out as <tr><td>date</td><td>Wordle number</td>
-    <td>answer</td></tr> (one such table is wordfinder.yourdictionary.com's
-    archive, paginated across many <table> blocks on one page). The Wordle
-    number is used to derive the exact calendar date (EPOCH + number days);
-    the page's own month/day text is cross-checked against it as a sanity
-    check and any mismatching row is dropped rather than trusted blindly.
-
-    Returns {} if the page doesn't look like this shape at all (so the
-    caller treats it as "no dated data here" and moves to the next source).
-    """
-    rows = re.findall(r"<tr[^>]*>.*?</tr>", html, re.S)
-    by_date = {}
-    mismatches = 0
-    for row in rows:
-        if "<th" in row:
-            continue
-        tds = re.findall(r"<td.*?</td>", row, re.S)
-        if len(tds) != 3:
-            continue
-        date_txt = TAG_RE.sub("\n", tds[0])
-        date_lines = [l.strip() for l in date_txt.split("\n")
-                      if l.strip() and l.strip().lower() not in ("today", "yesterday")]
-        if not date_lines:
-            continue
-        m = re.match(r"([A-Za-z]{3})\.?\s*0*(\d{1,2})", date_lines[-1])
-        if not m or m.group(1).lower() not in MONTHS:
-            continue
-        num_txt = TAG_RE.sub("", tds[1]).strip()
-        if not num_txt.isdigit():
-            continue
-        num = int(num_txt)
-        word_txt = TAG_RE.sub("\n", tds[2])
-        word = None
-        for tok in reversed([t.strip() for t in word_txt.split("\n") if t.strip()]):
-            if re.fullmatch(r"[A-Za-z]+", tok):
-                word = tok.lower()
-                break
-        if not word:
-            continue
-        d = EPOCH + timedelta(days=num)
-        if MONTHS[m.group(1).lower()] != d.month or int(m.group(2)) != d.day:
-            mismatches += 1
-            continue
-        by_date[d.isoformat()] = word
-    # If most rows mismatched the epoch math, this page probably isn't
-    # actually using the same Wordle-number epoch - don't trust it.
-    if by_date and mismatches > len(by_date) * 0.05:
-        return {}
-    return by_date
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while block := resp.read(CHUNK_SIZE):
+            yield decoder.decode(block)
+        yield decoder.decode(b"", final=True)
 
 
-PARSERS = {
-    "https://www.rockpapershotgun.com/wordle-past-answers": parse_date_number_word_table,
-    "https://wordfinder.yourdictionary.com/wordle/answers/": parse_date_number_word_table,
-    "https://www.fiveforks.com/wordle/": parse_date_number_word_table,
-}
+def read_file(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        while block := f.read(CHUNK_SIZE):
+            yield block
 
 
-def validate(by_date):
+def validate(by_date, check_staleness=True):
     reasons = []
     if len(by_date) < MIN_ENTRIES:
         reasons.append(f"only {len(by_date)} entries (need >= {MIN_ENTRIES})")
         return reasons  # further checks aren't meaningful on a tiny/empty set
+    reasons += validate_rows(by_date)
+    if by_date.get("2021-06-19") != "cigar":
+        reasons.append(f"2021-06-19 entry is {by_date.get('2021-06-19')!r}, expected 'cigar'")
+    if check_staleness:
+        reasons += staleness(by_date)
+    return reasons
+
+
+def validate_rows(by_date):
+    reasons = []
     bad_words = sorted({w for w in by_date.values() if not WORD_RE.match(w or "")})
     if bad_words:
         reasons.append(f"{len(bad_words)} entries aren't 5-letter a-z words, e.g. {bad_words[:5]}")
@@ -133,19 +242,56 @@ def validate(by_date):
             bad_dates.append(d)
     if bad_dates:
         reasons.append(f"{len(bad_dates)} unparseable dates, e.g. {bad_dates[:5]}")
-    if by_date.get("2021-06-19") != "cigar":
-        reasons.append(f"2021-06-19 entry is {by_date.get('2021-06-19')!r}, expected 'cigar'")
+    return reasons
+
+
+def staleness(by_date):
     through = max(by_date)
     try:
         through_date = date.fromisoformat(through)
-        if abs((date.today() - through_date).days) > MAX_STALENESS_DAYS:
-            reasons.append(f"through-date {through} is more than {MAX_STALENESS_DAYS} "
-                            f"days from today ({date.today().isoformat()})")
     except ValueError:
-        pass  # already reported above as a bad date
+        return []  # already reported as a bad date
+    if abs((date.today() - through_date).days) > MAX_STALENESS_DAYS:
+        return [f"through-date {through} is more than {MAX_STALENESS_DAYS} "
+                f"days from today ({date.today().isoformat()})"]
+    return []
+
+
+def validate_new(table, known, through, check_staleness=True):
+    """Reasons not to merge an incremental scan: the new rows alone are
+    checked, plus how they join onto the stored history."""
+    new = table.result()
+    if table.mismatches and not new:
+        return ["rows disagree with the Wordle-number dates"]
+    if table.overlap is None:
+        return [f"page never reached a known date (through {through}); try --full"]
+    if table.conflict:
+        return [table.conflict]
+    if table.overlap != through:
+        return [f"first known date on the page is {table.overlap}, not {through} "
+                "(not listed newest first?); try --full"]
+    reasons = validate_rows(new)
+    if reasons:
+        return reasons
+    start = date.fromisoformat(through)
+    expected = {(start + timedelta(days=i + 1)).isoformat() for i in range(len(new))}
+    if set(new) != expected:
+        missing = sorted(expected - set(new)) or sorted(set(new) - expected)
+        reasons.append(f"new rows don't continue day by day from {through}, e.g. {missing[:3]}")
+    if check_staleness and not reasons:
+        reasons += staleness({**known, **new})
     return reasons
 
 
+def load_existing(path):
+    """(by_date, meta) from the current file, or ({}, {}) if there's none."""
+    try:
+        data = json.loads(pathlib.Path(path).read_text())
+        return data["byDate"], data["meta"]
+    except (OSError, ValueError, KeyError):
+        return {}, {}
+
+
 def load_our_words():
     def load(p):
         with open(p) as f:
@@ -154,32 +300,57 @@ def load_our_words():
 
 
 def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--full", action="store_true", help="rebuild the whole history")
+    p.add_argument("--html", action="append", type=pathlib.Path,
+                   help="parse this saved page instead of fetching (repeatable; tried in order)")
+    p.add_argument("--out", type=pathlib.Path, default=OUT_PATH)
+    args = p.parse_args()
+
+    known, meta = ({}, {}) if args.full else load_existing(args.out)
+    through = meta.get("through") if known else None
+    if through:
+        print(f"incremental: have {len(known)} entries through {through}")
+    sources = ([(path.resolve().as_uri(), lambda path=path: read_file(path)) for path in args.html]
+               if args.html else [(url, lambda url=url: stream(url)) for url in SOURCES])
+    check_staleness = not args.html
+
     our_words = load_our_words()
-    for url in SOURCES:
+    for url, open_page in sources:
         print(f"trying {url} ...")
+        chunks = open_page()
         try:
-            html = fetch(url)
+            table = scan(chunks, known if through else None)
         except (urllib.error.URLError, OSError, RuntimeError) as e:
             print(f"  skip: fetch failed: {e}")
             continue
-        parser = PARSERS[url]
-        by_date = parser(html)
-        if not by_date:
-            print("  skip: no per-date answer table found on this page")
-            continue
-        reasons = validate(by_date)
+        finally:
+            chunks.close()
+        if through:
+            reasons = validate_new(table, known, through, check_staleness)
+            new = table.result()
+            by_date = {**known, **new}
+        else:
+            by_date = new = table.result()
+            if not by_date:
+                print("  skip: no per-date answer table found on this page")
+                continue
+            reasons = validate(by_date, check_staleness)
         if reasons:
             print(f"  skip: validation failed: {'; '.join(reasons)}")
             continue
+        if through and not new:
+            print(f"already up to date through {through}")
+            return
 
-        through = max(by_date)
-        outside = sorted(w for w in by_date.values() if w not in our_words)
-        out = {"meta": {"through": through, "source": url},
+        through_new = max(by_date)
+        outside = sorted(w for w in new.values() if w not in our_words)
+        out = {"meta": {"through": through_new, "source": url},
                "byDate": dict(sorted(by_date.items()))}
-        OUT_PATH.write_text(json.dumps(out, separators=(",", ":")))
-        print(f"wrote {OUT_PATH.relative_to(ROOT)}: {len(by_date)} entries, "
-              f"2021-06-19..{through}, source={url}")
-        print(f"{len(outside)} answers are outside our combined answers.json/extended.json lists"
+        args.out.write_text(json.dumps(out, separators=(",", ":")))
+        print(f"wrote {args.out}: {len(by_date)} entries ({len(new)} new), "
+              f"2021-06-19..{through_new}, source={url}")
+        print(f"{len(outside)} new answers are outside our combined answers.json/extended.json lists"
               + (f" (e.g. {outside[:10]})" if outside else ""))
         return
 
@@ -0,0 +1,37 @@
+"""Generate data/patterns.npy: the feedback pattern code of every guess
+(answers + extended, in that order) against every answer, as a uint8
+(guesses x answers) matrix. patterns.py memory-maps it on first use.
+
+The file is ~30 MB and derived entirely from words/*.txt, so it is not
+committed - run this after cloning or after changing the word lists. It is
+written to a temporary file first and renamed into place, so a failed run
+never leaves a truncated matrix behind.
+"""
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from patterns import ANSWER_WORDS, GUESS_WORDS, MATRIX_PATH, build_matrix
+
+
+def main():
+    MATRIX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = MATRIX_PATH.with_suffix(".tmp.npy")
+    t0 = time.perf_counter()
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.uint8,
+                                    shape=(len(GUESS_WORDS), len(ANSWER_WORDS)))
+    build_matrix(out=out)
+    out.flush()
+    del out
+    tmp.replace(MATRIX_PATH)
+    size = MATRIX_PATH.stat().st_size / 1e6
+    print(f"wrote {MATRIX_PATH.relative_to(ROOT)}: {len(GUESS_WORDS)}x{len(ANSWER_WORDS)} "
+          f"({size:.1f} MB) in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""Build dist/: content-hashed, precompressed (gzip + brotli) copies of every
+file in static/data/, for app.py to serve with immutable caching.
+
+Run after regenerating anything in static/data/ and as part of a deploy
+build (Dockerfile, render.yaml). Without the brotli package only gzip
+variants are written. See assets.py for the layout.
+"""
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from assets import DIST_DIR, SUFFIX, build
+
+out = pathlib.Path(sys.argv[1]) if len(sys.argv) > 1 else DIST_DIR
+for source, entry in build(out=out).items():
+    sizes = {enc: (out / (entry["file"] + SUFFIX[enc])).stat().st_size for enc in entry["encodings"]}
+    print(f"{source:22} -> {entry['file']:34} {(out / entry['file']).stat().st_size:>8} "
+          + " ".join(f"{enc} {n}" for enc, n in sizes.items()))
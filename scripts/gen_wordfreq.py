@@ -1,15 +1,36 @@
 """Generate static/data/freq.json: a {word: tier} map (tier 0 = most common, 29
-= rarest of the words we tier) built from Norvig's word-frequency corpus.
+= rarest of the words we tier) built from word-frequency corpora, plus
+data/freq-scores.json: {word: Zipf score}, the continuous
+log10(occurrences per billion words) the tiers are cut from. The scores are
+a local by-product, not app data: they stay out of static/data/ so
+assets.build doesn't publish them, and data/ is not committed.
+
+    python scripts/gen_wordfreq.py                          # Norvig's count_1w.txt
+    python scripts/gen_wordfreq.py counts.txt.gz            # a local (gzipped) file
+    python scripts/gen_wordfreq.py URL=2 other.tsv=1        # weighted merge
+
+Each source is a URL or a local path, optionally gzipped (detected from
+its first bytes), read line by line: memory is bounded by our vocabulary,
+not by the corpus, so multi-GB n-gram dumps work. A line is `word count`
+(Norvig's format) or `word year match_count volume_count` (Google Books
+1-grams, one line per year, summed); part-of-speech suffixes like
+`crane_NOUN` are dropped. Each corpus is normalized by its own total token
+count, and the merged frequency is the weight-averaged share.
 
 Only 5-letter, a-z words that appear in our answers.json + extended.json lists
-are considered. Words are ranked by corpus count and split into 30 equal-
+are considered. Words are ranked by merged frequency and split into 30 equal-
 population tiers by rank. A word absent from this file is understood by the
 solver to be tier 30 (rarer than anything we tiered).
 
 Fails loudly and writes nothing on any error (network, parsing, or otherwise) -
 never leaves a partial freq.json behind.
 """
+import argparse
+import contextlib
+import gzip
+import io
 import json
+import math
 import pathlib
 import re
 import sys
@@ -21,6 +42,8 @@ URL = "https://norvig.com/ngrams/count_1w.txt"
 USER_AGENT = "Mozilla/5.0 (compatible; wosolve-wordfreq-gen/1.0)"
 NUM_TIERS = 30
 WORD_RE = re.compile(r"^[a-z]{5}$")
+GZIP_MAGIC = b"\x1f\x8b"
+SCORE_DIGITS = 3
 
 
 def fail(msg):
@@ -28,17 +51,97 @@ def fail(msg):
     sys.exit(1)
 
 
-def download_corpus():
-    req = urllib.request.Request(URL, headers={"User-Agent": USER_AGENT})
+def parse_source(arg):
+    """"src" or "src=weight" -> (src, weight)."""
+    src, sep, weight = arg.rpartition("=")
+    if not sep or "/" in weight:  # no weight given ("=" belongs to a URL query)
+        return arg, 1.0
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            if resp.status != 200:
-                fail(f"unexpected HTTP status {resp.status} fetching {URL}")
-            return resp.read().decode("utf-8", errors="replace")
+        value = float(weight)
+    except ValueError:
+        return arg, 1.0
+    if not value > 0:
+        fail(f"weight must be positive: {arg}")
+    return src, value
+
+
+@contextlib.contextmanager
+def open_source(src):
+    """A binary stream for a URL or path, transparently gunzipped."""
+    if re.match(r"^https?://", src):
+        req = urllib.request.Request(src, headers={"User-Agent": USER_AGENT})
+        resp = urllib.request.urlopen(req, timeout=30)
+        if resp.status != 200:
+            fail(f"unexpected HTTP status {resp.status} fetching {src}")
+        stream = io.BufferedReader(resp)
+    else:
+        stream = open(src, "rb")
+    with stream:
+        if stream.peek(2)[:2] == GZIP_MAGIC:
+            with gzip.GzipFile(fileobj=stream) as unzipped:
+                yield unzipped
+        else:
+            yield stream
+
+
+def count_words(lines, our_words):
+    """({word: count} over our_words, total tokens in the corpus) from a
+    stream of lines; per-year rows of the same word are summed."""
+    counts, total = {}, 0
+    for line in lines:
+        parts = line.split()
+        if len(parts) == 2:
+            word, count_s = parts
+        elif len(parts) == 4:
+            word, count_s = parts[0], parts[2]
+        else:
+            continue
+        try:
+            count = int(count_s)
+        except ValueError:
+            continue
+        if count <= 0:
+            continue
+        total += count
+        word = word.partition("_")[0].lower()
+        if WORD_RE.match(word) and word in our_words:
+            counts[word] = counts.get(word, 0) + count
+    return counts, total
+
+
+def read_corpus(src, our_words):
+    try:
+        with open_source(src) as stream:
+            lines = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")
+            return count_words(lines, our_words)
     except urllib.error.URLError as e:
-        fail(f"could not fetch {URL}: {e}")
-    except OSError as e:
-        fail(f"network error fetching {URL}: {e}")
+        fail(f"could not fetch {src}: {e}")
+    except (OSError, EOFError) as e:
+        fail(f"could not read {src}: {e}")
+
+
+def merge(corpora):
+    """{word: frequency} - each corpus's share of its own total tokens,
+    weight-averaged across corpora. corpora: [(counts, total, weight)]."""
+    weights = sum(w for _, _, w in corpora)
+    merged = {}
+    for counts, total, weight in corpora:
+        for word, count in counts.items():
+            merged[word] = merged.get(word, 0.0) + weight * count / total
+    return {word: f / weights for word, f in merged.items()}
+
+
+def tiers(freqs):
+    """{word: tier}: NUM_TIERS equal-population tiers by rank, most common
+    first; ties broken by word for determinism."""
+    ranked = sorted(freqs, key=lambda w: (-freqs[w], w))
+    n = len(ranked)
+    return {word: min(rank * NUM_TIERS // n, NUM_TIERS - 1) for rank, word in enumerate(ranked)}
+
+
+def zipf(freq):
+    """Zipf scale: log10 of occurrences per billion words."""
+    return round(math.log10(freq) + 9, SCORE_DIGITS)
 
 
 def load_words(path):
@@ -47,49 +150,41 @@ def load_words(path):
 
 
 def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("sources", nargs="*", default=[URL],
+                   help="URL or path (gzip ok), optionally SRC=WEIGHT (default: Norvig count_1w)")
+    p.add_argument("--out-dir", type=pathlib.Path, default=ROOT / "static/data")
+    p.add_argument("--scores-out", type=pathlib.Path, default=ROOT / "data/freq-scores.json")
+    args = p.parse_args()
+
     our_words = load_words(ROOT / "static/data/answers.json") | \
         load_words(ROOT / "static/data/extended.json")
     if not our_words:
         fail("answers.json / extended.json loaded empty word sets")
 
-    text = download_corpus()
-
-    counts = []  # (count, word), corpus order is already frequency-descending
-    for line in text.splitlines():
-        parts = line.split("\t")
-        if len(parts) != 2:
-            continue
-        word, count_s = parts
-        if not WORD_RE.match(word):
-            continue
-        if word not in our_words:
-            continue
-        try:
-            count = int(count_s)
-        except ValueError:
-            continue
-        counts.append((count, word))
-
-    if not counts:
-        fail("no matching 5-letter words found in downloaded corpus")
-
-    # Sort by corpus count descending (most common first); ties broken by word
-    # for determinism.
-    counts.sort(key=lambda c: (-c[0], c[1]))
-
-    n = len(counts)
-    freq = {}
-    for rank, (_, word) in enumerate(counts):
-        tier = rank * NUM_TIERS // n
-        freq[word] = min(tier, NUM_TIERS - 1)
-
-    out = {word: freq[word] for word in sorted(freq)}
-
-    out_path = ROOT / "static/data/freq.json"
-    out_path.write_text(json.dumps(out, separators=(",", ":")))
-
-    coverage = len(freq) / len(our_words) * 100
-    print(f"{len(freq)}/{len(our_words)} words tiered ({coverage:.1f}% coverage)")
+    corpora = []
+    for src, weight in map(parse_source, args.sources):
+        counts, total = read_corpus(src, our_words)
+        if not counts or total <= 0:
+            fail(f"no matching 5-letter words found in {src}")
+        print(f"{src}: {len(counts)} of our words, {total:,} tokens, weight {weight:g}")
+        corpora.append((counts, total, weight))
+
+    freqs = merge(corpora)
+    tier_of = tiers(freqs)
+    out = {word: tier_of[word] for word in sorted(tier_of)}
+    scores = {word: zipf(freqs[word]) for word in sorted(freqs)}
+
+    # Both files or neither: write to temporaries, then rename into place.
+    outputs = [(args.out_dir / "freq.json", out), (args.scores_out, scores)]
+    for path, data in outputs:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.with_suffix(".tmp").write_text(json.dumps(data, separators=(",", ":")))
+    for path, _ in outputs:
+        path.with_suffix(".tmp").replace(path)
+
+    coverage = len(out) / len(our_words) * 100
+    print(f"{len(out)}/{len(our_words)} words tiered ({coverage:.1f}% coverage)")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,14 @@
-import json, pathlib
+import json, pathlib, sys
 ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from solver_ref import WORD_INDEX_PATH, pack_word_index
 OUT = ROOT / "static" / "data"
 OUT.mkdir(parents=True, exist_ok=True)
+lists = []
 for src, dst in [("wordle-ta.txt", "answers.json"), ("wordle-la.txt", "extended.json")]:
     words = [w.strip() for w in open(ROOT / "words" / src) if len(w.strip()) == 5]
     json.dump(words, open(OUT / dst, "w"), separators=(",", ":"))
     print(dst, len(words))
+    lists.append(words)
+pathlib.Path(WORD_INDEX_PATH).write_bytes(pack_word_index(*lists))
+print(pathlib.Path(WORD_INDEX_PATH).relative_to(ROOT), sum(map(len, lists)))
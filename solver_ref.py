@@ -1,10 +1,71 @@
+import json
+import mmap
+import os
+import re
+import struct
+
+from metrics import timed
+from packed import (PATTERN_MARKS, compile_constraints, feedback_code, matches, remember, select, word_code,
+                    word_info)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+WORDS_DIR = os.path.join(ROOT, "words")
+WORD_INDEX_PATH = os.path.join(WORDS_DIR, "wordlists.bin")
+FREQ_PATH = os.path.join(ROOT, "static", "data", "freq.json")
+
+# Packed word index (scripts/gen_wordlists.py): this header, then every
+# answer and then every extended word as a fixed 5-byte ASCII record.
+WORD_INDEX_MAGIC = b"WOSW"
+WORD_INDEX_VERSION = 1
+WORD_INDEX_HEADER = struct.Struct("<4sHHII")  # magic, version, record size, #answers, #extended
+
+WORD_RE = re.compile(r"^[a-z]{5}$")
+MARKS_RE = re.compile(r"^[-*+]{5}$")
+
+
 def load_words(path):
     with open(path) as f:
         return [w.strip() for w in f if len(w.strip()) == 5]
 
 
-ANSWER_WORDS = load_words("words/wordle-ta.txt")
-EXTENDED_WORDS = load_words("words/wordle-la.txt")
+def pack_word_index(answers, extended):
+    body = "".join(answers + extended).encode("ascii")
+    return WORD_INDEX_HEADER.pack(WORD_INDEX_MAGIC, WORD_INDEX_VERSION, 5,
+                                  len(answers), len(extended)) + body
+
+
+def load_word_index(path=WORD_INDEX_PATH):
+    """(answers, extended) from the packed index, read through an mmap."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, size, n_ans, n_ext = WORD_INDEX_HEADER.unpack_from(mm)
+        if magic != WORD_INDEX_MAGIC or version != WORD_INDEX_VERSION or size != 5:
+            raise ValueError(f"{path}: not a version {WORD_INDEX_VERSION} word index")
+        start = WORD_INDEX_HEADER.size
+        body = mm[start:start + 5 * (n_ans + n_ext)].decode("ascii")
+    words = [body[i:i + 5] for i in range(0, len(body), 5)]
+    if len(words) != n_ans + n_ext:
+        raise ValueError(f"{path}: truncated word index")
+    return words[:n_ans], words[n_ans:]
+
+
+def load_freq(path=FREQ_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def __getattr__(name):
+    # ANSWER_WORDS / EXTENDED_WORDS are loaded on first access, not at import,
+    # and then cached as ordinary module globals.
+    if name not in ("ANSWER_WORDS", "EXTENDED_WORDS"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        answers, extended = load_word_index()
+    except (OSError, ValueError, struct.error):
+        answers = load_words(os.path.join(WORDS_DIR, "wordle-ta.txt"))
+        extended = load_words(os.path.join(WORDS_DIR, "wordle-la.txt"))
+    remember(answers + extended)
+    globals().update(ANSWER_WORDS=answers, EXTENDED_WORDS=extended)
+    return globals()[name]
 
 
 class WordleState:
@@ -14,9 +75,12 @@ class WordleState:
         self.letter_counts  = {}
         self.max_counts     = {}
         self.excluded_chars = set()
+        self._packed = None
 
+    @timed("update_state")
     def update_state(self, guess):
         marks = [(guess[i], guess[i + 1], i // 2) for i in range(0, len(guess), 2)]
+        self._packed = None
 
         plus_and_star_counts = {}
         for letter, symbol, pos in marks:
@@ -42,82 +106,122 @@ class WordleState:
         for letter, pcount in plus_and_star_counts.items():
             self.letter_counts[letter] = max(self.letter_counts.get(letter, 0), pcount)
 
-    def is_valid_word(self, word):
-        if any(l in word for l in self.excluded_chars):
-            return False
-
-        for letter, minc in self.letter_counts.items():
-            if word.count(letter) < minc:
-                return False
-
-        for letter, maxc in self.max_counts.items():
-            if word.count(letter) > maxc:
-                return False
-
-        for i, must in enumerate(self.green_chars):
-            if must != ' ' and word[i] != must:
-                return False
-
-        for i, badset in enumerate(self.yellow_chars):
-            if word[i] in badset:
-                return False
-
-        return True
-
+    def compile(self):
+        """Constraints as (allowed, min_counts, max_counts) for array filtering.
+
+        allowed[i] is a 26-bit mask of the letters still possible at position
+        i (bit 0 = 'a'); min_counts / max_counts are 26-entry lists bounding
+        how many times each letter occurs. A word passes iff every letter is
+        allowed at its position and every letter count is within bounds -
+        exactly is_valid_word.
+        """
+        bit = lambda l: 1 << (ord(l) - 97)
+        everything = (1 << 26) - 1
+        for l in self.excluded_chars:
+            everything &= ~bit(l)
+        allowed = []
+        for i in range(5):
+            mask = bit(self.green_chars[i]) if self.green_chars[i] != ' ' else everything
+            for l in self.yellow_chars[i]:
+                mask &= ~bit(l)
+            allowed.append(mask)
+        min_counts = [0] * 26
+        max_counts = [5] * 26
+        for l, c in self.letter_counts.items():
+            min_counts[ord(l) - 97] = c
+        for l, c in self.max_counts.items():
+            max_counts[ord(l) - 97] = c
+        for l in self.excluded_chars:
+            max_counts[ord(l) - 97] = 0
+        return allowed, min_counts, max_counts
+
+    def packed(self):
+        """compile() as packed.py constraints, cached until the next update."""
+        if self._packed is None:
+            self._packed = compile_constraints(*self.compile())
+        return self._packed
 
+    def is_valid_word(self, word):
+        code, mask, lo, hi, _ = word_info(word)
+        return matches(code, mask, lo, hi, self.packed())
+
+
+def state_from_rows(rows):
+    """[{word, marks}, ...] (the row shape game.js stores) -> a WordleState,
+    like solver.js's stateFromRows. Raises ValueError on a malformed row."""
+    state = WordleState()
+    for row in rows:
+        word = row.get("word") if isinstance(row, dict) else None
+        marks = row.get("marks") if isinstance(row, dict) else None
+        if not isinstance(word, str) or not WORD_RE.match(word):
+            raise ValueError(f"bad word {word!r}: need 5 letters a-z")
+        if not isinstance(marks, str) or not MARKS_RE.match(marks):
+            raise ValueError(f"bad marks {marks!r}: need 5 of '+', '*', '-'")
+        state.update_state(''.join(w + m for w, m in zip(word, marks)))
+    return state
+
+
+@timed("find_valid_words", size=lambda args, out: len(out))
 def find_valid_words(word_list, state):
-    return [w for w in word_list if state.is_valid_word(w)]
+    return select(word_list, state.packed())
 
 
 def suggest_word(candidates):
     """Pick the candidate covering the most common letters among all candidates."""
     if not candidates:
         return None
-    freq = {}
-    for w in candidates:
-        for l in set(w):
-            freq[l] = freq.get(l, 0) + 1
-    return max(candidates, key=lambda w: sum(freq[l] for l in set(w)))
+    freq = [0] * 26
+    letters = [word_info(w)[4] for w in candidates]
+    for ls in letters:
+        for l in ls:
+            freq[l] += 1
+    scores = [sum(freq[l] for l in ls) for ls in letters]
+    return candidates[scores.index(max(scores))]
 
 
+@timed("feedback")
 def feedback(answer, guess):
-    marks = [None] * 5
-    remaining = {}
-    for i in range(5):
-        if guess[i] == answer[i]:
-            marks[i] = '+'
-        else:
-            remaining[answer[i]] = remaining.get(answer[i], 0) + 1
-    for i in range(5):
-        if marks[i] is None:
-            if remaining.get(guess[i], 0) > 0:
-                marks[i] = '*'
-                remaining[guess[i]] -= 1
-            else:
-                marks[i] = '-'
-    return ''.join(guess[i] + marks[i] for i in range(5))
-
-
-def rank_suggestions(candidates, answer_set, freq=None):
+    m = PATTERN_MARKS[feedback_code(word_code(answer), word_code(guess))]
+    return guess[0] + m[0] + guess[1] + m[1] + guess[2] + m[2] + guess[3] + m[3] + guess[4] + m[4]
+
+
+@timed("rank_suggestions", size=lambda args, out: len(args[0]))
+def rank_suggestions(candidates, answer_set, freq=None, mode="heuristic", guesses=None):
+    """Rank guesses for the given candidates, best first.
+
+    mode="heuristic" (the default, mirrored by static/js/solver.js) orders the
+    candidates themselves by letter coverage / likelihood. mode="entropy" or
+    "expected" instead ranks every allowed guess (or just `guesses`) by the
+    information its feedback partition gives, and mode="minimax" by the
+    worst case (largest bucket) - see ranking.py.
+    """
+    if mode != "heuristic":
+        from ranking import rank_by_information
+        return rank_by_information(candidates, freq, guesses, objective=mode)
     if not candidates:
         return []
     if freq is None:
         freq = {}
-    letter_freq = {}
+    info = {w: word_info(w) for w in candidates}
+    letter_freq = [0] * 26
     for w in candidates:
-        for l in set(w):
-            letter_freq[l] = letter_freq.get(l, 0) + 1
+        for l in info[w][4]:
+            letter_freq[l] += 1
+    coverage = lambda w: sum(letter_freq[l] for l in info[w][4])
     tier = lambda w: freq.get(w, 30)
     if len(candidates) > 20:
-        pos = [dict() for _ in range(5)]
+        # pos[32 * i + l]: candidates with letter l at position i.
+        pos = [0] * 160
         for w in candidates:
-            for i, l in enumerate(w):
-                pos[i][l] = pos[i].get(l, 0) + 1
-        key = lambda w: (-sum(letter_freq[l] for l in set(w)),
-                         -sum(pos[i].get(l, 0) for i, l in enumerate(w)),
-                         tier(w), w)
+            code = info[w][0]
+            pos[code & 31] += 1
+            pos[32 + (code >> 5 & 31)] += 1
+            pos[64 + (code >> 10 & 31)] += 1
+            pos[96 + (code >> 15 & 31)] += 1
+            pos[128 + (code >> 20 & 31)] += 1
+        placed = lambda c: (pos[c & 31] + pos[32 + (c >> 5 & 31)] + pos[64 + (c >> 10 & 31)]
+                            + pos[96 + (c >> 15 & 31)] + pos[128 + (c >> 20 & 31)])
+        key = lambda w: (-coverage(w), -placed(info[w][0]), tier(w), w)
     else:
-        key = lambda w: (0 if w in answer_set else 1,
-                         tier(w),
-                         -sum(letter_freq[l] for l in set(w)), w)
+        key = lambda w: (0 if w in answer_set else 1, tier(w), -coverage(w), w)
     return sorted(candidates, key=key)
@@ -14,21 +14,47 @@ function headlineFor(guesses, won) {
 // before/after that guess and what the solver would have suggested at that
 // point. No DOM access here — analysis.js keeps logic and rendering
 // separate so the harness can exercise analyzeGame without a document.
-export function analyzeGame({ rows, pool, answerSet, freq, won = true }) {
+//
+// For consistent rows each guess only narrows the previous guess's
+// survivors, so the replay filters a shrinking pool rather than re-filtering
+// the full pool twice per guess. Contradictory rows (hand-entered ones can
+// be) may loosen the accumulated state instead - a later green replaces an
+// earlier one, a later max count replaces a lower one - and then that guess
+// re-filters the full pool, so the counts always match filterWords(pool, ...).
+//
+// `rank` (optional) replaces rankSuggestions - game.js passes its memoized
+// ranker so replaying a game reuses rankings already computed while playing.
+export function analyzeGame({ rows, pool, answerSet, freq, won = true,
+  rank = cands => rankSuggestions(cands, answerSet, freq) }) {
+  let before = pool, prev = null;
   const perGuess = rows.map((row, i) => {
-    const before = filterWords(pool, stateFromRows(rows.slice(0, i)));
-    const after = filterWords(pool, stateFromRows(rows.slice(0, i + 1)));
-    const solverPick = rankSuggestions(before, answerSet, freq)[0] ?? null;
+    const st = stateFromRows(rows.slice(0, i + 1));
+    const after = filterWords(!prev || narrows(prev, st) ? before : pool, st);
+    prev = st;
+    const solverPick = rank(before)[0] ?? null;
     const cutPct = before.length > 0
       ? Math.round((before.length - after.length) / before.length * 100)
       : 0;
-    return { word: row.word, marks: row.marks, before: before.length,
+    const result = { word: row.word, marks: row.marks, before: before.length,
       after: after.length, solverPick, cutPct };
+    before = after;
+    return result;
   });
   const guesses = rows.length;
   return { perGuess, summary: { guesses, won, headline: headlineFor(guesses, won) } };
 }
 
+// True when every word valid under `next` is also valid under `prev`.
+// stateFromRows only ever adds exclusions and raises minimum counts, so
+// only a changed green or a raised max count can loosen it.
+function narrows(prev, next) {
+  for (let i = 0; i < 5; i++)
+    if (prev.greens[i] && prev.greens[i] !== next.greens[i]) return false;
+  for (const [l, n] of Object.entries(prev.maxCounts))
+    if (next.maxCounts[l] > n && !next.excluded.has(l)) return false;
+  return true;
+}
+
 function miniRowHtml(word, marks) {
   let tiles = '';
   for (let i = 0; i < 5; i++) {
@@ -0,0 +1,50 @@
+// Decoder for static/data/bundle.bin (format: bundle.py). Returns exactly
+// what answers.json, extended.json, freq.json and past-answers.json hold:
+// { answers, extended, freq, pastAnswers }.
+const MAGIC = 'WOSB';
+const VERSION = 1;
+const HEADER_SIZE = 18;
+const ANSWER = 1, EXTENDED = 2, NO_TIER = 255, NO_ANSWER = 0xffff;
+const PAD = Array.from({ length: 32 }, (_, i) => String(i).padStart(2, '0'));
+const monthDays = (y, m) => m === 2 ? (y % 4 === 0 && (y % 100 !== 0 || y % 400 === 0) ? 29 : 28)
+  : [4, 6, 9, 11].includes(m) ? 30 : 31;
+
+export function decodeBundle(buffer) {
+  const bytes = new Uint8Array(buffer);
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  const magic = String.fromCharCode(...bytes.subarray(0, 4));
+  if (magic !== MAGIC || view.getUint16(4, true) !== VERSION)
+    throw new Error(`not a version ${VERSION} bundle`);
+  const n = view.getUint32(6, true), nDays = view.getUint32(10, true), metaLen = view.getUint32(14, true);
+  let pos = HEADER_SIZE;
+  const meta = JSON.parse(new TextDecoder().decode(bytes.subarray(pos, pos + metaLen)));
+  pos += metaLen;
+
+  const table = new Array(n);
+  const letters = new Uint8Array(5);
+  for (let i = 0; i < n; i++) {
+    const b = bytes[pos], p = b >> 5;
+    letters[p] = 97 + (b & 31);
+    for (let k = p + 1; k < 5; k++) letters[k] = bytes[pos + k - p];
+    pos += 5 - p;
+    table[i] = String.fromCharCode(letters[0], letters[1], letters[2], letters[3], letters[4]);
+  }
+  const kinds = bytes.subarray(pos, pos + n), tiers = bytes.subarray(pos + n, pos + 2 * n);
+  pos += 2 * n;
+
+  const answers = [], extended = [], freq = {};
+  for (let i = 0; i < n; i++) {
+    if (kinds[i] & ANSWER) answers.push(table[i]);
+    if (kinds[i] & EXTENDED) extended.push(table[i]);
+    if (tiers[i] !== NO_TIER) freq[table[i]] = tiers[i];
+  }
+  // Walk the calendar day by day rather than formatting a Date per entry.
+  let [y, m, d] = meta.epoch.split('-').map(Number);
+  const byDate = {};
+  for (let i = 0; i < nDays; i++) {
+    const idx = view.getUint16(pos + 2 * i, true);
+    if (idx !== NO_ANSWER) byDate[`${y}-${PAD[m]}-${PAD[d]}`] = table[idx];
+    if (++d > monthDays(y, m)) { d = 1; if (++m > 12) { m = 1; y++; } }
+  }
+  return { answers, extended, freq, pastAnswers: { meta: meta.meta, byDate } };
+}
@@ -55,6 +55,10 @@ let practiceTileInfoShown = false; // one-time-per-session nudge
 // game, a dated replay, or "play again") so re-renders triggered by typing
 // don't re-blur an already-revealed hint (and a fresh game starts blurred).
 let hintRevealed = false;
+// Rankings memoized by candidate set (see makeRankCache); lists never change
+// after boot, so one cache serves rerender, hintFor and the analysis replay.
+let ranks = null;
+const rankCache = () => (ranks ??= S.makeRankCache(new Set(lists.answers), lists.freq));
 
 export function initGame(wordLists, initUI_) {
   lists = wordLists;
@@ -270,9 +274,8 @@ function rerender(opts = {}) {
   UI.renderKeyboard(r); // both modes: derived from committed rows
   if (state.mode === 'solver') {
     const cands = S.filterWords(pool(), S.stateFromRows(r));
-    const ranked = S.rankSuggestions(cands, new Set(lists.answers), lists.freq);
-    const topScore = ranked.length ? scoreOf(ranked[0], cands) : 1;
-    const top = ranked.slice(0, 30);
+    const top = rankCache().rank(cands, 30);
+    const topScore = top.length ? scoreOf(top[0], cands) : 1;
     UI.renderSuggestions({ top, count: cands.length,
       scores: top.map(w => Math.max(6, Math.round(scoreOf(w, cands) / topScore * 100))) });
     if (cands.length === 1 && r.length && !r.some(x => x.marks === '+++++'))
@@ -304,6 +307,7 @@ function seeAnalysis() {
   const p = pool();
   showAnalysis(analyzeGame({
     rows: r, pool: p, answerSet: new Set(lists.answers), freq: lists.freq, won,
+    rank: cands => rankCache().rank(cands, 1),
   }));
 }
 
@@ -332,7 +336,7 @@ function scoreOf(w, cands) {
 
 function hintFor() {
   const cands = S.filterWords(pool(), S.stateFromRows(state.practice.rows));
-  const ranked = S.rankSuggestions(cands, new Set(lists.answers), lists.freq);
+  const ranked = rankCache().rank(cands);
   const secret = state.practice.secret;
   const greenShare = ranked.find(w => w.split('').some((c, i) => c === secret[i]));
   return greenShare ?? ranked[0] ?? '';
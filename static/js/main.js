@@ -4,19 +4,31 @@ import { initGame } from './game.js';
 import { initStats } from './stats.js';
 import { initCelebrate } from './celebrate.js';
 import { initHelpDemo } from './helpdemo.js';
+import { decodeBundle } from './bundle.js';
+
+// Content-hashed, precompressed URLs rendered into the page by app.py;
+// falls back to the plain static files (e.g. when served without Flask).
+const DATA_URLS = JSON.parse(document.getElementById('data-urls')?.textContent || '{}');
+const dataUrl = name => DATA_URLS[name] || `/static/data/${name}`;
 
 async function fetchLists() {
+  // One compact bundle carries all four data files; the JSON files remain
+  // the fallback.
+  try {
+    const b = await fetch(dataUrl('bundle.bin'));
+    if (b.ok) return decodeBundle(await b.arrayBuffer());
+  } catch {}
   const [a, e] = await Promise.all([
-    fetch('/static/data/answers.json'), fetch('/static/data/extended.json')]);
+    fetch(dataUrl('answers.json')), fetch(dataUrl('extended.json'))]);
   if (!a.ok || !e.ok) throw new Error('word list fetch failed');
   let freq = {};
   try {
-    const f = await fetch('/static/data/freq.json');
+    const f = await fetch(dataUrl('freq.json'));
     if (f.ok) freq = await f.json();
   } catch {}
   let pastAnswers = null;
   try {
-    const p = await fetch('/static/data/past-answers.json');
+    const p = await fetch(dataUrl('past-answers.json'));
     if (p.ok) pastAnswers = await p.json();
   } catch {}
   return { answers: await a.json(), extended: await e.json(), freq, pastAnswers };
@@ -69,6 +69,47 @@ export function rankSuggestions(candidates, answerSet, freq = {}) {
   return [...candidates].sort(cmp);
 }
 
+// Cheap fingerprint of a candidate list (in order): two 32-bit string hashes
+// plus the length. Candidate lists come from filtering one fixed pool, so
+// equal fingerprints mean the same survivors.
+function fingerprint(words) {
+  let a = 0x811c9dc5, b = 5381;
+  for (const w of words) for (let i = 0; i < w.length; i++) {
+    const c = w.charCodeAt(i);
+    a = Math.imul(a ^ c, 16777619);
+    b = (Math.imul(b, 33) + c) | 0;
+  }
+  return `${words.length}:${a >>> 0}:${b >>> 0}`;
+}
+
+// Bounded LRU memo around rankSuggestions for one (answerSet, freq) pair,
+// like rankcache.py: an unchanged board, undo/redo or an analysis replay
+// hits the cache instead of re-counting letters and re-sorting.
+// rank(cands, top) returns the top slice of the cached full ranking.
+export function makeRankCache(answerSet, freq = {}, maxSize = 64) {
+  const entries = new Map();
+  const cache = {
+    hits: 0, misses: 0,
+    rank(candidates, top = Infinity) {
+      const key = fingerprint(candidates);
+      let ranked = entries.get(key);
+      if (ranked) {
+        cache.hits++;
+        entries.delete(key);
+        entries.set(key, ranked);
+      } else {
+        cache.misses++;
+        ranked = rankSuggestions(candidates, answerSet, freq);
+        entries.set(key, ranked);
+        if (entries.size > maxSize) entries.delete(entries.keys().next().value);
+      }
+      return ranked.slice(0, top);
+    },
+    clear() { entries.clear(); cache.hits = cache.misses = 0; },
+  };
+  return cache;
+}
+
 export function keyboardHints(rows) {
   const st = stateFromRows(rows), hints = {};
   for (const l of st.excluded) hints[l] = 'excluded';
@@ -0,0 +1,260 @@
+"""HTTP load test: the app under gunicorn, driven by a concurrent asyncio client.
+
+    python tests/bench_app.py                                 # 1 and 2 sync workers, 10 s each
+    python tests/bench_app.py --workers 1 2 4 --worker-class sync gthread
+    python tests/bench_app.py --concurrency 64 --duration 30 --json load.json
+
+For every (worker count, worker class) pair it starts `gunicorn app:app
+--preload` (as deployed) on a free local port, waits until /readyz says it
+is warm, and runs --concurrency simulated visitors against it for
+--duration seconds (after --warmup seconds that are not recorded). Each
+visitor replays sessions the way the page makes requests: the index page,
+every static file it loads (stylesheets, scripts, the data bundle), one
+POST /api/solve per guess of a game, and a POST /api/analyze once the game
+is over. Games are traces built up front from ANSWER_WORDS - a random
+answer, a random first guess, then the solver's picks - so requests carry
+realistic rows.
+
+Reports requests/sec and p50/p95/p99 latency overall and per request class
+(page, static, solve, analyze), plus errors. The client is a small
+stdlib HTTP/1.1 client (keep-alive where the worker class allows it), so
+nothing outside the repo's requirements is needed.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from decision_tree import next_guess
+from solver_ref import ANSWER_WORDS, feedback, load_freq
+
+HOST = "127.0.0.1"
+CLASSES = ("page", "static", "solve", "analyze")
+MAX_GUESSES = 6
+START_TIMEOUT = 60
+HEADERS = {"Accept-Encoding": "gzip, br", "User-Agent": "wosolve-bench-app/1.0"}
+
+
+def game_traces(n, seed):
+    """[[{word, marks}, ...], ...]: n games, each a random answer and first
+    guess followed by the solver's recommended guesses."""
+    rng = random.Random(seed)
+    freq = load_freq()
+    traces = []
+    for _ in range(n):
+        answer = rng.choice(ANSWER_WORDS)
+        rows, guess = [], rng.choice(ANSWER_WORDS)
+        while guess and len(rows) < MAX_GUESSES:
+            rows.append({"word": guess, "marks": feedback(answer, guess)[1::2]})
+            if guess == answer:
+                break
+            guess = next_guess(rows, freq)
+        traces.append(rows)
+    return traces
+
+
+def static_paths(base):
+    """Every file the page loads: its src/href URLs, the data bundle, and
+    the ES modules main.js pulls in."""
+    with urllib.request.urlopen(base + "/", timeout=10) as resp:
+        html = resp.read().decode()
+    paths = set(re.findall(r'(?:src|href)="(/(?:static|data)/[^"]+)"', html))
+    data_urls = re.search(r'<script id="data-urls" type="application/json">(.*?)</script>', html, re.S)
+    if data_urls:
+        paths.add(json.loads(data_urls.group(1))["bundle.bin"])
+    js_dir = os.path.join(PROJECT_ROOT, "static", "js")
+    paths.update(f"/static/js/{f}" for f in os.listdir(js_dir) if f.endswith(".js"))
+    return sorted(paths)
+
+
+def session(trace, statics):
+    """(class, method, path, body) requests one visitor makes for one game."""
+    reqs = [("page", "GET", "/", None)] + [("static", "GET", p, None) for p in statics]
+    for i in range(1, len(trace) + 1):
+        reqs.append(("solve", "POST", "/api/solve", {"rows": trace[:i], "top": 10}))
+    reqs.append(("analyze", "POST", "/api/analyze", {"rows": trace}))
+    return reqs
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection, reopened whenever the server closes it."""
+
+    def __init__(self, port):
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(HOST, self.port)
+        payload = b"" if body is None else json.dumps(body).encode()
+        head = [f"{method} {path} HTTP/1.1", f"Host: {HOST}:{self.port}",
+                *(f"{k}: {v}" for k, v in HEADERS.items())]
+        if body is not None:
+            head += ["Content-Type: application/json", f"Content-Length: {len(payload)}"]
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        if "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding") == "chunked":
+            while size := int((await self.reader.readline()).strip(), 16):
+                await self.reader.readexactly(size + 2)
+            await self.reader.readline()
+        else:
+            await self.reader.read()
+            headers["connection"] = "close"
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+async def visitor(port, sessions, record, stop_at):
+    conn = Connection(port)
+    try:
+        while time.perf_counter() < stop_at:
+            for cls, method, path, body in next(sessions):
+                t0 = time.perf_counter()
+                if t0 >= stop_at:
+                    break
+                try:
+                    status = await conn.request(method, path, body)
+                    ok = status < 400
+                except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+                    conn.close()
+                    ok = False
+                record(cls, t0, time.perf_counter() - t0, ok)
+    finally:
+        conn.close()
+
+
+async def drive(port, traces, statics, concurrency, warmup, duration):
+    """{class: [latency, ...]}, errors, measured seconds."""
+    latencies = {c: [] for c in CLASSES}
+    errors = [0]
+    start = time.perf_counter()
+    record_from = start + warmup
+    stop_at = record_from + duration
+
+    def record(cls, t0, dt, ok):
+        if t0 >= record_from:
+            if ok:
+                latencies[cls].append(dt)
+            else:
+                errors[0] += 1
+
+    def sessions(i):
+        n = i
+        while True:
+            yield session(traces[n % len(traces)], statics)
+            n += concurrency
+
+    await asyncio.gather(*(visitor(port, sessions(i), record, stop_at) for i in range(concurrency)))
+    return latencies, errors[0], duration
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers, worker_class, threads):
+    port = free_port()
+    cmd = ["gunicorn", "app:app", "--preload", "--workers", str(workers),
+           "--worker-class", worker_class, "--bind", f"{HOST}:{port}", "--log-level", "warning"]
+    if worker_class == "gthread":
+        cmd += ["--threads", str(threads)]
+    proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT)
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {proc.returncode}")
+        try:
+            urllib.request.urlopen(f"http://{HOST}:{port}/readyz", timeout=2).close()
+            return proc, port
+        except OSError:  # includes the 503s before warm-up is done
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"gunicorn was not ready within {START_TIMEOUT}s")
+
+
+def pct(values, q):
+    """Nearest-rank percentile of a non-empty list."""
+    s = sorted(values)
+    return s[min(len(s) - 1, int(q * len(s)))]
+
+
+def summarize(latencies, errors, seconds):
+    every = [v for vs in latencies.values() for v in vs]
+    def stats(vs):
+        if not vs:
+            return {"requests": 0, "rps": 0.0}
+        return {"requests": len(vs), "rps": len(vs) / seconds,
+                **{f"p{int(q * 100)}_ms": pct(vs, q) * 1e3 for q in (0.50, 0.95, 0.99)}}
+    return {"all": stats(every), "errors": errors,
+            "classes": {c: stats(vs) for c, vs in latencies.items()}}
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2], help="worker counts to try")
+    p.add_argument("--worker-class", nargs="+", default=["sync"], help="gunicorn worker classes")
+    p.add_argument("--threads", type=int, default=4, help="threads per gthread worker")
+    p.add_argument("--concurrency", type=int, default=16, help="simultaneous visitors")
+    p.add_argument("--duration", type=float, default=10.0, help="measured seconds per run")
+    p.add_argument("--warmup", type=float, default=2.0, help="unrecorded seconds before measuring")
+    p.add_argument("--games", type=int, default=200, help="distinct game traces to replay")
+    p.add_argument("--seed", type=int, default=7)
+    p.add_argument("--json", help="also write the results here")
+    a = p.parse_args()
+
+    traces = game_traces(a.games, a.seed)
+    results = []
+    print(f"{'workers':>7} {'class':8} {'request':8} {'reqs':>7} {'rps':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for worker_class in a.worker_class:
+        for workers in a.workers:
+            proc, port = start_server(workers, worker_class, a.threads)
+            try:
+                statics = static_paths(f"http://{HOST}:{port}")
+                lat, errors, seconds = asyncio.run(
+                    drive(port, traces, statics, a.concurrency, a.warmup, a.duration))
+            finally:
+                proc.terminate()
+                proc.wait()
+            summary = summarize(lat, errors, seconds)
+            results.append({"workers": workers, "worker_class": worker_class, **summary})
+            for name, s in [("all", summary["all"]), *summary["classes"].items()]:
+                if s["requests"]:
+                    print(f"{workers:7} {worker_class:8} {name:8} {s['requests']:7} {s['rps']:9.1f} "
+                          f"{s['p50_ms']:8.2f} {s['p95_ms']:8.2f} {s['p99_ms']:8.2f}")
+            if errors:
+                print(f"{workers:7} {worker_class:8} {errors} errors")
+    if a.json:
+        meta = {"concurrency": a.concurrency, "duration": a.duration, "games": a.games,
+                "threads": a.threads, "cpus": os.cpu_count(), "date": time.strftime("%Y-%m-%d")}
+        with open(a.json, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=1)
+    sys.exit(1 if any(r["errors"] for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
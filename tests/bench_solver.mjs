@@ -0,0 +1,67 @@
+// Node side of tests/bench_solver.py: times static/js/solver.js on the same
+// workloads, with the same sampling, so the two solvers compare directly.
+// Reads {workloads, budget, only} as JSON on stdin and prints
+// {"<bench>/<state>/<list>": {ops, p50_us, p95_us, p99_us}} on stdout.
+// Run via: python tests/bench_solver.py --js
+import { readFileSync } from 'node:fs';
+import { fileURLToPath } from 'node:url';
+import { dirname, join } from 'node:path';
+import * as S from '../static/js/solver.js';
+
+const here = dirname(fileURLToPath(import.meta.url));
+const read = p => JSON.parse(readFileSync(join(here, '..', p), 'utf8'));
+
+const ANSWERS = read('static/data/answers.json');
+const EXTENDED = read('static/data/extended.json');
+const FREQ = read('static/data/freq.json');
+const answerSet = new Set(ANSWERS);
+const POOLS = { answers: ANSWERS, both: ANSWERS.concat(EXTENDED) };
+const FEEDBACK_PAIRS = 200;
+
+const { workloads, budget, only } = JSON.parse(readFileSync(0, 'utf8'));
+const now = () => Number(process.hrtime.bigint()) / 1e9;
+
+function measure(fn, callsPerRun) {
+  let reps = 1;
+  for (;;) {
+    const t0 = now();
+    for (let i = 0; i < reps; i++) fn();
+    if (now() - t0 >= 0.002) break;
+    reps *= 2;
+  }
+  const samples = [];
+  let spent = 0;
+  while (spent < budget || samples.length < 5) {
+    const t0 = now();
+    for (let i = 0; i < reps; i++) fn();
+    const dt = now() - t0;
+    spent += dt;
+    samples.push(dt / (reps * callsPerRun));
+  }
+  samples.sort((a, b) => a - b);
+  const pct = p => samples[Math.min(samples.length - 1, Math.floor(p * samples.length))] * 1e6;
+  return { ops: samples.length * reps * callsPerRun / spent,
+    p50_us: pct(0.5), p95_us: pct(0.95), p99_us: pct(0.99) };
+}
+
+const out = {};
+for (const w of workloads) {
+  const words = POOLS[w.list];
+  const cands = S.filterWords(words, S.stateFromRows(w.rows));
+  const pairs = [];
+  while (pairs.length < FEEDBACK_PAIRS) for (const a of cands) {
+    if (pairs.length >= FEEDBACK_PAIRS) break;
+    pairs.push(a);
+  }
+  const benches = [
+    ['filter', 1, () => S.filterWords(words, S.stateFromRows(w.rows))],
+    ['rank', 1, () => S.rankSuggestions(cands, answerSet, FREQ)],
+    ['feedback', pairs.length, () => { for (const a of pairs) S.feedback(a, w.probe); }],
+  ];
+  for (const [name, calls, fn] of benches) {
+    const key = `${name}/${w.name}/${w.list}`;
+    if (only && !key.includes(only)) continue;
+    out[key] = measure(fn, calls);
+  }
+}
+console.log(JSON.stringify(out));
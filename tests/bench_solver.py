@@ -0,0 +1,182 @@
+"""Microbenchmarks for the solver hot paths, with a saved regression baseline.
+
+    python tests/bench_solver.py                  # run, print ops/sec + p50/p95/p99
+    python tests/bench_solver.py --save           # ...and write the baseline
+    python tests/bench_solver.py --compare        # fail if slower than the baseline
+    python tests/bench_solver.py --js             # also time static/js/solver.js under Node
+
+Every workload is a realistic state (empty, early/mid/late game, and the
+duplicate-letter medal/salsa and melee/geese cases) over both the answers-only
+and the combined list. For each one it times building the state + filtering
+(solver_ref, the WordIndex engine and packed.PackedWords), heuristic ranking of the candidates
+(rank_suggestions, and a CandidateSet's letter-histogram rank),
+and single feedback() calls. Each benchmark runs repeated samples of a
+calibrated number of calls; percentiles are over the per-call time of each
+sample.
+
+--compare exits nonzero if any benchmark's median is more than --threshold
+(default 25%) slower than in the baseline file. Baselines are per machine:
+save one before a change, compare after it.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from solver_ref import (WordleState, find_valid_words, feedback, rank_suggestions,
+                         load_freq, ANSWER_WORDS, EXTENDED_WORDS)
+from packed import PackedWords
+from wordindex import ANSWERS, COMBINED, CandidateSet
+
+BASELINE_PATH = os.path.join(PROJECT_ROOT, "tests", "bench-baseline.json")
+JS_RUNNER = os.path.join(PROJECT_ROOT, "tests", "bench_solver.mjs")
+FREQ = load_freq()
+ANSWER_SET = set(ANSWER_WORDS)
+POOLS = {"answers": (ANSWER_WORDS, ANSWERS), "both": (ANSWER_WORDS + EXTENDED_WORDS, COMBINED)}
+PACKED = {name: PackedWords(words) for name, (words, _) in POOLS.items()}
+
+# (name, answer, guesses)
+STATES = [
+    ("empty", "medal", []),
+    ("early", "medal", ["crane"]),
+    ("mid", "medal", ["crane", "pilot"]),
+    ("late", "medal", ["crane", "pilot", "dumpy"]),
+    ("dup-salsa", "medal", ["salsa"]),
+    ("dup-geese", "melee", ["geese"]),
+]
+FEEDBACK_PAIRS = 200
+
+
+def workloads():
+    """[{name, list, rows, probe}] - the shape bench_solver.mjs reads too."""
+    out = []
+    for name, answer, guesses in STATES:
+        rows = [{"word": g, "marks": feedback(answer, g)[1::2]} for g in guesses]
+        for pool in POOLS:
+            out.append({"name": name, "list": pool, "rows": rows,
+                        "probe": guesses[-1] if guesses else "crane"})
+    return out
+
+
+def state_of(rows):
+    st = WordleState()
+    for r in rows:
+        st.update_state("".join(a + b for a, b in zip(r["word"], r["marks"])))
+    return st
+
+
+def benches(w):
+    words, index = POOLS[w["list"]]
+    cands = find_valid_words(words, state_of(w["rows"]))
+    cset = CandidateSet(index, ["".join(a + b for a, b in zip(r["word"], r["marks"])) for r in w["rows"]])
+    pairs = [(a, w["probe"]) for a in (cands * FEEDBACK_PAIRS)[:FEEDBACK_PAIRS]]
+
+    def feedback_batch():
+        for a, g in pairs:
+            feedback(a, g)
+
+    return [
+        ("filter", 1, lambda: find_valid_words(words, state_of(w["rows"]))),
+        ("filter_index", 1, lambda: index.find_valid_words(state_of(w["rows"]))),
+        ("filter_packed", 1, lambda: PACKED[w["list"]].survivors(state_of(w["rows"]).packed())),
+        ("rank", 1, lambda: rank_suggestions(cands, ANSWER_SET, FREQ)),
+        ("rank_hist", 1, lambda: cset.rank(ANSWER_SET, FREQ)),
+        ("feedback", len(pairs), feedback_batch),
+    ]
+
+
+def measure(fn, calls_per_run, budget):
+    """(ops/sec, p50, p95, p99 seconds per call) over samples of `fn`."""
+    reps = 1
+    while True:  # calibrate: a sample should take at least ~2 ms
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            fn()
+        if time.perf_counter() - t0 >= 0.002:
+            break
+        reps *= 2
+    samples, spent = [], 0.0
+    while spent < budget or len(samples) < 5:
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            fn()
+        dt = time.perf_counter() - t0
+        spent += dt
+        samples.append(dt / (reps * calls_per_run))
+    samples.sort()
+    pct = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))]
+    calls = len(samples) * reps * calls_per_run
+    return calls / spent, pct(0.50), pct(0.95), pct(0.99)
+
+
+def run_python(ws, budget, only):
+    results = {}
+    for w in ws:
+        for fname, calls, fn in benches(w):
+            key = f"{fname}/{w['name']}/{w['list']}"
+            if only and only not in key:
+                continue
+            ops, p50, p95, p99 = measure(fn, calls, budget)
+            results[key] = {"ops": ops, "p50_us": p50 * 1e6, "p95_us": p95 * 1e6, "p99_us": p99 * 1e6}
+    return results
+
+
+def run_js(ws, budget, only):
+    proc = subprocess.run(["node", JS_RUNNER], input=json.dumps({"workloads": ws, "budget": budget,
+                                                                 "only": only or ""}),
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--save", action="store_true", help="write results as the baseline")
+    p.add_argument("--compare", action="store_true", help="fail on regressions vs the baseline")
+    p.add_argument("--baseline", default=BASELINE_PATH)
+    p.add_argument("--threshold", type=float, default=0.25, help="allowed median slowdown (0.25 = 25%%)")
+    p.add_argument("--budget", type=float, default=0.3, help="seconds of samples per benchmark")
+    p.add_argument("--only", help="run only benchmarks whose name contains this")
+    p.add_argument("--js", action="store_true", help="also run the workloads against solver.js (Node)")
+    a = p.parse_args()
+
+    ws = workloads()
+    results = run_python(ws, a.budget, a.only)
+    js = run_js(ws, a.budget, a.only) if a.js else {}
+
+    print(f"{'benchmark':32} {'ops/s':>12} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10}"
+          + (f" {'js ops/s':>12} {'py/js':>7}" if js else ""))
+    for key, r in results.items():
+        line = f"{key:32} {r['ops']:12.1f} {r['p50_us']:10.2f} {r['p95_us']:10.2f} {r['p99_us']:10.2f}"
+        if key in js:
+            line += f" {js[key]['ops']:12.1f} {r['ops'] / js[key]['ops']:7.2f}"
+        print(line)
+
+    ok = True
+    if a.compare:
+        with open(a.baseline) as f:
+            base = json.load(f)["results"]
+        for key, r in results.items():
+            if key not in base:
+                continue
+            slower = r["p50_us"] / base[key]["p50_us"] - 1
+            if slower > a.threshold:
+                ok = False
+                print(f"REGRESSION {key}: p50 {base[key]['p50_us']:.2f} -> {r['p50_us']:.2f} us "
+                      f"(+{slower:.0%}, threshold {a.threshold:.0%})")
+        print("no regressions" if ok else "REGRESSIONS PRESENT")
+    if a.save:
+        meta = {"python": platform.python_version(), "machine": platform.machine(),
+                "date": time.strftime("%Y-%m-%d")}
+        with open(a.baseline, "w") as f:
+            json.dump({"meta": meta, "results": results, "js": js}, f, indent=1, sort_keys=True)
+        print(f"wrote {os.path.relpath(a.baseline, PROJECT_ROOT)}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
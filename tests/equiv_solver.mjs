@@ -0,0 +1,70 @@
+// Node side of tests/equiv_solver.py: answers one request per stdin line
+// with a length-prefixed (uint32 LE) binary reply on stdout.
+//   {"op": "feedback", "lo": 0, "hi": 16, "guesses": "answers" | "all"}
+//     -> one base-3 pattern code byte per (answer, guess), answers[lo:hi]
+//        by every guess, answer-major (the pattern matrix's encoding)
+//   {"op": "states", "pool": "answers" | "both", "games": [[[g, code], ...], ...]}
+//     -> per game: a survivor bitmap over the pool (bit i = word i), then
+//        the top three rankSuggestions picks as uint16 pool indices
+//        (0xffff past the end); rows are [guess index into answers +
+//        extended, pattern code]
+// Run via: python tests/equiv_solver.py
+import { readFileSync } from 'node:fs';
+import { createInterface } from 'node:readline';
+import { fileURLToPath } from 'node:url';
+import { dirname, join } from 'node:path';
+import * as S from '../static/js/solver.js';
+
+const here = dirname(fileURLToPath(import.meta.url));
+const read = p => JSON.parse(readFileSync(join(here, '..', p), 'utf8'));
+
+const ANSWERS = read('static/data/answers.json');
+const EXTENDED = read('static/data/extended.json');
+const FREQ = read('static/data/freq.json');
+const answerSet = new Set(ANSWERS);
+const ALL = ANSWERS.concat(EXTENDED);
+const GUESSES = { answers: ANSWERS, all: ALL };
+const POOLS = { answers: ANSWERS, both: ALL };
+const INDEX = { answers: new Map(ANSWERS.map((w, i) => [w, i])), both: new Map(ALL.map((w, i) => [w, i])) };
+const MARK = { '-': 0, '*': 1, '+': 2 };
+const MARKS = Array.from({ length: 243 }, (_, c) =>
+  Array.from({ length: 5 }, (_, i) => '-*+'[Math.floor(c / 3 ** i) % 3]).join(''));
+const TOP = 3, NONE = 0xffff;
+
+const code = marks => MARK[marks[0]] + 3 * MARK[marks[1]] + 9 * MARK[marks[2]]
+  + 27 * MARK[marks[3]] + 81 * MARK[marks[4]];
+
+function feedbackChunk({ lo, hi, guesses }) {
+  const gs = GUESSES[guesses];
+  const out = Buffer.alloc((hi - lo) * gs.length);
+  let k = 0;
+  for (let a = lo; a < hi; a++)
+    for (const g of gs) out[k++] = code(S.feedback(ANSWERS[a], g));
+  return out;
+}
+
+function statesChunk({ pool, games }) {
+  const words = POOLS[pool], index = INDEX[pool];
+  const bitmap = (words.length + 7) >> 3, stride = bitmap + 2 * TOP;
+  const out = Buffer.alloc(games.length * stride);
+  games.forEach((rows, n) => {
+    const st = S.stateFromRows(rows.map(([g, c]) => ({ word: ALL[g], marks: MARKS[c] })));
+    const cands = S.filterWords(words, st);
+    const base = n * stride;
+    for (const w of cands) { const i = index.get(w); out[base + (i >> 3)] |= 1 << (i & 7); }
+    const top = S.rankSuggestions(cands, answerSet, FREQ);
+    for (let t = 0; t < TOP; t++)
+      out.writeUInt16LE(t < top.length ? index.get(top[t]) : NONE, base + bitmap + 2 * t);
+  });
+  return out;
+}
+
+const OPS = { feedback: feedbackChunk, states: statesChunk };
+for await (const line of createInterface({ input: process.stdin })) {
+  if (!line) continue;
+  const req = JSON.parse(line);
+  const body = OPS[req.op](req);
+  const head = Buffer.alloc(4);
+  head.writeUInt32LE(body.length);
+  process.stdout.write(Buffer.concat([head, body]));
+}
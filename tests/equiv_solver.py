@@ -0,0 +1,181 @@
+"""Exhaustive JS <-> Python solver equivalence check, chunked over processes.
+
+    python tests/equiv_solver.py                  # every answer x answer pair + 20000 games
+    python tests/equiv_solver.py --guesses all    # every answer x allowed guess (30M pairs)
+    python tests/equiv_solver.py --answers 50 --states 500   # quick smoke run
+
+static/data/test-vectors.json only samples a few hundred cases; this walks
+the whole feedback space. The answers are split into chunks of rows, and
+each worker process keeps one tests/equiv_solver.mjs Node process fed with
+chunk requests. Both sides produce the same bytes - one base-3 pattern code
+per (answer, guess) from solver_ref's packed feedback core and from
+solver.js feedback() - and a chunk whose bytes agree costs one comparison.
+
+Games are random 1-4 row states (seeded, guesses from the answers or the
+full allowed list, so plenty of duplicate letters) over either pool; each
+side reports the survivor set as a bitmap plus the top three heuristic
+picks. Games are generated inside the workers from (seed, chunk), so memory
+stays bounded by the chunk size however many are requested.
+
+Only mismatches are printed (at most --max-report); the exit status is
+nonzero if there were any.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import struct
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from packed import PATTERN_MARKS, feedback_code, word_code
+from solver_ref import (ANSWER_WORDS, EXTENDED_WORDS, WordleState, find_valid_words,
+                         load_freq, rank_suggestions)
+
+JS_RUNNER = os.path.join(PROJECT_ROOT, "tests", "equiv_solver.mjs")
+ALL_WORDS = ANSWER_WORDS + EXTENDED_WORDS
+GUESSES = {"answers": ANSWER_WORDS, "all": ALL_WORDS}
+POOLS = {"answers": ANSWER_WORDS, "both": ALL_WORDS}
+TOP = 3
+NONE = 0xFFFF
+
+_node = None
+_freq = _answer_set = _index = None
+
+
+def start_worker():
+    """Pool initializer: one Node process per worker, reused for every chunk."""
+    global _node, _freq, _answer_set, _index
+    _node = subprocess.Popen(["node", JS_RUNNER], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    _freq = load_freq()
+    _answer_set = set(ANSWER_WORDS)
+    _index = {pool: {w: i for i, w in enumerate(words)} for pool, words in POOLS.items()}
+
+
+def send(request):
+    """Queue a request; Node works on it while Python computes its side."""
+    _node.stdin.write(json.dumps(request).encode() + b"\n")
+    _node.stdin.flush()
+
+
+def receive():
+    head = _node.stdout.read(4)
+    if len(head) < 4:
+        raise RuntimeError(f"node worker exited (status {_node.wait()})")
+    return _node.stdout.read(struct.unpack("<I", head)[0])
+
+
+def feedback_chunk(job):
+    """(pairs checked, [mismatch, ...]) for answers[lo:hi] x every guess."""
+    lo, hi, guesses = job
+    send({"op": "feedback", "lo": lo, "hi": hi, "guesses": guesses})
+    gcodes = [word_code(g) for g in GUESSES[guesses]]
+    py = bytearray()
+    for a in ANSWER_WORDS[lo:hi]:
+        acode = word_code(a)
+        py += bytes([feedback_code(acode, g) for g in gcodes])
+    js = receive()
+    if js == py:
+        return len(py), []
+    n = len(gcodes)
+    return len(py), [f"feedback {ANSWER_WORDS[lo + k // n]}/{GUESSES[guesses][k % n]}: "
+                     f"py {PATTERN_MARKS[py[k]]} js {PATTERN_MARKS[js[k]] if k < len(js) else '?'}"
+                     for k in range(len(py)) if k >= len(js) or js[k] != py[k]]
+
+
+def random_games(seed, chunk, count):
+    """[(pool, [(guess index into ALL_WORDS, pattern code), ...]), ...]"""
+    rng = random.Random(f"{seed}/{chunk}")
+    games = []
+    for _ in range(count):
+        answer = word_code(rng.choice(ANSWER_WORDS))
+        source = len(ANSWER_WORDS) if rng.random() < 0.5 else len(ALL_WORDS)
+        rows = [(g, feedback_code(answer, word_code(ALL_WORDS[g])))
+                for g in (rng.randrange(source) for _ in range(rng.randint(1, 4)))]
+        games.append((rng.choice(("answers", "both")), rows))
+    return games
+
+
+def state_result(pool, rows):
+    """The bytes equiv_solver.mjs reports for one game: survivor bitmap + top picks."""
+    words, index = POOLS[pool], _index[pool]
+    st = WordleState()
+    for g, code in rows:
+        st.update_state("".join(l + m for l, m in zip(ALL_WORDS[g], PATTERN_MARKS[code])))
+    cands = find_valid_words(words, st)
+    bitmap = bytearray((len(words) + 7) >> 3)
+    for w in cands:
+        i = index[w]
+        bitmap[i >> 3] |= 1 << (i & 7)
+    top = [index[w] for w in rank_suggestions(cands, _answer_set, _freq)[:TOP]]
+    return bytes(bitmap) + struct.pack(f"<{TOP}H", *(top + [NONE] * (TOP - len(top))))
+
+
+def states_chunk(job):
+    """(games checked, [mismatch, ...]) for one seeded chunk of random games."""
+    seed, chunk, count = job
+    games = random_games(seed, chunk, count)
+    by_pool = {pool: [rows for p, rows in games if p == pool] for pool in POOLS}
+    by_pool = {pool: picked for pool, picked in by_pool.items() if picked}
+    for pool, picked in by_pool.items():
+        send({"op": "states", "pool": pool, "games": picked})
+    mismatches = []
+    for pool, picked in by_pool.items():
+        js = receive()
+        stride = len(js) // len(picked)
+        for n, rows in enumerate(picked):
+            want = state_result(pool, rows)
+            if js[n * stride:(n + 1) * stride] != want:
+                played = ",".join(f"{ALL_WORDS[g]}:{PATTERN_MARKS[c]}" for g, c in rows)
+                mismatches.append(f"game [{pool}] {played}: survivors/top picks differ")
+    return count, mismatches
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--guesses", choices=GUESSES, default="answers",
+                   help="guess side of the feedback sweep (default: answers)")
+    p.add_argument("--answers", type=int, help="only the first N answers (default: all)")
+    p.add_argument("--states", type=int, default=20000, help="random games to compare")
+    p.add_argument("--chunk", type=int, default=32, help="answers per feedback chunk")
+    p.add_argument("--state-chunk", type=int, default=250, help="games per states chunk")
+    p.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--max-report", type=int, default=50, help="mismatches to print")
+    args = p.parse_args()
+
+    n_answers = len(ANSWER_WORDS) if args.answers is None else min(args.answers, len(ANSWER_WORDS))
+    jobs = [(feedback_chunk, (lo, min(lo + args.chunk, n_answers), args.guesses))
+            for lo in range(0, n_answers, args.chunk)]
+    jobs += [(states_chunk, (args.seed, c, min(args.state_chunk, args.states - lo)))
+             for c, lo in enumerate(range(0, args.states, args.state_chunk))]
+
+    t0 = time.perf_counter()
+    pairs = games = failures = 0
+    with multiprocessing.Pool(args.workers, initializer=start_worker) as pool:
+        for fn, (checked, mismatches) in pool.imap_unordered(run_job, jobs):
+            if fn is feedback_chunk:
+                pairs += checked
+            else:
+                games += checked
+            for m in mismatches:
+                if failures < args.max_report:
+                    print(m)
+                failures += 1
+    spent = time.perf_counter() - t0
+    print(f"{pairs} feedback pairs, {games} games in {spent:.1f}s on {args.workers} workers: "
+          + (f"{failures} MISMATCHES" if failures else "ALL MATCH"))
+    sys.exit(1 if failures else 0)
+
+
+def run_job(job):
+    fn, arg = job
+    return fn, fn(arg)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ import { readFileSync } from 'node:fs';
 import { fileURLToPath } from 'node:url';
 import { dirname, join } from 'node:path';
 import * as S from '../static/js/solver.js';
+import { decodeBundle } from '../static/js/bundle.js';
+import { analyzeGame } from '../static/js/analysis.js';
 
 const here = dirname(fileURLToPath(import.meta.url));
 const read = p => JSON.parse(readFileSync(join(here, '..', p), 'utf8'));
@@ -34,6 +36,38 @@ for (const [gi, g] of V.games.entries()) {
     ? pass++ : fails.push(`game ${gi}: count ${cands.length}/${g.count} top ${top}/${g.top}`);
 }
 
+// The memoized ranker must return exactly rankSuggestions' results.
+const ranks = S.makeRankCache(answerSet, FREQ, 4);
+for (const g of V.games.slice(0, 12)) {
+  const pool = g.list === 'both' ? ANSWERS.concat(EXTENDED) : ANSWERS;
+  const cands = S.filterWords(pool, S.stateFromRows(g.rows));
+  const want = S.rankSuggestions(cands, answerSet, FREQ);
+  if (!eq(ranks.rank(cands), want) || !eq(ranks.rank(cands, 3), want.slice(0, 3)))
+    fails.push(`rank cache differs for game ${g.rows.map(r => r.word).join(',')}`);
+}
+if (ranks.hits !== 12 || ranks.misses !== 12) fails.push(`rank cache ${ranks.hits} hits / ${ranks.misses} misses`);
+
+// The replay's per-guess counts must match filtering the full pool, also
+// for contradictory rows (a second green in the same spot, a raised max count).
+const contradictory = [
+  { list: 'answers', rows: [{ word: 'crane', marks: '+----' }, { word: 'slate', marks: '+----' }] },
+  { list: 'answers', rows: [{ word: 'there', marks: '--*--' }, { word: 'eerie', marks: '+*---' }] },
+];
+for (const g of [...V.games.slice(0, 12), ...contradictory]) {
+  const pool = g.list === 'both' ? ANSWERS.concat(EXTENDED) : ANSWERS;
+  const { perGuess } = analyzeGame({ rows: g.rows, pool, answerSet, freq: FREQ, rank: () => [] });
+  const want = g.rows.map((_, i) => S.filterWords(pool, S.stateFromRows(g.rows.slice(0, i + 1))).length);
+  eq(perGuess.map(t => t.after), want)
+    ? pass++ : fails.push(`analyzeGame ${g.rows.map(r => r.word).join(',')}: ${perGuess.map(t => t.after)} != ${want}`);
+}
+
+// The compact bundle must decode to exactly the four JSON files.
+const bundle = decodeBundle(readFileSync(join(here, '..', 'static/data/bundle.bin')));
+const expected = { answers: ANSWERS, extended: EXTENDED, freq: FREQ,
+  pastAnswers: read('static/data/past-answers.json') };
+for (const k of Object.keys(expected))
+  if (!eq(bundle[k], expected[k])) fails.push(`bundle.bin ${k} differs from the JSON file`);
+
 if (fails.length) {
   for (const f of fails) console.error(f);
   console.error(`${fails.length} FAILED (${pass} passed)`);
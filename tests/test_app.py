@@ -0,0 +1,279 @@
+import os, sys, random
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+import app as app_module
+from solver_ref import (WordleState, find_valid_words, feedback, rank_suggestions,
+                         state_from_rows, ANSWER_WORDS, EXTENDED_WORDS)
+
+client = app_module.app.test_client()
+app_module.READY.wait(120)  # the tests below expect the warm, cached paths
+ok = True
+
+
+def solve(rows, **extra):
+    return client.post("/api/solve", json={"rows": rows, **extra})
+
+
+def rows_for(answer, guesses):
+    return [{"word": g, "marks": feedback(answer, g)[1::2]} for g in guesses]
+
+
+def test_index_serves_page():
+    r = client.get("/")
+    assert r.status_code == 200 and b"<html" in r.data
+
+
+def test_solve_matches_reference():
+    rng = random.Random(5)
+    for trial in range(40):
+        answer = rng.choice(ANSWER_WORDS)
+        guesses = rng.sample(ANSWER_WORDS, rng.randint(0, 3))
+        pool_name = "both" if trial % 3 == 0 else "answers"
+        pool = ANSWER_WORDS + EXTENDED_WORDS if pool_name == "both" else ANSWER_WORDS
+        st = WordleState()
+        for g in guesses:
+            st.update_state(feedback(answer, g))
+        cands = find_valid_words(pool, st)
+        r = solve(rows_for(answer, guesses), list=pool_name, top=5)
+        assert r.status_code == 200, r.get_json()
+        body = r.get_json()
+        assert body["count"] == len(cands)
+        assert body["top"] == rank_suggestions(cands, set(ANSWER_WORDS), app_module.FREQ)[:5]
+
+
+def test_solve_inconsistent_rows_match_reference():
+    # 'a' ruled out, then green: the warm (indexed, cached) path must agree
+    # with the reference filter and with the cold uncached path.
+    rows = [{"word": "abcde", "marks": "-----"}, {"word": "axyzw", "marks": "+----"}]
+    st = state_from_rows(rows)
+    assert app_module.READY.is_set()
+    for l, pool in (("answers", ANSWER_WORDS), ("both", ANSWER_WORDS + EXTENDED_WORDS)):
+        body = solve(rows, list=l).get_json()
+        cands = find_valid_words(pool, st)
+        assert body["count"] == len(cands) == app_module.solve_uncached(l, st)[0]
+        assert body["top"] == rank_suggestions(cands, set(ANSWER_WORDS), app_module.FREQ)[:10]
+        assert body["next"] == (body["top"][0] if body["top"] else None)
+
+
+def test_solve_cache_shared_across_guess_orders():
+    app_module.solve_signature.cache_clear()
+    a = solve(rows_for("medal", ["crane", "pilot"])).get_json()
+    b = solve(rows_for("medal", ["pilot", "crane"])).get_json()
+    info = app_module.solve_signature.cache_info()
+    assert a == b
+    assert info.misses == 1 and info.hits == 1
+
+
+def test_solve_next_follows_opener_tree():
+    from solver_ref import suggest_word
+    body = solve([]).get_json()
+    assert body["next"] == suggest_word(ANSWER_WORDS)
+    rows = rows_for("medal", [body["next"]])
+    body = solve(rows).get_json()
+    assert body["next"] == body["top"][0]
+    assert solve(rows_for("medal", ["zonal"]), list="both").get_json()["next"] is not None
+
+
+def test_solve_rejects_bad_input():
+    assert client.post("/api/solve", data="nope").status_code == 400
+    assert solve([{"word": "crane", "marks": "--x--"}]).status_code == 400
+    assert solve([{"word": "cran", "marks": "-----"}]).status_code == 400
+    assert solve([], list="everything").status_code == 400
+    assert solve([], top=0).status_code == 400
+
+
+def test_hashed_data_precompressed_and_cached():
+    import gzip, json, tempfile, pathlib, brotli
+    import assets
+    src = pathlib.Path(assets.DATA_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = assets.build(out=tmp)
+        saved, app_module.ASSETS = app_module.ASSETS, assets.load_assets(tmp)
+        try:
+            page = client.get("/").get_data(as_text=True)
+            name = manifest["answers.json"]["file"]
+            assert f'"/data/{name}"' in page and "data-urls" in page
+            raw = (src / "answers.json").read_bytes()
+            decode = {"br": brotli.decompress, "gzip": gzip.decompress, None: lambda b: b}
+            for accept, enc in [("gzip, deflate, br", "br"), ("gzip", "gzip"), ("", None),
+                                ("br;q=0, gzip", "gzip")]:
+                r = client.get(f"/data/{name}", headers={"Accept-Encoding": accept})
+                assert r.status_code == 200 and r.headers.get("Content-Encoding") == enc, (accept, r.headers)
+                assert decode[enc](r.data) == raw
+                assert "immutable" in r.headers["Cache-Control"] and "Accept-Encoding" in r.headers["Vary"]
+                again = client.get(f"/data/{name}", headers={"Accept-Encoding": accept,
+                                                             "If-None-Match": r.headers["ETag"]})
+                assert again.status_code == 304 and not again.data
+            assert client.get("/data/answers.json").status_code == 404
+            # A manifest entry whose source changed since the build is dropped.
+            stale = json.loads((pathlib.Path(tmp) / "manifest.json").read_text())
+            stale["answers.json"]["sha256"] = "0" * 64
+            (pathlib.Path(tmp) / "manifest.json").write_text(json.dumps(stale))
+            app_module.ASSETS = assets.load_assets(tmp)
+            assert client.get(f"/data/{name}").status_code == 404
+            assert '"/static/data/answers.json"' in client.get("/").get_data(as_text=True)
+        finally:
+            app_module.ASSETS = saved
+
+
+def test_analyze_scores_every_guess():
+    import time
+    import numpy as np
+    from ranking import score_guesses
+    from patterns import GUESS_WORDS
+    guesses = ["crane", "pilot", "dumpy", "medal"]
+    t = time.perf_counter()
+    body = client.post("/api/analyze", json={"rows": rows_for("medal", guesses)}).get_json()
+    assert time.perf_counter() - t < 1.0
+    turns = body["perGuess"]
+    assert [t["word"] for t in turns] == guesses and body["summary"]["won"]
+    st = WordleState()
+    for turn, g in zip(turns, guesses):
+        cands = find_valid_words(ANSWER_WORDS, st)
+        ent, expected = score_guesses(cands)
+        mine = expected[GUESS_WORDS.index(g)]
+        assert turn["before"] == len(cands) and abs(turn["expected"] - mine) < 1e-3
+        assert abs(turn["percentile"] - 100 * np.mean(expected >= mine - 1e-9)) < 0.1
+        assert abs(turn["bestExpected"] - expected.min()) < 1e-3
+        st.update_state(feedback("medal", g))
+        assert turn["after"] == len(find_valid_words(ANSWER_WORDS, st))
+        assert abs(turn["cutBits"] - (turn["skillBits"] + turn["luckBits"])) < 2e-3
+    assert turns[-1]["after"] == 1 and turns[-1]["percentile"] == 100.0
+    assert client.post("/api/analyze", json={"rows": [{"word": "crane"}]}).status_code == 400
+
+
+def test_analyze_combined_list_starts_warm():
+    import time
+    import analysis
+    from rankcache import fingerprint
+    from wordindex import pool_index
+    opening = ("both", fingerprint(analysis.CandidateSet(pool_index("both")).survivors))
+    assert (opening, len(analysis.ALL_GUESSES)) in analysis._scores
+    # jiffy leaves ~7k candidates: that turn scores a shortlist, not every guess.
+    for answer, guesses in [("zonal", ["adieu", "story", "zonal"]), ("tryst", ["slate", "pudgy", "tryst"]),
+                            ("medal", ["jiffy", "crane", "medal"])]:
+        t = time.perf_counter()
+        body = client.post("/api/analyze", json={"rows": rows_for(answer, guesses), "list": "both"}).get_json()
+        assert time.perf_counter() - t < 1.0, (answer, time.perf_counter() - t)
+        turns = body["perGuess"]
+        assert body["summary"]["won"] and turns[0]["before"] == len(ANSWER_WORDS + EXTENDED_WORDS)
+        n = len(analysis.ALL_GUESSES)
+        assert [t["scored"] for t in turns] == [n] + [min(n, analysis.MAX_TURN_CELLS // t["before"])
+                                                       for t in turns[1:]]
+    assert turns[1]["scored"] < n
+
+
+def test_analyze_and_solve_agree_on_contradictory_rows():
+    # A second green in one spot loosens the state; both endpoints must
+    # still count what find_valid_words finds.
+    rows = [{"word": "crane", "marks": "+----"}, {"word": "slate", "marks": "+----"}]
+    for l, pool in (("answers", ANSWER_WORDS), ("both", ANSWER_WORDS + EXTENDED_WORDS)):
+        count = solve(rows, list=l).get_json()["count"]
+        body = client.post("/api/analyze", json={"rows": rows, "list": l}).get_json()
+        assert body["perGuess"][-1]["after"] == count == len(find_valid_words(pool, state_from_rows(rows))) > 0
+
+
+def test_metrics_and_profile_switch():
+    import tempfile, pstats
+    solve([{"word": "crane", "marks": "-*---"}])
+    solve([{"word": "crane", "marks": "-*---"}])
+    r = client.get("/metrics")
+    assert r.status_code == 200 and r.mimetype == "text/plain"
+    text = r.get_data(as_text=True)
+    assert 'wosolve_request_seconds_bucket{method="POST",route="/api/solve",le="+Inf"}' in text
+    hits = [l for l in text.splitlines() if l.startswith('wosolve_cache_hits_total{cache="solve"}')]
+    assert hits and float(hits[0].split()[-1]) >= 1
+    assert 'wosolve_cache_hit_ratio{cache="rank"}' in text
+    assert "X-Profile-Dump" not in solve([]).headers
+    with tempfile.TemporaryDirectory() as tmp:
+        app_module.PROFILE_DIR = tmp
+        try:
+            r = client.post("/api/solve?profile=1", json={"rows": []})
+            plain = solve([])
+        finally:
+            app_module.PROFILE_DIR = None
+        assert r.status_code == 200 and "X-Profile-Dump" not in plain.headers
+        stats = pstats.Stats(os.path.join(tmp, r.headers["X-Profile-Dump"]))
+        assert any(fn == "api_solve" for _, _, fn in stats.stats)
+
+
+def test_warmup_readiness_and_fallback():
+    assert client.get("/healthz").get_json() == {"status": "ok"}
+    r = client.get("/readyz")
+    assert r.status_code == 200 and r.get_json()["ready"]
+    assert {n for n, _ in app_module.WARMUP_STAGES} == set(r.get_json()["stages"])
+    assert 'wosolve_warmup_stage_seconds{stage="opening analysis"}' in client.get("/metrics").get_data(as_text=True)
+    rows = rows_for("tryst", ["crane", "moist"])
+    warm = {l: solve(rows, list=l).get_json() for l in ("answers", "both")}
+    app_module.READY.clear()
+    try:
+        assert client.get("/readyz").status_code == 503
+        assert client.get("/healthz").status_code == 200
+        before = app_module.solve_signature.cache_info()
+        for l in ("answers", "both"):
+            assert solve(rows, list=l).get_json() == warm[l]
+        assert solve([], top=50).get_json()["top"] == list(app_module.solve_uncached("answers", WordleState())[1])
+        assert app_module.solve_signature.cache_info() == before
+    finally:
+        app_module.READY.set()
+
+
+def test_gunicorn_preload_warms_workers_only():
+    # The master runs only the shared stages before forking; each worker then
+    # runs the rest once (started by gunicorn.conf.py's post_fork hook).
+    import re, socket, subprocess, tempfile, time
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with tempfile.TemporaryFile("w+") as out:
+        proc = subprocess.Popen(["gunicorn", "app:app", "--preload", "--workers", "2",
+                                 "--bind", f"127.0.0.1:{port}"], cwd=PROJECT_ROOT,
+                                stdout=out, stderr=subprocess.STDOUT)
+        try:
+            deadline = time.monotonic() + 120
+            while time.monotonic() < deadline:
+                out.seek(0)
+                log = out.read()
+                if log.count("warm-up: ready") == 2 or proc.poll() is not None:
+                    break
+                time.sleep(0.5)
+        finally:
+            proc.terminate()
+            proc.wait()
+    stages = re.findall(r"\[(\d+)\] \[INFO\] warm-up: (.+) took", log)
+    shared = {n for n, _ in app_module.SHARED_STAGES}
+    by_pid = {}
+    for pid, name in stages:
+        by_pid.setdefault(pid, []).append(name)
+    assert log.count("warm-up: ready") == 2 and len(by_pid) == 3, log
+    names = [n for n, _ in app_module.WARMUP_STAGES]
+    assert sorted(by_pid.values()) == sorted([names[:len(shared)]] + [names[len(shared):]] * 2), by_pid
+
+
+named_tests = [
+    ("test_index_serves_page", test_index_serves_page),
+    ("test_solve_matches_reference", test_solve_matches_reference),
+    ("test_solve_inconsistent_rows_match_reference", test_solve_inconsistent_rows_match_reference),
+    ("test_solve_cache_shared_across_guess_orders", test_solve_cache_shared_across_guess_orders),
+    ("test_solve_next_follows_opener_tree", test_solve_next_follows_opener_tree),
+    ("test_solve_rejects_bad_input", test_solve_rejects_bad_input),
+    ("test_hashed_data_precompressed_and_cached", test_hashed_data_precompressed_and_cached),
+    ("test_analyze_scores_every_guess", test_analyze_scores_every_guess),
+    ("test_analyze_combined_list_starts_warm", test_analyze_combined_list_starts_warm),
+    ("test_analyze_and_solve_agree_on_contradictory_rows", test_analyze_and_solve_agree_on_contradictory_rows),
+    ("test_metrics_and_profile_switch", test_metrics_and_profile_switch),
+    ("test_warmup_readiness_and_fallback", test_warmup_readiness_and_fallback),
+    ("test_gunicorn_preload_warms_workers_only", test_gunicorn_preload_warms_workers_only),
+]
+
+for n, (name, fn) in enumerate(named_tests, 1):
+    try:
+        fn()
+        print(f"{n}. {name}: PASS")
+    except AssertionError as e:
+        print(f"{n}. {name}: FAIL - {e}")
+        ok = False
+
+print("\nALL PASS" if ok else "\nFAILURES PRESENT")
+sys.exit(0 if ok else 1)
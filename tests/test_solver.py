@@ -1,8 +1,6 @@
 import os, sys, random, subprocess, pathlib
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-os.chdir(PROJECT_ROOT)  # solver_ref.py opens the word lists via relative paths
-
 sys.path.insert(0, PROJECT_ROOT)
 from solver_ref import (WordleState, find_valid_words, feedback, rank_suggestions,
                          suggest_word, ANSWER_WORDS, EXTENDED_WORDS)
@@ -119,6 +117,287 @@ def test_rank_suggestions_freq_none_matches_empty():
     ans = {"aback", "zonal"}
     assert rank_suggestions(cands, ans) == rank_suggestions(cands, ans, None) == rank_suggestions(cands, ans, {})
 
+def test_feedback_many_matches_feedback():
+    from patterns import feedback_many, compute_patterns, letter_codes, pattern_marks, pattern_code
+    rng = random.Random(11)
+    pairs = [("medal", "salsa"), ("crest", "geese"), ("melee", "geese"), ("early", "eerie")]
+    pairs += [(rng.choice(ANSWER_WORDS), rng.choice(ANSWER_WORDS + EXTENDED_WORDS)) for _ in range(2000)]
+    for answer, guess in pairs:
+        enc = feedback(answer, guess)
+        assert pattern_marks(feedback_many(guess, [answer])[0]) == enc[1::2], (answer, guess)
+        assert pattern_code(enc) == feedback_many(guess, [answer])[0]
+    answers = [a for a, _ in pairs]
+    for guess in ("salsa", "geese", "eerie", "aahed"):
+        direct = compute_patterns(letter_codes([guess]), letter_codes(answers))[0]
+        assert list(direct) == list(feedback_many(guess, answers))
+        assert [pattern_marks(c) for c in direct] == [feedback(a, guess)[1::2] for a in answers]
+
+def test_rank_entropy_matches_bruteforce():
+    import math
+    from collections import Counter
+    st = WordleState(); st.update_state(feedback("medal", "crane"))
+    cands = find_valid_words(ANSWER_WORDS, st)
+    guesses = ["tepal", "salsa", "crane", "eerie", "plead", "ample"]
+    def brute(g, key):
+        sizes = Counter(feedback(a, g) for a in cands).values()
+        n = len(cands)
+        if key == "entropy":
+            return -round(-sum(v / n * math.log2(v / n) for v in sizes), 9)
+        return sum(v * v for v in sizes)
+    for mode in ("entropy", "expected"):
+        ranked = rank_suggestions(cands, set(ANSWER_WORDS), None, mode=mode, guesses=guesses)
+        assert sorted(ranked) == sorted(guesses)
+        scores = [brute(g, mode) for g in ranked]
+        assert scores == sorted(scores), (mode, ranked, scores)
+
+def test_rank_entropy_ties_use_candidates_then_tier():
+    # Every guess splits {aback, zonal} into two singletons: a pure tie on
+    # information, so candidates go first, then tier, then alphabetical.
+    cands = ["aback", "zonal"]
+    ranked = rank_suggestions(cands, set(cands), {"zonal": 2, "aback": 9},
+                              mode="entropy", guesses=["abbey", "zonal", "aback"])
+    assert ranked == ["zonal", "aback", "abbey"]
+
+def test_word_index_matches_find_valid_words():
+    from wordindex import ANSWERS, COMBINED
+    rng = random.Random(42)
+    for trial in range(300):
+        answer = rng.choice(ANSWER_WORDS)
+        state = WordleState()
+        for g in rng.sample(ANSWER_WORDS, rng.randint(0, 4)):
+            state.update_state(feedback(answer, g))
+            assert ANSWERS.find_valid_words(state) == find_valid_words(ANSWER_WORDS, state)
+            assert COMBINED.find_valid_words(state) == find_valid_words(ANSWER_WORDS + EXTENDED_WORDS, state)
+    for answer, guess in [("medal", "salsa"), ("crest", "geese"), ("melee", "geese")]:
+        state = WordleState(); state.update_state(feedback(answer, guess))
+        assert COMBINED.find_valid_words(state) == find_valid_words(ANSWER_WORDS + EXTENDED_WORDS, state)
+    # Contradictory rows: 'a' excluded, then green.
+    state = WordleState(); state.update_state("a-b-c-d-e-"); state.update_state("a+x-y-z-w-")
+    assert ANSWERS.find_valid_words(state) == find_valid_words(ANSWER_WORDS, state) == []
+    assert COMBINED.find_valid_words(state) == find_valid_words(ANSWER_WORDS + EXTENDED_WORDS, state)
+
+def test_candidate_set_push_undo_remove():
+    from wordindex import COMBINED, CandidateSet
+    pool = ANSWER_WORDS + EXTENDED_WORDS
+    def expect(rows):
+        st = WordleState()
+        for r in rows:
+            st.update_state(r)
+        return find_valid_words(pool, st)
+    rows = [feedback("medal", g) for g in ("crane", "salsa", "pilot", "dummy")]
+    cs = CandidateSet(COMBINED)
+    for i, r in enumerate(rows):
+        cs.push(r)
+        assert cs.words() == expect(rows[:i + 1])
+    cs.undo()
+    assert cs.words() == expect(rows[:3]) and len(cs) == len(expect(rows[:3]))
+    cs.remove_row(0)
+    assert cs.rows == rows[1:3] and cs.words() == expect(rows[1:3])
+    cs.remove_row(1)
+    assert cs.words() == expect(rows[1:2])
+    cs.undo(); cs.undo()
+    assert len(cs) == len(pool) and cs.rows == []
+    for bad in (-1, 0):
+        try:
+            cs.remove_row(bad)
+            assert False, f"remove_row({bad}) on no rows"
+        except IndexError:
+            pass
+    cs.push(rows[0])
+    for bad in (-1, 1):
+        try:
+            cs.remove_row(bad)
+            assert False, f"remove_row({bad}) on one row"
+        except IndexError:
+            pass
+    assert cs.rows == rows[:1] and cs.words() == expect(rows[:1])
+    # Contradictory rows can loosen the state (a second green in one spot, a
+    # raised max count); those pushes must still match the reference.
+    for game in (["c+r-a-n-e-", "s+l-a-t-e-"], ["t-h-e*r-e-", "e+e*r-i-e-"]):
+        cs = CandidateSet(COMBINED, game)
+        assert cs.words() == expect(game) and len(cs) > 0, game
+        cs.remove_row(0)
+        assert cs.words() == expect(game[1:])
+
+def test_packed_core_matches_string_reference():
+    import packed
+    from packed import PackedWords, pack, unpack, feedback_code, compile_constraints
+    from patterns import pattern_code
+    def slow_feedback(answer, guess):
+        marks, remaining = [None] * 5, {}
+        for i in range(5):
+            if guess[i] == answer[i]:
+                marks[i] = '+'
+            else:
+                remaining[answer[i]] = remaining.get(answer[i], 0) + 1
+        for i in range(5):
+            if marks[i] is None:
+                marks[i] = '*' if remaining.get(guess[i], 0) > 0 else '-'
+                if marks[i] == '*':
+                    remaining[guess[i]] -= 1
+        return ''.join(guess[i] + marks[i] for i in range(5))
+    def slow_valid(st, w):
+        return (not any(l in w for l in st.excluded_chars)
+                and all(w.count(l) >= c for l, c in st.letter_counts.items())
+                and all(w.count(l) <= c for l, c in st.max_counts.items())
+                and all(g == ' ' or w[i] == g for i, g in enumerate(st.green_chars))
+                and all(w[i] not in bad for i, bad in enumerate(st.yellow_chars)))
+    pool = ANSWER_WORDS + EXTENDED_WORDS
+    pw = PackedWords(pool)
+    assert pw.words(range(100)) == pool[:100] and unpack(pack("abbey")) == "abbey"
+    assert pw.nbytes * 2 < sum(sys.getsizeof(w) + 8 for w in pool)
+    rng = random.Random(11)
+    pairs = [("melee", "geese"), ("medal", "salsa"), ("abbey", "babes"), ("crest", "geese")]
+    pairs += [(rng.choice(ANSWER_WORDS), rng.choice(pool)) for _ in range(3000)]
+    for a, g in pairs:
+        assert feedback(a, g) == slow_feedback(a, g), (a, g)
+        assert feedback_code(pack(a), pack(g)) == pattern_code(slow_feedback(a, g))
+    for trial in range(150):
+        answer = rng.choice(ANSWER_WORDS)
+        state = WordleState()
+        for g in rng.sample(pool, rng.randint(0, 3)):
+            state.update_state(slow_feedback(answer, g))
+        expect = [w for w in pool if slow_valid(state, w)]
+        assert find_valid_words(pool, state) == expect
+        assert pw.words(pw.survivors(compile_constraints(*state.compile()))) == expect
+    # Only the word lists are packed up front, as arrays; other strings are
+    # packed per call and read the same.
+    assert packed._known.nbytes == 24 * len(pool) and len(packed._rows) == len(pool)
+    assert packed.word_info("geese")[:4] == (pack("geese"), sum(1 << ord(c) - 97 for c in "ges"),
+                                             *packed.counts_of("geese"))
+    assert feedback("qqzzx", "xzzqq") == slow_feedback("qqzzx", "xzzqq")
+    assert find_valid_words(["qqzzx", "crane"], WordleState()) == ["qqzzx", "crane"]
+    assert len(packed._rows) == len(pool)
+
+def test_multiboard_joint_scores_and_solves():
+    import numpy as np
+    from multiboard import MultiBoard
+    from ranking import score_guesses
+    answers = ["heard", "mocha", "cluck", "royal"]
+    mb = MultiBoard(4)
+    ent, exp = mb.score(ANSWER_WORDS[:50])
+    single = score_guesses(ANSWER_WORDS, ANSWER_WORDS[:50])
+    assert np.allclose(ent, 4 * single[0]) and np.allclose(exp, 4 * single[1])
+    turns = 0
+    while not mb.done and turns < 12:
+        guess = mb.next_guess(guesses=ANSWER_WORDS)
+        mb.push(guess, [feedback(a, guess)[1::2] for a in answers])
+        turns += 1
+        for b, a in enumerate(answers):
+            assert mb.solved[b] or a in mb.boards[b].words()
+        if len(mb.active) > 1:
+            ent, exp = mb.score(ANSWER_WORDS[:50])
+            parts = [score_guesses(c, ANSWER_WORDS[:50]) for c in mb.candidates().values()]
+            assert np.allclose(ent, sum(p[0] for p in parts))
+            assert np.allclose(exp, sum(p[1] for p in parts))
+    assert mb.done and mb.next_guess() is None
+    assert [g for g, _, _ in mb.guesses][-1] in answers
+    mb.undo()
+    assert not mb.done and len(mb.active) == 1
+    try:
+        mb.push("crane", ["-----"])
+        assert False, "wrong number of boards accepted"
+    except ValueError:
+        pass
+
+def test_rank_cache_memoizes_by_candidate_set():
+    from rankcache import RankCache, fingerprint
+    import numpy as np
+    answer_set = set(ANSWER_WORDS)
+    cache = RankCache(answer_set, maxsize=2)
+    sets = []
+    for guesses in (["crane"], ["salsa"], ["pilot", "crane"]):
+        st = WordleState()
+        for g in guesses:
+            st.update_state(feedback("medal", g))
+        sets.append(find_valid_words(ANSWER_WORDS, st))
+    for cands in sets[:2]:
+        assert cache.rank(cands) == rank_suggestions(cands, answer_set)
+    assert cache.rank(list(sets[0]), top=3) == rank_suggestions(sets[0], answer_set)[:3]
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.rank(sets[2])          # evicts sets[1], the least recently used
+    cache.rank(sets[0])
+    assert (cache.hits, cache.misses) == (2, 3)
+    cache.rank(sets[1])
+    assert cache.info() == {"hits": 2, "misses": 4, "size": 2, "maxsize": 2}
+    assert cache.rank(sets[0][:5], mode="entropy", guesses=ANSWER_WORDS[:40]) == \
+        rank_suggestions(sets[0][:5], answer_set, mode="entropy", guesses=ANSWER_WORDS[:40])
+    assert fingerprint(np.arange(5)) != fingerprint(np.arange(6))
+    assert fingerprint(["crane", "medal"]) != fingerprint(["medal", "crane"])
+
+def test_batch_solve_streams_in_order():
+    import io, json
+    from batch_solve import run
+    from solver_ref import load_freq, state_from_rows
+    rng = random.Random(3)
+    lines, expected = [], []
+    for i in range(60):
+        answer = rng.choice(ANSWER_WORDS)
+        guesses = rng.sample(ANSWER_WORDS, rng.randint(0, 3))
+        st = WordleState()
+        for g in guesses:
+            st.update_state(feedback(answer, g))
+        lines.append(" ".join(feedback(answer, g) for g in guesses) + "\n")
+        expected.append(len(find_valid_words(ANSWER_WORDS, st)))
+    lines.append('{"id": "x", "rows": [{"word": "crane", "marks": "-*---"}]}\n')
+    lines.append("not-a-game\n")
+    outs = []
+    for workers in (1, 2):
+        buf = io.StringIO()
+        run(lines, buf, top=3, workers=workers, chunk=7)
+        outs.append([json.loads(l) for l in buf.getvalue().splitlines()])
+    assert outs[0] == outs[1]
+    assert [o["count"] for o in outs[0][:60]] == expected
+    assert outs[0][60]["id"] == "x" and len(outs[0][60]["top"]) == 3
+    assert "error" in outs[0][61]
+    # Every rank_suggestions mode is offered, minimax included.
+    buf = io.StringIO()
+    run(lines[:2], buf, top=3, mode="minimax", workers=1)
+    for line, out in zip(lines[:2], buf.getvalue().splitlines()):
+        st = state_from_rows([{"word": e[::2], "marks": e[1::2]} for e in line.split()])
+        cands = find_valid_words(ANSWER_WORDS, st)
+        assert json.loads(out)["top"] == rank_suggestions(cands, set(ANSWER_WORDS), load_freq(), mode="minimax")[:3]
+    r = subprocess.run([sys.executable, "-m", "batch_solve", "--help"], cwd=PROJECT_ROOT,
+                       capture_output=True, text=True)
+    assert "minimax" in r.stdout
+
+def test_decision_tree_matches_live_ranking():
+    from decision_tree import next_guess, live_guess
+    from solver_ref import load_freq
+    freq = load_freq()
+    assert next_guess([], freq) == suggest_word(ANSWER_WORDS)
+    rng = random.Random(9)
+    for answer in rng.sample(ANSWER_WORDS, 150):
+        rows = []
+        while True:
+            guess = next_guess(rows, freq)
+            if rows:   # past the opener the tree must agree with live ranking
+                assert guess == live_guess(rows, freq), (answer, rows)
+            rows.append({"word": guess, "marks": feedback(answer, guess)[1::2]})
+            if guess == answer:
+                break
+            assert len(rows) <= 12
+        assert next_guess(rows, freq) is None
+    # off-tree rows fall back to live ranking
+    rows = [{"word": "zonal", "marks": feedback("medal", "zonal")[1::2]}]
+    st = WordleState(); st.update_state(feedback("medal", "zonal"))
+    assert next_guess(rows, freq) == rank_suggestions(find_valid_words(ANSWER_WORDS, st), set(ANSWER_WORDS), freq)[0]
+
+def test_evaluate_strategies_parallel_and_pluggable():
+    from evaluate import evaluate
+    answers = ANSWER_WORDS[:40]
+    serial = evaluate(["rank", "solver_ref:rank_suggestions"], ["answers"], answers, workers=1, chunk=7)
+    parallel = evaluate(["rank", "tree"], ["answers", "both"], answers, workers=2, chunk=7)
+    assert serial[("rank", "answers")] == parallel[("rank", "answers")]
+    assert serial[("rank", "answers")] == serial[("solver_ref:rank_suggestions", "answers")]
+    assert ("tree", "both") not in parallel    # the tree only covers the answers list
+    r = parallel[("rank", "both")]
+    assert r["games"] == 40 and sum(r["distribution"].values()) + r["failures"] == 40
+    assert r["worst"][0]["guesses"][-1] == r["worst"][0]["answer"]
+    r = subprocess.run([sys.executable, "-m", "evaluate", "--help"], cwd=PROJECT_ROOT,
+                       capture_output=True, text=True)
+    assert "minimax" in r.stdout
+
 def test_rank_deterministic():
     cands = ["medal", "decal"]
     assert rank_suggestions(cands, set(cands)) == rank_suggestions(list(reversed(cands)), set(cands))
@@ -126,15 +405,269 @@ def test_rank_deterministic():
 # 5: generated static vectors must be reproducible from the current solver_ref.py
 def test_generated_files_fresh():
     ROOT = pathlib.Path(PROJECT_ROOT)
-    vectors_path = ROOT / "static/data/test-vectors.json"
-    before = vectors_path.read_bytes()
+    for script, outs in [("gen_wordlists.py", ["static/data/answers.json", "static/data/extended.json",
+                                               "words/wordlists.bin"]),
+                         ("gen_test_vectors.py", ["static/data/test-vectors.json"]),
+                         ("gen_decision_tree.py", ["static/data/decision-tree.json"]),
+                         ("gen_bundle.py", ["static/data/bundle.bin"])]:
+        paths = [ROOT / out for out in outs]
+        before = [p.read_bytes() for p in paths]
+        try:
+            subprocess.run([sys.executable, str(ROOT / "scripts" / script)], check=True,
+                           stdout=subprocess.DEVNULL)
+            after = [p.read_bytes() for p in paths]
+        finally:
+            for p, b in zip(paths, before):
+                p.write_bytes(b)
+        for out, b, a in zip(outs, before, after):
+            assert a == b, \
+                f"{out} changed - sources or solver_ref.py were modified; rerun scripts/{script} and re-verify static/tests.html"
+
+# 6: bundle.bin round-trips the JSON files it packs
+def test_bundle_decodes_to_json_files():
+    import json
+    from bundle import decode, encode
+    from datetime import date
+    data = pathlib.Path(PROJECT_ROOT, "static", "data")
+    raw = (data / "bundle.bin").read_bytes()
+    got = decode(raw)
+    for key, name in [("answers", "answers"), ("extended", "extended"), ("freq", "freq"),
+                      ("pastAnswers", "past-answers")]:
+        assert got[key] == json.loads((data / f"{name}.json").read_text()), key
+    assert list(got["pastAnswers"]["byDate"])[0] == "2021-06-19"
+    assert len(raw) * 3 < sum((data / f"{n}.json").stat().st_size
+                              for n in ("answers", "extended", "freq", "past-answers"))
+    past = {"meta": {"through": "2021-06-23"}, "byDate": {"2021-06-20": "abbey", "2021-06-23": "zonal"}}
+    small = decode(encode(["abbey", "abbot"], ["aback", "zonal"], {"abbey": 3, "zonal": 0}, past,
+                          date(2021, 6, 19)))
+    assert small == {"answers": ["abbey", "abbot"], "extended": ["aback", "zonal"],
+                     "freq": {"abbey": 3, "zonal": 0}, "pastAnswers": past}
     try:
-        subprocess.run([sys.executable, str(ROOT / "scripts/gen_test_vectors.py")], check=True)
-        after = vectors_path.read_bytes()
+        encode(["zonal", "abbey"], [], {}, {"meta": {}, "byDate": {}}, date(2021, 6, 19))
+        assert False, "unsorted list accepted"
+    except ValueError:
+        pass
+
+def test_metrics_opt_in():
+    import solver_ref
+    # Disabled (the default): the hot paths are the plain functions.
+    assert not hasattr(solver_ref.feedback, "__wrapped__")
+    assert not hasattr(solver_ref.find_valid_words, "__wrapped__")
+    script = """
+import metrics, solver_ref as s
+st = s.WordleState()
+st.update_state(s.feedback("crane", "slate"))
+c = s.find_valid_words(s.ANSWER_WORDS, st)
+s.rank_suggestions(c, set(s.ANSWER_WORDS))
+print(len(c))
+print(metrics.render())
+"""
+    out = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, check=True, text=True,
+                         capture_output=True, env={**os.environ, "WOSOLVE_METRICS": "1"}).stdout
+    n, text = out.split("\n", 1)
+    for fn in ("update_state", "feedback", "find_valid_words", "rank_suggestions"):
+        assert f'wosolve_solver_seconds_count{{fn="{fn}"}} 1' in text, fn
+    assert f'wosolve_solver_size_sum{{fn="find_valid_words"}} {n}' in text
+    assert f'wosolve_solver_size_bucket{{fn="rank_suggestions",le="+Inf"}} 1' in text
+
+
+def test_equivalence_harness_smoke():
+    out = subprocess.run([sys.executable, os.path.join(PROJECT_ROOT, "tests", "equiv_solver.py"),
+                          "--answers", "8", "--states", "60", "--state-chunk", "30", "--workers", "2"],
+                         check=True, capture_output=True, text=True).stdout
+    assert out.strip().endswith("ALL MATCH") and out.startswith("18520 feedback pairs, 60 games"), out
+
+
+def test_gen_wordfreq_streams_and_merges_offline():
+    import gzip, json, math, tempfile
+    words = ANSWER_WORDS[:90]
+    gen = os.path.join(PROJECT_ROOT, "scripts", "gen_wordfreq.py")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = pathlib.Path(tmp)
+        counts = {w: 1000 - i for i, w in enumerate(words)}
+        text = "".join(f"{w}\t{c}\n" for w, c in counts.items()) + "the\t5000\nbad line\n"
+        (tmp / "a.txt").write_text(text)
+        with gzip.open(tmp / "a.txt.gz", "wt") as f:
+            f.write(text)
+        # Google Books 1-gram shape: POS-tagged, capitalized, one row per year.
+        with gzip.open(tmp / "b.gz", "wt") as f:
+            for w in words[:30]:
+                f.write(f"{w.title()}_NOUN\t2000\t500\t1\n{w}\t2001\t500\t1\n")
+        def run(*sources):
+            out, scores = tmp / f"out{run.n}", tmp / f"scores{run.n}.json"
+            run.n += 1
+            subprocess.run([sys.executable, gen, *sources, "--out-dir", str(out),
+                            "--scores-out", str(scores)], check=True, stdout=subprocess.DEVNULL)
+            assert os.listdir(out) == ["freq.json"]    # nothing for assets.build to publish
+            return json.loads((out / "freq.json").read_text()), json.loads(scores.read_text())
+        run.n = 0
+        tiers, scores = run(str(tmp / "a.txt"))
+        assert tiers == {w: i * 30 // 90 for i, w in enumerate(words)}
+        assert abs(scores[words[0]] - (9 + math.log10(1000 / (sum(counts.values()) + 5000)))) < 1e-3
+        assert run(str(tmp / "a.txt.gz")) == (tiers, scores)
+        # Weight 3 on the flat b corpus lifts its 30 words above the rest.
+        merged, _ = run(f"{tmp / 'a.txt'}=1", f"{tmp / 'b.gz'}=3")
+        assert {w for w, t in merged.items() if t < 10} == set(words[:30])
+        bad = subprocess.run([sys.executable, gen, str(tmp / "missing.txt"), "--out-dir",
+                              str(tmp / "never"), "--scores-out", str(tmp / "never.json")],
+                             capture_output=True)
+        assert bad.returncode == 1 and not (tmp / "never").exists() and not (tmp / "never.json").exists()
+
+
+def test_gen_past_answers_incremental_from_fixture():
+    import json, tempfile
+    from datetime import date
+    gen = os.path.join(PROJECT_ROOT, "scripts", "gen_past_answers.py")
+    fixture = pathlib.Path(PROJECT_ROOT, "tests", "fixtures", "past-answers-page.html")
+    history = json.loads(pathlib.Path(PROJECT_ROOT, "static", "data", "past-answers.json").read_text())
+    # The history as of the fixture's overlap day, however far the real file has moved on.
+    stored = {"meta": {**history["meta"], "through": "2026-08-17"},
+              "byDate": {d: w for d, w in history["byDate"].items() if d <= "2026-08-17"}}
+    def run(out, html=fixture, *extra, data=stored):
+        out.write_text(json.dumps(data))
+        return subprocess.run([sys.executable, gen, "--html", str(html), "--out", str(out), *extra],
+                              capture_output=True, text=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        out = pathlib.Path(tmp, "past.json")
+        # Stops at Aug 17, so the bogus older rows below it are never read.
+        assert run(out).returncode == 0
+        got = json.loads(out.read_text())
+        assert got["meta"]["through"] == "2026-08-20"
+        assert got["byDate"] == {**stored["byDate"], "2026-08-18": "eagle",
+                                 "2026-08-19": "quart", "2026-08-20": "flint"}
+        assert "up to date" in run(out, data=got).stdout
+        # A page disagreeing with the stored history, skipping a day, or listed
+        # oldest first (so the scan stops short of meta.through) writes nothing.
+        lines = fixture.read_text().splitlines(True)
+        pathlib.Path(tmp, "gap.html").write_text("".join(l for l in lines if "EAGLE" not in l.upper()))
+        rows = [l for l in lines if l.lstrip().startswith("<tr><td>") and "WRONG" not in l]
+        pathlib.Path(tmp, "oldest.html").write_text(f"<table>{''.join(reversed(rows))}</table>")
+        for data, html in [({**stored, "byDate": {**stored["byDate"], "2026-08-17": "other"}}, fixture),
+                           (stored, pathlib.Path(tmp, "gap.html")),
+                           (stored, pathlib.Path(tmp, "oldest.html"))]:
+            r = run(out, html, data=data)
+            assert r.returncode == 1 and json.loads(out.read_text()) == data, r.stdout
+        assert "newest first" in r.stdout
+        # --full reparses a whole (synthesized, newest-first) page.
+        rows = "".join(f"<tr><td>{date.fromisoformat(d):%b. %d}</td>"
+                       f"<td>{(date.fromisoformat(d) - date(2021, 6, 19)).days}</td>"
+                       f"<td><a>{w.upper()}</a></td></tr>\n"
+                       for d, w in sorted(stored["byDate"].items(), reverse=True))
+        full = pathlib.Path(tmp, "full.html")
+        full.write_text(f"<table><tr><th>Date</th><th>#</th><th>Word</th></tr>{rows}</table>")
+        assert run(out, full, "--full", data={}).returncode == 0
+        assert json.loads(out.read_text())["byDate"] == stored["byDate"]
+
+
+def test_minimax_ranking_and_adversary():
+    from collections import Counter
+    import ranking
+    from adversary import adversary_feedback, play
+    from patterns import GUESS_WORDS
+    st = WordleState(); st.update_state(feedback("medal", "crane"))
+    both = ANSWER_WORDS + EXTENDED_WORDS
+    cands = find_valid_words(both, st)
+    guesses = ["tepal", "salsa", "crane", "eerie", "plead", "ample", "lemma"]
+    buckets = lambda g, cs: Counter(feedback(a, g) for a in cs)
+    ranked = rank_suggestions(cands, set(ANSWER_WORDS), None, mode="minimax", guesses=guesses)
+    worst = [max(buckets(g, cands).values()) for g in ranked]
+    assert sorted(ranked) == sorted(guesses) and worst == sorted(worst), (ranked, worst)
+    # Chunking over guesses changes nothing.
+    old, ranking.CHUNK_CELLS = ranking.CHUNK_CELLS, 3000
+    try:
+        w_small, e_small = ranking.score_worst_case(cands)
     finally:
-        vectors_path.write_bytes(before)
-    assert after == before, \
-        "vectors changed - solver_ref.py was modified; regenerate vectors and re-verify static/tests.html"
+        ranking.CHUNK_CELLS = old
+    w_full, e_full = ranking.score_worst_case(cands)
+    assert (w_small == w_full).all() and (e_small == e_full).all()
+    assert w_full.min() == max(buckets(rank_suggestions(cands, set(), None, mode="minimax")[0], cands).values())
+    # The adversary keeps the largest bucket, i.e. the minimax score.
+    for g in guesses:
+        marks, left = adversary_feedback(g, cands)
+        size = max(buckets(g, cands).values())
+        assert len(left) == size == w_full[GUESS_WORDS.index(g)]
+        st2 = WordleState(); st2.update_state(feedback("medal", "crane"))
+        st2.update_state("".join(a + b for a, b in zip(g, marks)))
+        assert left == find_valid_words(both, st2)
+    assert adversary_feedback("raise", ANSWER_WORDS)[0] == "-----"
+    for hard in (False, True):
+        rows = play(ANSWER_WORDS, hard=hard)
+        assert rows[-1]["marks"] == "+++++" and len(rows) <= 7, rows
+        st3 = WordleState()
+        for r in rows:
+            assert not hard or r["word"] in find_valid_words(ANSWER_WORDS, st3)
+            st3.update_state("".join(a + b for a, b in zip(r["word"], r["marks"])))
+
+
+def test_candidate_set_histogram_rank_matches_reference():
+    from solver_ref import load_freq
+    from wordindex import ANSWERS, COMBINED, CandidateSet
+    freq = load_freq()
+    rng = random.Random(22)
+    for trial in range(60):
+        index = COMBINED if trial % 2 else ANSWERS
+        answer = rng.choice(ANSWER_WORDS)
+        cs = CandidateSet(index)
+        for _ in range(rng.randint(1, 3)):
+            cs.push(feedback(answer, rng.choice(index.words)))
+            words = cs.words()
+            # Kept by subtraction, equal to a fresh tally of the survivors.
+            assert (cs.histogram.counts == index.histogram(cs.survivors).counts).all()
+            assert cs.rank(set(ANSWER_WORDS), freq) == rank_suggestions(words, set(ANSWER_WORDS), freq)
+            assert cs.suggest() == suggest_word(words)
+        cs.undo()
+        assert (cs.histogram.counts == index.histogram(cs.survivors).counts).all()
+    assert CandidateSet(ANSWERS).suggest() == suggest_word(ANSWER_WORDS)
+    # Tier arrays are cached per dict object, not per id / size: two dicts of
+    # the same size in turn each get their own tiers.
+    first, second = ANSWERS.words[0], ANSWERS.words[1]
+    for _ in range(2):
+        for f in ({first: 1}, {second: 2}):
+            tiers = ANSWERS.tiers(f)
+            assert [tiers[0], tiers[1]] == [f.get(first, 30), f.get(second, 30)]
+
+def test_pattern_store_budget_lru_and_hot_rows():
+    import tempfile
+    import numpy as np
+    from patterns import GUESS_WORDS, compute_patterns, letter_codes
+    from patternstore import ADMIT_SHARE, ROW_BYTES, PatternStore, build_hot
+    from ranking import pattern_table
+    rng = np.random.default_rng(25)
+    gidx = rng.choice(len(GUESS_WORDS), 120, replace=False)
+    big = np.arange(ROW_BYTES)
+    small = np.sort(rng.choice(len(GUESS_WORDS), 40, replace=False))
+    def ref(g, c):
+        return compute_patterns(letter_codes([GUESS_WORDS[i] for i in g]),
+                                letter_codes([GUESS_WORDS[i] for i in c]))
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PatternStore(budget=50 * ROW_BYTES, hot_path=os.path.join(tmp, "none.npy"))
+        # Small candidate sets are computed directly, nothing cached.
+        assert (store.table(gidx, small) == ref(gidx, small)).all() and store.info()["rows"] == 0
+        # One call only materializes rows worth 1/ADMIT_SHARE of its own cost.
+        assert (store.table(gidx, big) == ref(gidx, big)).all()
+        assert store.info()["rows"] == len(gidx) // ADMIT_SHARE
+        assert (store.table(gidx, big) == ref(gidx, big)).all()
+        info = store.info()
+        assert info["rows"] == 50 and info["bytes"] <= info["budget"] == 50 * ROW_BYTES
+        assert info["hits"] == len(gidx) // ADMIT_SHARE
+        # Cached rows serve any subset; a guess asked for more often displaces an old row.
+        assert (store.table(gidx, small) == ref(gidx, small)).all()
+        popular = [g for g in gidx if store._slot[g] < 0][:ADMIT_SHARE]
+        for _ in range(ADMIT_SHARE):
+            store.table(popular, big)
+        assert all(store._slot[g] >= 0 for g in popular) and store.info()["rows"] == 50
+        hot_path = os.path.join(tmp, "hot.npy")
+        build_hot([GUESS_WORDS[g] for g in gidx[:30]], hot_path)
+        cold = PatternStore(budget=0, hot_path=hot_path)
+        assert cold.load_hot() == 30
+        assert (cold.table(gidx, big) == ref(gidx, big)).all()
+        assert cold.info()["hits"] == 30 and cold.info()["rows"] == 0
+    # The combined pool goes through the store and still matches feedback().
+    cands = [GUESS_WORDS[i] for i in big[:300]]
+    for guess in ("soare", "zymic"):
+        codes = pattern_table(np.array([GUESS_WORDS.index(guess)]), cands)[0]
+        assert (codes == ref([GUESS_WORDS.index(guess)], big[:300])[0]).all()
+
 
 named_tests = [
     ("test_feedback_duplicates", test_feedback_duplicates),
@@ -145,6 +678,25 @@ named_tests = [
     ("test_rank_suggestions_freq_absent_word_gets_tier_30", test_rank_suggestions_freq_absent_word_gets_tier_30),
     ("test_rank_suggestions_freq_none_matches_empty", test_rank_suggestions_freq_none_matches_empty),
     ("test_rank_deterministic", test_rank_deterministic),
+    ("test_feedback_many_matches_feedback", test_feedback_many_matches_feedback),
+    ("test_rank_entropy_matches_bruteforce", test_rank_entropy_matches_bruteforce),
+    ("test_rank_entropy_ties_use_candidates_then_tier", test_rank_entropy_ties_use_candidates_then_tier),
+    ("test_minimax_ranking_and_adversary", test_minimax_ranking_and_adversary),
+    ("test_word_index_matches_find_valid_words", test_word_index_matches_find_valid_words),
+    ("test_candidate_set_push_undo_remove", test_candidate_set_push_undo_remove),
+    ("test_candidate_set_histogram_rank_matches_reference", test_candidate_set_histogram_rank_matches_reference),
+    ("test_pattern_store_budget_lru_and_hot_rows", test_pattern_store_budget_lru_and_hot_rows),
+    ("test_packed_core_matches_string_reference", test_packed_core_matches_string_reference),
+    ("test_multiboard_joint_scores_and_solves", test_multiboard_joint_scores_and_solves),
+    ("test_rank_cache_memoizes_by_candidate_set", test_rank_cache_memoizes_by_candidate_set),
+    ("test_batch_solve_streams_in_order", test_batch_solve_streams_in_order),
+    ("test_decision_tree_matches_live_ranking", test_decision_tree_matches_live_ranking),
+    ("test_evaluate_strategies_parallel_and_pluggable", test_evaluate_strategies_parallel_and_pluggable),
+    ("test_bundle_decodes_to_json_files", test_bundle_decodes_to_json_files),
+    ("test_metrics_opt_in", test_metrics_opt_in),
+    ("test_equivalence_harness_smoke", test_equivalence_harness_smoke),
+    ("test_gen_wordfreq_streams_and_merges_offline", test_gen_wordfreq_streams_and_merges_offline),
+    ("test_gen_past_answers_incremental_from_fixture", test_gen_past_answers_incremental_from_fixture),
     ("test_generated_files_fresh", test_generated_files_fresh),
 ]
 
@@ -0,0 +1,261 @@
+"""Array-backed word-list index for filtering by compiled constraints.
+
+A WordIndex holds a word list as per-position letter codes (n x 5) plus a
+letter-count matrix (n x 26). WordleState.compile() turns a state into
+per-position allowed-letter masks and min/max letter counts, and filtering
+is then a handful of vectorized passes instead of is_valid_word per word.
+Results match solver_ref.find_valid_words exactly, in list order.
+CandidateSet narrows those results incrementally as guesses are added. The
+shared ANSWERS / COMBINED indexes are built on first use (pool_index()).
+
+Each word also has a feature vector: a one-hot of its letter at each of the
+5 positions (130 entries) and a 0/1 presence flag per letter (26). Summed
+over a set of words that is a LetterHistogram - the 5 x 26 positional
+counts and 26 presence counts rank_suggestions' heuristic tallies - and a
+word's coverage / positional score is its feature vector dotted with the
+histogram. CandidateSet keeps one histogram per snapshot, updated by
+subtracting the features of the words a guess removed (or re-summing the
+survivors, when fewer survived than were removed), so rank() and suggest()
+never rescan the candidates to tally letters.
+"""
+import copy
+
+import numpy as np
+
+from patterns import letter_codes, letter_count_table
+from solver_ref import ANSWER_WORDS, EXTENDED_WORDS, WordleState, rank_suggestions
+
+POS_FEATURES = 5 * 26
+# rank_suggestions switches from letter coverage to likelihood at this size.
+INFO_PHASE_MIN = 21
+NO_TIER = 30
+NO_FREQ = {}  # the freq dict rank() tiers by when given none
+
+
+class WordIndex:
+    def __init__(self, words):
+        self.words = list(words)
+        self.codes = letter_codes(self.words)
+        self.counts = np.ascontiguousarray(letter_count_table(self.codes).T)
+        self._array = np.array(self.words)
+        n = len(self.words)
+        self.features = np.zeros((n, POS_FEATURES + 26), dtype=np.int32)
+        for i in range(5):
+            self.features[np.arange(n), 26 * i + self.codes[:, i]] = 1
+        self.features[:, POS_FEATURES:] = self.counts > 0
+        self.alpha = np.argsort(np.argsort(self._array, kind="stable"), kind="stable")
+        self.total = LetterHistogram(self.features.sum(axis=0))
+        self._tiers = None
+
+    def __len__(self):
+        return len(self.words)
+
+    def matches(self, state, rows=None):
+        """Boolean mask over `rows` (default: every word) of words valid in `state`."""
+        return self.match_constraints(state.compile(), rows)
+
+    def match_constraints(self, constraints, rows=None):
+        """matches() for an already compiled (allowed, min_counts, max_counts)."""
+        allowed, min_counts, max_counts = constraints
+        codes = self.codes if rows is None else self.codes[rows]
+        counts = self.counts if rows is None else self.counts[rows]
+        ok = np.ones(len(codes), dtype=bool)
+        for i, mask in enumerate(allowed):
+            if mask != (1 << 26) - 1:
+                table = (mask >> np.arange(26)) & 1 == 1
+                ok &= table[codes[:, i]]
+        for l in range(26):
+            lo, hi = min_counts[l], max_counts[l]
+            if lo > 0:
+                ok &= counts[:, l] >= lo
+            # Includes max 0: a green position's mask is just its letter, so
+            # with contradictory rows an excluded letter can still be green.
+            if hi < 5:
+                ok &= counts[:, l] <= hi
+        return ok
+
+    def survivors(self, state, rows=None):
+        """Indices of words valid in `state`, restricted to `rows` if given."""
+        return self.select(state.compile(), rows)
+
+    def select(self, constraints, rows=None):
+        """survivors() for an already compiled state."""
+        hit = np.flatnonzero(self.match_constraints(constraints, rows))
+        return hit if rows is None else np.asarray(rows)[hit]
+
+    def find_valid_words(self, state):
+        return self.take(self.survivors(state))
+
+    def take(self, idx):
+        """Words at the given indices, as a list of str."""
+        return self._array[idx].tolist()
+
+    def histogram(self, rows):
+        return LetterHistogram(self.features[rows].sum(axis=0))
+
+    def tiers(self, freq):
+        """freq tier of every word (NO_TIER if absent), cached for the last
+        freq dict seen. The entry keeps the dict itself, so an id reused by a
+        new dict after the old one is freed can't match it."""
+        entry = self._tiers
+        if entry is not None and entry[0] is freq and entry[1] == len(freq):
+            return entry[2]
+        arr = np.array([freq.get(w, NO_TIER) for w in self.words])
+        self._tiers = (freq, len(freq), arr)
+        return arr
+
+    def rank(self, rows, answer_set, freq=None, hist=None):
+        """rank_suggestions(self.take(rows), answer_set, freq), with the
+        coverage / positional tallies taken from `hist` (the histogram of
+        `rows`) by dot product instead of a pass over the words."""
+        rows = np.asarray(rows)
+        if len(rows) < INFO_PHASE_MIN:
+            return rank_suggestions(self.take(rows), answer_set, freq)
+        hist = self.histogram(rows) if hist is None else hist
+        feats = self.features[rows]
+        coverage = feats[:, POS_FEATURES:] @ hist.present
+        placed = feats[:, :POS_FEATURES] @ hist.pos.ravel()
+        tier = self.tiers(freq or NO_FREQ)[rows]
+        order = np.lexsort((self.alpha[rows], tier, -placed, -coverage))
+        return self._array[rows[order]].tolist()
+
+    def suggest(self, rows, hist=None):
+        """solver_ref.suggest_word(self.take(rows)): first word with the
+        highest coverage."""
+        rows = np.asarray(rows)
+        if not len(rows):
+            return None
+        hist = self.histogram(rows) if hist is None else hist
+        return self.words[rows[np.argmax(self.features[rows, POS_FEATURES:] @ hist.present)]]
+
+
+class LetterHistogram:
+    """Letter tallies over a set of words: pos[i, l] words with letter l at
+    position i, present[l] words containing l at all."""
+
+    def __init__(self, counts):
+        self.counts = counts
+
+    @property
+    def pos(self):
+        return self.counts[:POS_FEATURES].reshape(5, 26)
+
+    @property
+    def present(self):
+        return self.counts[POS_FEATURES:]
+
+    def without(self, index, rows):
+        """The histogram minus the words at `rows` of `index`."""
+        return LetterHistogram(self.counts - index.features[rows].sum(axis=0))
+
+
+def narrows(prev, state):
+    """True when every word valid in `state` is also valid in `prev`, the
+    state before one more update_state. Exclusions, yellows and minimum
+    counts only ever grow, so just a changed green or a raised max count
+    (both overwritten by a contradictory row) can loosen it - as
+    static/js/analysis.js's narrows()."""
+    if any(g != ' ' and g != state.green_chars[i] for i, g in enumerate(prev.green_chars)):
+        return False
+    return all(state.max_counts[l] <= n or l in state.excluded_chars
+               for l, n in prev.max_counts.items())
+
+
+class CandidateSet:
+    """Surviving words of a WordIndex across a sequence of guesses.
+
+    Keeps one (state, survivor indices, letter histogram) snapshot per
+    submitted row. A new guess is checked only against the previous
+    survivors, so each push costs O(survivors) rather than a full-list
+    filter, and the histogram loses just the removed words' features; undo
+    pops a snapshot, and removing row i replays the later rows from snapshot
+    i - the same operations as game.js's onUndo / onRemoveRow. A
+    contradictory row can loosen the state instead (see narrows()), and
+    that push filters the whole index again.
+    """
+
+    def __init__(self, index, rows=()):
+        self.index = index
+        self.rows = []
+        self._stack = [(WordleState(), np.arange(len(index)), index.total)]
+        for row in rows:
+            self.push(row)
+
+    def push(self, guess):
+        """Add a row in update_state's encoding ('s-a*l*s-a-')."""
+        prev_state, prev, prev_hist = self._stack[-1]
+        state = copy.deepcopy(prev_state)
+        state.update_state(guess)
+        if not narrows(prev_state, state):
+            prev, prev_hist = np.arange(len(self.index)), self.index.total
+        ok = self.index.matches(state, prev)
+        kept = prev[ok]
+        if len(kept) < len(prev) - len(kept):
+            hist = self.index.histogram(kept)
+        else:
+            hist = prev_hist.without(self.index, prev[~ok])
+        self._stack.append((state, kept, hist))
+        self.rows.append(guess)
+
+    def undo(self):
+        if self.rows:
+            self._stack.pop()
+            self.rows.pop()
+
+    def remove_row(self, i):
+        if not 0 <= i < len(self.rows):
+            raise IndexError(f"row {i} out of range for {len(self.rows)} rows")
+        later = self.rows[i + 1:]
+        del self._stack[i + 1:]
+        del self.rows[i:]
+        for row in later:
+            self.push(row)
+
+    @property
+    def state(self):
+        return self._stack[-1][0]
+
+    @property
+    def survivors(self):
+        """Indices into the index's word list, in list order."""
+        return self._stack[-1][1]
+
+    @property
+    def histogram(self):
+        return self._stack[-1][2]
+
+    def rank(self, answer_set, freq=None):
+        """rank_suggestions(self.words(), answer_set, freq), from the kept histogram."""
+        return self.index.rank(self.survivors, answer_set, freq, self.histogram)
+
+    def suggest(self):
+        """suggest_word(self.words())."""
+        return self.index.suggest(self.survivors, self.histogram)
+
+    def words(self):
+        return self.index.take(self.survivors)
+
+    def __len__(self):
+        return len(self.survivors)
+
+
+POOL_INDEXES = {"answers": "ANSWERS", "both": "COMBINED"}
+
+
+def pool_index(pool):
+    """The shared WordIndex for the "answers" or "both" word list."""
+    name = POOL_INDEXES[pool]
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+def __getattr__(name):
+    # ANSWERS / COMBINED are built on first access, not at import (app.py
+    # builds them in its warm-up thread), then cached as module globals. Two
+    # threads racing here just build the same index twice.
+    if name == "ANSWERS":
+        index = WordIndex(ANSWER_WORDS)
+    elif name == "COMBINED":
+        index = WordIndex(ANSWER_WORDS + EXTENDED_WORDS)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return globals().setdefault(name, index)